@@ -0,0 +1,7 @@
+-- Last changes page fully written per sync type and date window, read by sync_tmdb.py to resume an interrupted run
+CREATE TABLE IF NOT EXISTS tmdb_sync_cursor (
+	type text PRIMARY KEY,
+	start_date date NOT NULL,
+	end_date date NOT NULL,
+	page integer NOT NULL
+);
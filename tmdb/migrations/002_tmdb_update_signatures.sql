@@ -0,0 +1,6 @@
+-- Signature of the last TMDB payload written per update type, read by tmdb_update.py to skip unchanged runs
+CREATE TABLE IF NOT EXISTS tmdb_update_signatures (
+	type text PRIMARY KEY,
+	signature text NOT NULL,
+	date date NOT NULL
+);
@@ -0,0 +1,5 @@
+-- ETag of the last movie details response written per movie, sent back as If-None-Match by tmdb_update.py
+CREATE TABLE IF NOT EXISTS tmdb_movie_etags (
+	movie_id integer PRIMARY KEY REFERENCES tmdb_movie (id) ON DELETE CASCADE,
+	etag text NOT NULL
+);
@@ -12,12 +12,23 @@ import os
 from datetime import datetime
 from dotenv import load_dotenv
 import psycopg2
+import psycopg2.pool
+from psycopg2.extras import execute_values
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import gzip
 import shutil
-import json
+import orjson
+import io
+import math
 from more_itertools import chunked
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+import atexit
+from itertools import count
+import threading
+import queue
 
 import utils.utils as utils
 
@@ -31,13 +42,55 @@ load_dotenv()
 # ---------------------------------------------------------------------------- #
 
 start_time = None
+# start_time as YYYY-MM-DD, formatted once in main
+start_date = None
 end_time = None
 env_postgres_connection_string = os.getenv("POSTGRES_CONNECTION_STRING")
 env_tmdb_api_keys = os.getenv("TMDB_API_KEYS").split(",")
-tmdb_api_key_index = 0
+# Each worker thread gets its own API key the first time it calls TMDB
+tmdb_api_key_local = threading.local()
+tmdb_api_key_counter = count()
 batch_size = 100
-MAX_WORKERS = 10
+# Batch sizes per table: rows per statement for the small reference tables,
+# ids fetched from TMDB and written per chunk for the others
+LANG_BATCH = 5000
+COLLECTION_BATCH = 200
+COMPANY_BATCH = 200
+PERSON_BATCH = 500
+# Concurrent TMDB requests (threads only wait on sockets, so this can go well above the CPU count)
+MAX_WORKERS = int(os.getenv("MAX_WORKERS") or 10)
+COMMIT_EVERY = 20
+DELETE_CHUNK_SIZE = 50000
+# Parallel writers for the movie child tables (see update_db_movie)
+CHILD_TABLE_WORKERS = 4
+# Person and movie rows cascade into the credits/child tables, so they are deleted in smaller statements
+DELETE_CASCADE_CHUNK_SIZE = 10000
 csv_data = None
+# Keys known to be in a table after its sync step, so get_csv_data does not read the table again
+table_cache: dict = {}
+
+# Keep-alive HTTP session shared by every TMDB call
+session = requests.Session()
+session_adapter = HTTPAdapter(
+	pool_connections=MAX_WORKERS,
+	pool_maxsize=MAX_WORKERS * 2,
+	max_retries=Retry(
+		total=5,
+		backoff_factor=0.5,
+		status_forcelist=[429, 500, 502, 503, 504],
+		respect_retry_after_header=True,
+		allowed_methods=frozenset(["GET"])
+	)
+)
+session.mount("https://", session_adapter)
+session.mount("http://", session_adapter)
+# Headers set once for every request instead of per call
+session.headers.update({"Accept": "application/json", "Accept-Encoding": "gzip"})
+
+# Postgres connections shared by every helper and sync function
+# They keep psycopg2's default autocommit = False, `with conn:` in get_connection() scopes each transaction
+db_pool = psycopg2.pool.ThreadedConnectionPool(minconn=2, maxconn=MAX_WORKERS + 2 + CHILD_TABLE_WORKERS, dsn=env_postgres_connection_string)
+atexit.register(db_pool.closeall)
 
 # ---------------------------------------------------------------------------- #
 
@@ -45,88 +98,138 @@ csv_data = None
 #                                     Utils                                    #
 # ---------------------------------------------------------------------------- #
 
-def download_file(url: str) -> str:
-	console.log(f"Downloading {url}", style="info")
-	response = requests.get(url)
-
-	if response.status_code != 200:
-		console.log(f"Failed to download {url} (status code: {response.status_code})", style="error")
-		return None
-	
-	file_name = url.split("/")[-1]
-
-	with open(file_name, 'wb') as file:
-		file.write(response.content)
-
-	console.log(f"Downloaded {url} to {file_name}", style="success")
-	return file_name
-
-def decompress_gzip(file_path: str) -> str:
-	console.log(f"Decompressing {file_path}", style="info")
-	with gzip.open(file_path, 'rb') as f_in:
-		with open(file_path[:-3], 'wb') as f_out:
-			shutil.copyfileobj(f_in, f_out)
-
-	console.log(f"Decompressed {file_path} to {file_path[:-3]}", style="success")
-	return file_path[:-3]
-
+# Hand batches to `writer` on a background thread so DB writes overlap the next TMDB fetches
+@contextmanager
+def background_writer(writer):
+	batches = queue.Queue(maxsize=2)
+	# First exception raised by `writer`, re-raised in the caller's thread
+	errors = []
+
+	def run():
+		while True:
+			batch = batches.get()
+			try:
+				if batch is None:
+					return
+				# After a failure keep draining the queue so put() never blocks the caller
+				if not errors:
+					writer(batch)
+			except Exception as e:
+				errors.append(e)
+			finally:
+				batches.task_done()
+
+	def put(batch):
+		if errors:
+			raise errors[0]
+		batches.put(batch)
+
+	thread = threading.Thread(target=run, daemon=True)
+	thread.start()
+	try:
+		yield put
+	finally:
+		# Let the writer drain the queue before leaving
+		batches.put(None)
+		thread.join()
+	if errors:
+		raise errors[0]
 
 # Get TMDB data
 def get_tmdb_data(endpoint, params):
-	global tmdb_api_key_index
+	if not hasattr(tmdb_api_key_local, "index"):
+		tmdb_api_key_local.index = next(tmdb_api_key_counter) % len(env_tmdb_api_keys)
 	url = f"https://api.themoviedb.org/3/{endpoint}"
-	params["api_key"] = env_tmdb_api_keys[tmdb_api_key_index]
-	response = requests.get(url, params=params)
-	tmdb_api_key_index = (tmdb_api_key_index + 1) % len(env_tmdb_api_keys)
+	params["api_key"] = env_tmdb_api_keys[tmdb_api_key_local.index]
+	response = session.get(url, params=params, timeout=10)
 
-	data = response.json()
-
-	if ('success' in data and not data['success']):
+	# Ids removed from TMDB since the export are skipped, any other error is raised once the retries are exhausted
+	if response.status_code == 404:
 		return None
-
-	return data
-
-def get_tmdb_export_ids(type: str, date: datetime) -> list:
-	tmdb_export_collection_url_template = "http://files.tmdb.org/p/exports/{type}_ids_{date}.json.gz"
-	
-	tmdb_export_collection_ids_url = tmdb_export_collection_url_template.format(type=type,date=date.strftime("%m_%d_%Y"))
-
-	downloaded_file = download_file(tmdb_export_collection_ids_url)
-	if not downloaded_file:
+	response.raise_for_status()
+
+	return orjson.loads(response.content)
+
+# Stream the daily export straight from HTTP through gzip, one parsed line at a time
+def iter_tmdb_export(type: str, date: datetime):
+	tmdb_export_url_template = "http://files.tmdb.org/p/exports/{type}_ids_{date}.json.gz"
+
+	tmdb_export_url = tmdb_export_url_template.format(type=type, date=date.strftime("%m_%d_%Y"))
+
+	console.log(f"Streaming {tmdb_export_url}", style="info")
+	with session.get(tmdb_export_url, stream=True, timeout=10) as response:
+		if response.status_code != 200:
+			raise Exception(f"Failed to download {tmdb_export_url} (status code: {response.status_code})")
+
+		# GzipFile checks the CRC and length trailer at the end of the stream, a truncated download raises here
+		try:
+			with io.BufferedReader(gzip.GzipFile(fileobj=response.raw), buffer_size=131072) as reader:
+				for line in reader:
+					yield orjson.loads(line)
+		except (EOFError, gzip.BadGzipFile) as e:
+			raise Exception(f"Corrupted export {tmdb_export_url} ({e})")
+
+def get_tmdb_export_ids(type: str, date: datetime) -> set:
+	return {item["id"] for item in iter_tmdb_export(type, date)}
+
+# Get the translated fields of an append_to_response=translations payload (prefer the given country)
+def get_tmdb_translation(data: dict, iso_639_1: str, iso_3166_1: str) -> dict:
+	translations = [
+		translation for translation in data.get("translations", {}).get("translations", [])
+		if translation.get("iso_639_1") == iso_639_1
+	]
+	if not translations:
 		return None
-	
-	decompressed_file = decompress_gzip(downloaded_file)
-	
-	if os.path.exists(downloaded_file):
-		os.remove(downloaded_file)
-
-	with open(decompressed_file, 'r', encoding='utf-8') as file:
-		data = [json.loads(line) for line in file]
-
-	if os.path.exists(decompressed_file):
-		os.remove(decompressed_file)
-
-	if not data or len(data) == 0:
-		return None
-
-	return data
+	for translation in translations:
+		if translation.get("iso_3166_1") == iso_3166_1:
+			return translation.get("data", {})
+	return translations[0].get("data", {})
 
 # ------------------------------------ DB ------------------------------------ #
 
-def get_table(table_name: str, columns: list) -> list:
-	conn = psycopg2.connect(env_postgres_connection_string)
-	cursor = conn.cursor()
-	rows = []
+# Borrow a pooled connection, wrapped in a transaction like `with psycopg2.connect(...)`
+@contextmanager
+def get_connection():
+	conn = db_pool.getconn()
 	try:
-		cursor.execute(f"SELECT {', '.join(columns)} FROM {table_name}")
-		rows = cursor.fetchall()
+		with conn:
+			yield conn
 	finally:
-		cursor.close()
-		conn.close()
-	return rows
+		db_pool.putconn(conn)
+
+# Stream a column through a server-side cursor straight into a set, without a fetchall() list
+def get_table(table_name: str, column: str) -> set:
+	with get_connection() as conn:
+		with conn.cursor(name=f"stream_{table_name}") as cursor:
+			cursor.itersize = 50000
+			cursor.execute(f"SELECT {column} FROM {table_name}")
+			return {row[0] for row in cursor}
+
+# Keys of a table, from table_cache when this run already synced it
+def get_table_keys(table_name: str, column: str) -> set:
+	if table_name not in table_cache:
+		table_cache[table_name] = get_table(table_name, column)
+	return table_cache[table_name]
+
+# Compare a set of TMDB keys with a table server-side, returns (missing_in_db, missing_in_tmdb)
+def get_table_diff(table_name: str, column: str, values: set, array_type: str) -> tuple:
+	with get_connection() as conn:
+		with conn.cursor() as cursor:
+			cursor.execute(f"SELECT unnest(%s::{array_type}[]) EXCEPT SELECT {column} FROM {table_name}", (list(values),))
+			missing_in_db: set = {row[0] for row in cursor.fetchall()}
+			cursor.execute(f"SELECT {column} FROM {table_name} EXCEPT SELECT unnest(%s::{array_type}[])", (list(values),))
+			missing_in_tmdb: set = {row[0] for row in cursor.fetchall()}
+	return missing_in_db, missing_in_tmdb
+
+# Delete rows by key with an array parameter, chunk_size keys per statement, all in one transaction
+def delete_rows(table_name: str, column: str, values: set, array_type: str, chunk_size: int = DELETE_CHUNK_SIZE) -> None:
+	with get_connection() as conn:
+		with conn.cursor() as cursor:
+			for chunk in chunked(values, chunk_size):
+				cursor.execute(f"DELETE FROM {table_name} WHERE {column} = ANY(%s::{array_type}[])", (chunk,))
 
 def make_query(sql_command, values=None, fetch_results=False):
-	conn = psycopg2.connect(env_postgres_connection_string)
+	conn = db_pool.getconn()
 	cursor = conn.cursor()
 	try:
 		if values:
@@ -142,30 +245,113 @@ def make_query(sql_command, values=None, fetch_results=False):
 			return result
 	finally:
 		cursor.close()
-		conn.close()
+		db_pool.putconn(conn)
 
 def get_last_sync(sync_type: str) -> datetime:
-	conn = psycopg2.connect(env_postgres_connection_string)
+	conn = db_pool.getconn()
 	cursor = conn.cursor()
 	try:
-		cursor.execute(f"SELECT date FROM tmdb_update_logs WHERE type = '{sync_type}' AND success = True ORDER BY date DESC LIMIT 1")
+		cursor.execute("SELECT date FROM tmdb_update_logs WHERE type = %s AND success = True ORDER BY date DESC LIMIT 1", (sync_type,))
 		rows = cursor.fetchone()
 		if rows:
 			return rows[0]
 		return None
 	finally:
 		cursor.close()
-		conn.close()
+		db_pool.putconn(conn)
 
 def insert_sync_log(date: datetime, sync_type: str, success: bool):
-	conn = psycopg2.connect(env_postgres_connection_string)
+	conn = db_pool.getconn()
 	cursor = conn.cursor()
 	try:
-		cursor.execute(f"INSERT INTO tmdb_update_logs (date, success, type) VALUES ('{date}', {success}, '{sync_type}')")
+		cursor.execute("INSERT INTO tmdb_update_logs (date, success, type) VALUES (%s, %s, %s)", (date, success, sync_type))
 		conn.commit()
 	finally:
 		cursor.close()
-		conn.close()
+		db_pool.putconn(conn)
+
+# Run upserts (callables taking a cursor) in one transaction on their own pooled connection
+def write_tables(*writes) -> None:
+	with get_connection() as conn:
+		with conn.cursor() as cursor:
+			for write in writes:
+				write(cursor)
+
+# Last changes page fully written for a sync type, only when the date window is the same (0 when starting over)
+def get_sync_cursor(sync_type: str, start_date, end_date) -> int:
+	with get_connection() as conn:
+		with conn.cursor() as cursor:
+			cursor.execute("SELECT page FROM tmdb_sync_cursor WHERE type = %s AND start_date = %s AND end_date = %s", (sync_type, start_date, end_date))
+			row = cursor.fetchone()
+	return row[0] if row else 0
+
+def set_sync_cursor(sync_type: str, start_date, end_date, page: int) -> None:
+	with get_connection() as conn:
+		with conn.cursor() as cursor:
+			cursor.execute("""
+				INSERT INTO tmdb_sync_cursor (type, start_date, end_date, page)
+				VALUES (%s, %s, %s, %s)
+				ON CONFLICT (type) DO UPDATE
+				SET start_date = EXCLUDED.start_date, end_date = EXCLUDED.end_date, page = EXCLUDED.page
+			""", (sync_type, start_date, end_date, page))
+
+# Format a value for COPY ... WITH CSV (None is written unquoted so it is loaded as NULL)
+def copy_value(value) -> str:
+	if value is None:
+		return ''
+	if isinstance(value, bool):
+		return 't' if value else 'f'
+	if isinstance(value, (int, float)):
+		return str(value)
+	if isinstance(value, (list, tuple)):
+		value = '{' + ','.join('"' + str(item).replace('\\', '\\\\').replace('"', '\\"') + '"' for item in value) + '}'
+	return '"' + str(value).replace('"', '""') + '"'
+
+# Upsert rows (sequences in `columns` order) with execute_values, DO NOTHING when there is nothing to update
+def bulk_upsert(cursor, table_name: str, columns: list, rows: list, conflict_columns: list, update_columns: list = None, page_size: int = 1000) -> None:
+	if not rows:
+		return
+	if update_columns:
+		conflict_action = "DO UPDATE SET " + ', '.join(f"{column} = EXCLUDED.{column}" for column in update_columns)
+	else:
+		conflict_action = "DO NOTHING"
+	execute_values(cursor, f"""
+		INSERT INTO {table_name} ({', '.join(columns)})
+		VALUES %s
+		ON CONFLICT ({', '.join(conflict_columns)}) {conflict_action}
+	""", rows, page_size=page_size)
+
+# COPY rows into a temp table shaped like `table_name`, returns the staging table name
+def copy_to_stage(cursor, table_name: str, columns: list, rows: list) -> str:
+	stage_name = f"stage_{table_name}"
+	buffer = io.StringIO()
+	for row in rows:
+		buffer.write(','.join(copy_value(value) for value in row))
+		buffer.write('\n')
+	buffer.seek(0)
+
+	cursor.execute(f"CREATE TEMP TABLE {stage_name} (LIKE {table_name} INCLUDING DEFAULTS) ON COMMIT DROP")
+	cursor.copy_expert(f"COPY {stage_name} ({', '.join(columns)}) FROM STDIN WITH CSV", buffer)
+	return stage_name
+
+# Upsert rows (sequences in `columns` order) through a COPY into a temp staging table followed by a single INSERT ... SELECT
+# `where` filters the staged rows (aliased `stage`) on the server, e.g. on foreign keys that may not exist yet
+def copy_upsert(cursor, table_name: str, columns: list, rows: list, conflict_columns: list, update_columns: list = None, where: str = None) -> None:
+	if not rows:
+		return
+	stage_name = copy_to_stage(cursor, table_name, columns, rows)
+
+	if update_columns:
+		conflict_action = "DO UPDATE SET " + ', '.join(f"{column} = EXCLUDED.{column}" for column in update_columns)
+	else:
+		conflict_action = "DO NOTHING"
+	cursor.execute(f"""
+		INSERT INTO {table_name} ({', '.join(columns)})
+		SELECT {', '.join(columns)} FROM {stage_name} AS stage
+		{f"WHERE {where}" if where else ""}
+		ON CONFLICT ({', '.join(conflict_columns)}) {conflict_action}
+	""")
+	cursor.execute(f"DROP TABLE {stage_name}")
 
 # ---------------------------------------------------------------------------- #
 
@@ -179,79 +365,62 @@ def sync_tmdb_language() -> None:
 	try:
 		console.log("[sync_tmdb_language] Starting syncing tmdb_language", style="info")
 
-		db_list: list = get_table("tmdb_language", ["iso_639_1"])
-		if not db_list:
-			raise Exception("Failed to download tmdb_language")
-
 		tmdb_list: list = get_tmdb_data("configuration/languages", {})
 		if not tmdb_list:
 			raise Exception("Failed to get TMDB languages")
 		
-		db_set: set = {item[0] for item in db_list}
 		tmdb_set: set = {item["iso_639_1"] for item in tmdb_list}
 
 		# Get difference between db and tmdb
-		missing_in_db: set = tmdb_set - db_set
-		missing_in_tmdb: set = db_set - tmdb_set
+		missing_in_db, missing_in_tmdb = get_table_diff("tmdb_language", "iso_639_1", tmdb_set, "text")
 
 		# Delete missing in tmdb
 		if missing_in_tmdb:
 			console.log(f"[sync_tmdb_language] Found {len(missing_in_tmdb)} extra languages in db", style="warning")
-			make_query("DELETE FROM tmdb_language WHERE iso_639_1 IN %s", (tuple(missing_in_tmdb),))
-			db_set -= missing_in_tmdb
+			delete_rows("tmdb_language", "iso_639_1", missing_in_tmdb, "text")
+		table_cache["tmdb_language"] = tmdb_set - missing_in_db
 
 		# Insert missing in db
-		with psycopg2.connect(env_postgres_connection_string) as conn:
+		with get_connection() as conn:
 			with conn.cursor() as cursor:
 				try:
-					console.log(f"[sync_tmdb_language] Found {len(missing_in_db)} missing languages in db", style="warning")
-					# Démarrez la transaction
-					conn.autocommit = False
-
+					if missing_in_db:
+						console.log(f"[sync_tmdb_language] Found {len(missing_in_db)} missing languages in db", style="warning")
 					# Construire les valeurs à insérer dans Supabase pour tmdb_language
 					values_to_insert_language = [
 						(language['iso_639_1'], language['name'])
 						for language in tmdb_list
-						if language['iso_639_1'] in tmdb_set
 					]
 					# Construire les valeurs à insérer dans Supabase pour tmdb_language_translation
 					values_to_insert_translation = [
 						(language['iso_639_1'], 'en', language['english_name'])
 						for language in tmdb_list
-						if language['iso_639_1'] in tmdb_set
 					]
 
 					# Insérer les valeurs dans Supabase pour tmdb_language en utilisant ON CONFLICT pour l'upsert
-					cursor.executemany("""
+					execute_values(cursor, """
 						INSERT INTO tmdb_language (iso_639_1, name_in_native_language)
-						VALUES (%s, %s)
+						VALUES %s
 						ON CONFLICT (iso_639_1) DO UPDATE
 						SET name_in_native_language = EXCLUDED.name_in_native_language
-					""", values_to_insert_language)
+					""", values_to_insert_language, page_size=LANG_BATCH)
 
 					# Insérer les valeurs dans Supabase pour tmdb_language_translation en utilisant ON CONFLICT pour l'upsert
-					cursor.executemany("""
+					execute_values(cursor, """
 						INSERT INTO tmdb_language_translation (iso_639_1, language, name)
-						VALUES (%s, %s, %s)
+						VALUES %s
 						ON CONFLICT (iso_639_1, language) DO UPDATE
 						SET name = EXCLUDED.name
-					""", values_to_insert_translation)
+					""", values_to_insert_translation, page_size=LANG_BATCH)
 
 					# Valider les modifications
 					conn.commit()
-
-					db_set.update(missing_in_db)
+					table_cache["tmdb_language"] = tmdb_set
 
 				except Exception as e:
 					# En cas d'erreur, annulez la transaction
 					conn.rollback()
 					console.log(f"Inserting tmdb_language: {e}", style="error")
-
-				finally:
-					# Rétablissez le mode autocommit à True
-					conn.autocommit = True
-		# Create CSV file for tmdb_language
-		# utils.create_csv_file(os.getenv("TMP_DIR") + "/tmdb_language.csv", db_set)
 		# Insert sync log
 		insert_sync_log(start_time, "language", True)
 	except Exception as e:
@@ -263,77 +432,60 @@ def sync_tmdb_country() -> None:
 	try:
 		console.log("[sync_tmdb_country] Starting syncing tmdb_country", style="info")
 
-		db_list: list = get_table("tmdb_country", ["iso_3166_1"])
-		if not db_list:
-			raise Exception("Failed to download tmdb_country")
-
 		tmdb_list: list = get_tmdb_data("configuration/countries", {"language": "fr-FR"})
 		if not tmdb_list:
 			raise Exception("Failed to get TMDB countries")
 		
-		db_set: set = {item[0] for item in db_list}
 		tmdb_set: set = {item["iso_3166_1"] for item in tmdb_list}
 
 		# Get difference between db and tmdb
-		missing_in_db: set = tmdb_set - db_set
-		missing_in_tmdb: set = db_set - tmdb_set
+		missing_in_db, missing_in_tmdb = get_table_diff("tmdb_country", "iso_3166_1", tmdb_set, "text")
 
 		# Delete missing in tmdb
 		if missing_in_tmdb:
 			console.log(f"[sync_tmdb_country] Found {len(missing_in_tmdb)} extra countries in db", style="warning")
-			make_query("DELETE FROM tmdb_country WHERE iso_3166_1 IN %s", (tuple(missing_in_tmdb),))
-			db_set -= missing_in_tmdb
+			delete_rows("tmdb_country", "iso_3166_1", missing_in_tmdb, "text")
+		table_cache["tmdb_country"] = tmdb_set - missing_in_db
 		
-		with psycopg2.connect(env_postgres_connection_string) as conn:
+		with get_connection() as conn:
 			with conn.cursor() as cursor:
 				try:
-					# Démarrez la transaction
-					conn.autocommit = False
-
 					# Insert missing in db
 					if missing_in_db:
 						console.log(f"[sync_tmdb_country] Found {len(missing_in_db)} missing countries in db", style="warning")
-						cursor.execute("""
+						execute_values(cursor, """
 							INSERT INTO tmdb_country (iso_3166_1)
 							VALUES %s
 							ON CONFLICT (iso_3166_1) DO NOTHING
-						""", (tuple(missing_in_db),))
+						""", [(country,) for country in missing_in_db], page_size=LANG_BATCH)
 
 					# Build values to insert in DB
 					values_to_insert_translation = [
-						(country['iso_3166_1'], 'en', country['english_name'])
-						for country in tmdb_list
-						if country['iso_3166_1'] in tmdb_set
-					] + [
-						(country['iso_3166_1'], 'fr', country['native_name'])
+						row
 						for country in tmdb_list
-						if country['iso_3166_1'] in tmdb_set
+						for row in (
+							(country['iso_3166_1'], 'en', country['english_name']),
+							(country['iso_3166_1'], 'fr', country['native_name'])
+						)
 					]
 
 					# Insert values in DB
-					cursor.executemany("""
+					execute_values(cursor, """
 						INSERT INTO tmdb_country_translation (iso_3166_1, iso_639_1, name)
-						VALUES (%s, %s, %s)
+						VALUES %s
 						ON CONFLICT (iso_3166_1, iso_639_1) DO UPDATE
 						SET name = EXCLUDED.name
-					""", values_to_insert_translation)
+					""", values_to_insert_translation, page_size=LANG_BATCH)
 
 					# Valider les modifications
 					conn.commit()
-
-					db_set.update(missing_in_db)
+					table_cache["tmdb_country"] = tmdb_set
 
 				except Exception as e:
 					# En cas d'erreur, annulez la transaction
 					conn.rollback()
 					console.log(f"Inserting tmdb_country: {e}", style="error")
 
-				finally:
-					# Rétablissez le mode autocommit à True
-					conn.autocommit = True
-
-		# Create CSV file for tmdb_country
-		# utils.create_csv_file(os.getenv("TMP_DIR") + "/tmdb_country.csv", db_set)
 		# Insert sync log
 		insert_sync_log(start_time, "country", True)
 	except Exception as e:
@@ -355,10 +507,6 @@ def sync_tmdb_genre() -> None:
 	try:
 		console.log("[sync_tmdb_genre] Starting syncing tmdb_genre", style="info")
 
-		db_list: list = get_table("tmdb_genre", ["id"])
-		if not db_list:
-			raise Exception("Failed to download tmdb_genre")
-
 		tmdb_movie_dict: dict = get_tmdb_genre("movie")
 		if not tmdb_movie_dict:
 			raise Exception("Failed to get TMDB movie genres")
@@ -366,60 +514,53 @@ def sync_tmdb_genre() -> None:
 		if not tmdb_tv_dict:
 			raise Exception("Failed to get TMDB tv genres")
 		
-		db_set: set = {item[0] for item in db_list}
 		tmdb_set: set = {genre['id'] for genre in tmdb_movie_dict['en'] + tmdb_tv_dict['en']}
 
 		# Get difference between db and tmdb
-		missing_in_db = tmdb_set - db_set
-		missing_in_tmdb = db_set - tmdb_set
+		missing_in_db, missing_in_tmdb = get_table_diff("tmdb_genre", "id", tmdb_set, "int")
 
 		# Delete missing in tmdb
 		if missing_in_tmdb:
 			console.log(f"[sync_tmdb_genre] Found {len(missing_in_tmdb)} extra genres in db", style="warning")
-			make_query("DELETE FROM tmdb_genre WHERE id IN %s", (tuple(missing_in_tmdb),))
-			db_set -= missing_in_tmdb
+			delete_rows("tmdb_genre", "id", missing_in_tmdb, "int")
+		table_cache["tmdb_genre"] = tmdb_set - missing_in_db
 		
-		with psycopg2.connect(env_postgres_connection_string) as conn:
+		with get_connection() as conn:
 			with conn.cursor() as cursor:
 				try:
-					# Démarrez la transaction
-					conn.autocommit = False
-
 					# Insert missing in db
 					if missing_in_db:
 						console.log(f"[sync_tmdb_genre] Found {len(missing_in_db)} missing genres in db", style="warning")
-						cursor.execute("""
+						execute_values(cursor, """
 							INSERT INTO tmdb_genre (id)
 							VALUES %s
 							ON CONFLICT (id) DO NOTHING
-						""", (tuple(missing_in_db),))
+						""", [(genre,) for genre in missing_in_db], page_size=LANG_BATCH)
 
+					# Genres shared by movies and tv are only sent once per language
 					values_to_insert_translation = [
-						(genre['id'], 'en', genre['name']) for genre in tmdb_movie_dict["en"] + tmdb_tv_dict["en"]
-					] + [
-						(genre['id'], 'fr', genre['name']) for genre in tmdb_movie_dict["fr"] + tmdb_tv_dict["fr"]
+						(genre_id, language, name)
+						for language in ("en", "fr")
+						for genre_id, name in {
+							genre['id']: genre['name'] for genre in tmdb_movie_dict[language] + tmdb_tv_dict[language]
+						}.items()
 					]
 					
 					# Insert values in DB
-					cursor.executemany("""
+					execute_values(cursor, """
 						INSERT INTO tmdb_genre_translation (genre, language, name)
-						VALUES (%s, %s, %s)
+						VALUES %s
 						ON CONFLICT (genre, language) DO UPDATE
 						SET name = EXCLUDED.name
-					""", values_to_insert_translation)
+					""", values_to_insert_translation, page_size=LANG_BATCH)
 
 					# # Valider les modifications
 					conn.commit()
-
-					db_set.update(missing_in_db)
+					table_cache["tmdb_genre"] = tmdb_set
 				except Exception as e:
 					conn.rollback()
 					console.log(f"Inserting tmdb_genre: {e}", style="error")
-				finally:
-					conn.autocommit = True
 
-		# Create CSV file for tmdb_genre
-		# utils.create_csv_file(os.getenv("TMP_DIR") + "/tmdb_genre.csv", db_set)
 		# Insert sync log
 		insert_sync_log(start_time, "genre", True)
 	except Exception as e:
@@ -433,66 +574,49 @@ def sync_tmdb_keyword() -> None:
 	try:
 		console.log("[sync_tmdb_keyword] Starting syncing tmdb_keyword", style="info")
 
-		db_list: list = get_table("tmdb_keyword", ["id"])
-		if not db_list:
-			raise Exception("Failed to download tmdb_keyword")
-
-		tmdb_list: list = get_tmdb_export_ids("keyword", start_time)
-		if not tmdb_list:
+		# Keep the names of the export to build the rows without a second pass
+		tmdb_keywords: dict = {item["id"]: item["name"] for item in iter_tmdb_export("keyword", start_time)}
+		if not tmdb_keywords:
 			raise Exception("Failed to get TMDB keywords")
 		
-		db_set: set = {item[0] for item in db_list}
-		tmdb_set: set = {item["id"] for item in tmdb_list}
+		tmdb_set: set = set(tmdb_keywords)
 
 		# Get difference between db and tmdb
-		missing_in_db: set = tmdb_set - db_set
-		missing_in_tmdb: set = db_set - tmdb_set
+		missing_in_db, missing_in_tmdb = get_table_diff("tmdb_keyword", "id", tmdb_set, "int")
 
 		# Delete missing in tmdb
 		if missing_in_tmdb:
 			console.log(f"[sync_tmdb_keyword] Found {len(missing_in_tmdb)} extra keywords in db", style="warning")
-			make_query("DELETE FROM tmdb_keyword WHERE id IN %s", (tuple(missing_in_tmdb),))
-			db_set -= missing_in_tmdb
+			delete_rows("tmdb_keyword", "id", missing_in_tmdb, "int")
+		table_cache["tmdb_keyword"] = tmdb_set - missing_in_db
 		
 		if missing_in_db:
 			console.log(f"[sync_tmdb_keyword] Found {len(missing_in_db)} missing keywords in db", style="warning")
-			with psycopg2.connect(env_postgres_connection_string) as conn:
+			with get_connection() as conn:
 				with conn.cursor() as cursor:
 					try:
-						# Démarrez la transaction
-						conn.autocommit = False
-
 						values_to_insert_keyword = [
-							(keyword['id'], keyword['name'])
-							for keyword in tmdb_list
-							if keyword['id'] in missing_in_db
+							(keyword_id, tmdb_keywords[keyword_id])
+							for keyword_id in missing_in_db
 						]
 						
 						# Push in db
-						cursor.executemany("""
+						execute_values(cursor, """
 							INSERT INTO tmdb_keyword (id, name)
-							VALUES (%s, %s)
+							VALUES %s
 							ON CONFLICT (id) DO UPDATE
 							SET name = EXCLUDED.name
-						""", values_to_insert_keyword)
+						""", values_to_insert_keyword, page_size=LANG_BATCH)
 
 						# Valider les modifications
 						conn.commit()
-
-						db_set.update(missing_in_db)
+						table_cache["tmdb_keyword"] = tmdb_set
 
 					except Exception as e:
 						# En cas d'erreur, annulez la transaction
 						conn.rollback()
 						console.log(f"Inserting tmdb_keyword: {e}", style="error")
 
-					finally:
-						# Rétablissez le mode autocommit à True
-						conn.autocommit = True
-		
-		# Create CSV file for tmdb_keyword
-		# utils.create_csv_file(os.getenv("TMP_DIR") + "/tmdb_keyword.csv", db_set)
-
 		# Insert sync log
 		insert_sync_log(start_time, "keyword", True)
 	except Exception as e:
@@ -516,116 +640,100 @@ def sync_tmdb_collection() -> None:
 	try:
 		console.log("[sync_tmdb_collection] Starting syncing tmdb_collection", style="info")
 
-		db_list: list = get_table("tmdb_collection", ["id"])
-		if not db_list:
-			raise Exception("Failed to download tmdb_collection")
-		
-		tmdb_list: list = get_tmdb_export_ids("collection", start_time)
-		if not tmdb_list:
+		tmdb_set: set = get_tmdb_export_ids("collection", start_time)
+		if not tmdb_set:
 			raise Exception("Failed to get TMDB collections")
-		
-		db_set: set = {item[0] for item in db_list}
-		tmdb_set: set = {item["id"] for item in tmdb_list}
 
 		# Get difference between db and tmdb
-		missing_in_db: set = tmdb_set - db_set
-		missing_in_tmdb: set = db_set - tmdb_set
+		missing_in_db, missing_in_tmdb = get_table_diff("tmdb_collection", "id", tmdb_set, "int")
 
 		# Delete missing in tmdb
 		if missing_in_tmdb:
 			console.log(f"[sync_tmdb_collection] Found {len(missing_in_tmdb)} extra collections in db", style="warning")
-			make_query("DELETE FROM tmdb_collection WHERE id IN %s", (tuple(missing_in_tmdb),))
-			db_set -= missing_in_tmdb
+			delete_rows("tmdb_collection", "id", missing_in_tmdb, "int")
+		table_cache["tmdb_collection"] = tmdb_set - missing_in_db
 
 		if missing_in_db:
 			console.log(f"[sync_tmdb_collection] Found {len(missing_in_db)} missing collections in db", style="warning")
 			
-			# Insert in chunks of 500
-			chunks = list(chunked(missing_in_db, batch_size))
+			# Insert in chunks of COLLECTION_BATCH, produced lazily
+			total_chunks: int = math.ceil(len(missing_in_db) / COLLECTION_BATCH)
+			chunks = chunked(missing_in_db, COLLECTION_BATCH)
 
 			# Add main progress bar for chunks and sub progress bar for collections
-			with Progress() as progress:
-				main_task: TaskID = progress.add_task("[cyan]Processing chunks", total=len(chunks))
-				for chunk in chunks:
-					with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-						items_to_insert = []
-						futures = []
-
-						# Re-use sub progress bar for each chunk
-						collections_task: TaskID = progress.add_task(f"Processing collections", total=len(chunk))
-						for collection in chunk:
-							futures.append(executor.submit(get_tmdb_collection, collection))
-
-						for future in futures:
-							collection = future.result()
-							if collection:
-								items_to_insert.append(collection)
-							progress.update(collections_task, advance=1)
-						
-						with psycopg2.connect(env_postgres_connection_string) as conn:
-							with conn.cursor() as cursor:
-								try:
-									# Démarrez la transaction
-									conn.autocommit = False
-
-									values_to_insert_collection = [
-										{
-											'id': collection_data['en']['id'],
-											'backdrop_path': collection_data['en'].get('backdrop_path', None),
-										}
-										for collection_data in items_to_insert
-									]
-
-									cursor.executemany("""
-										INSERT INTO tmdb_collection (id, backdrop_path)
-										VALUES (%(id)s, %(backdrop_path)s)
-										ON CONFLICT (id) DO NOTHING
-									""", values_to_insert_collection)
-
-									values_to_insert_translations = [
-										{
-											'collection': collection_data['en']['id'],
-											'language': 'en',
-											'overview': collection_data['en'].get('overview', None),
-											'poster_path': collection_data['en'].get('poster_path', None),
-											'name': collection_data['en'].get('name', None),
-										}
-										for collection_data in items_to_insert
-									] + [
-										{
-											'collection': collection_data['fr']['id'],
-											'language': 'fr',
-											'overview': collection_data['fr'].get('overview', None),
-											'poster_path': collection_data['fr'].get('poster_path', None),
-											'name': collection_data['fr'].get('name', None),
-										}
-										for collection_data in items_to_insert
-									]
-
-									cursor.executemany("""
-										INSERT INTO tmdb_collection_translation (collection, language, overview, poster_path, name)
-										VALUES (%(collection)s, %(language)s, %(overview)s, %(poster_path)s, %(name)s)
-										ON CONFLICT (collection, language) DO UPDATE
-										SET overview = EXCLUDED.overview,
-											poster_path = EXCLUDED.poster_path,
-											name = EXCLUDED.name
-									""", values_to_insert_translations)
-
-									conn.commit()
-
-									# Add chunk to db_set
-									db_set.update(set(chunk))
-								except Exception as e:
-									conn.rollback()
-									console.log(f"Inserting tmdb_collection: {e}", style="error")
-								finally:
-									conn.autocommit = True
+			# One connection for every chunk, committed every COMMIT_EVERY chunks
+			# One pool for every chunk, the next chunk is fetched while the current one is written
+			with Progress() as progress, get_connection() as conn, ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+				pending_ids: set = set()
+				main_task: TaskID = progress.add_task("[cyan]Processing chunks", total=total_chunks)
+				# Re-use sub progress bar for each chunk
+				collections_task: TaskID = progress.add_task(f"Processing collections", total=COLLECTION_BATCH)
+				futures = [executor.submit(get_tmdb_collection, collection) for collection in next(chunks)]
+				for index in range(1, total_chunks + 1):
+					items_to_insert = []
+					progress.reset(collections_task, total=len(futures))
+
+					# Handle results as soon as they are ready so a slow request does not hold back the others
+					for future in as_completed(futures):
+						collection = future.result()
+						if collection:
+							items_to_insert.append(collection)
+						progress.update(collections_task, advance=1)
+
+					if index < total_chunks:
+						futures = [executor.submit(get_tmdb_collection, collection) for collection in next(chunks)]
+
+					chunk_ids = {collection_data['en']['id'] for collection_data in items_to_insert}
+					try:
+						with conn.cursor() as cursor:
+							# A failing chunk only rolls back to its savepoint, the chunks already written in this transaction are kept
+							cursor.execute("SAVEPOINT chunk")
+							try:
+								values_to_insert_collection = [
+									(collection_data['en']['id'], collection_data['en'].get('backdrop_path'))
+									for collection_data in items_to_insert
+								]
+
+								copy_upsert(cursor, "tmdb_collection", ["id", "backdrop_path"], values_to_insert_collection, ["id"])
+
+								values_to_insert_translations = [
+									(
+										collection_data[language]['id'],
+										language,
+										collection_data[language].get('overview'),
+										collection_data[language].get('poster_path'),
+										collection_data[language].get('name'),
+									)
+									for collection_data in items_to_insert
+									for language in ('en', 'fr')
+								]
+
+								copy_upsert(
+									cursor, "tmdb_collection_translation",
+									["collection", "language", "overview", "poster_path", "name"],
+									values_to_insert_translations,
+									["collection", "language"],
+									["overview", "poster_path", "name"]
+								)
+							except Exception as e:
+								cursor.execute("ROLLBACK TO SAVEPOINT chunk")
+								console.log(f"Inserting tmdb_collection: {e} ({len(chunk_ids)} collections skipped)", style="error")
+							else:
+								cursor.execute("RELEASE SAVEPOINT chunk")
+								pending_ids.update(chunk_ids)
+
+						if index % COMMIT_EVERY == 0 or index == total_chunks:
+							conn.commit()
+							table_cache["tmdb_collection"].update(pending_ids)
+							pending_ids.clear()
+					except Exception as e:
+						conn.rollback()
+						console.log(f"Inserting tmdb_collection: {e} ({len(pending_ids)} collections rolled back)", style="error")
+						pending_ids.clear()
 					progress.update(main_task, advance=1)
-					progress.remove_task(collections_task)
 
+				progress.remove_task(collections_task)
 				progress.remove_task(main_task)
-		# Create CSV file for tmdb_collection
-		# utils.create_csv_file(os.getenv("TMP_DIR") + "/tmdb_collection.csv", db_set)
 
 		# Insert sync log
 		insert_sync_log(start_time, "collection", True)
@@ -636,6 +744,8 @@ def sync_tmdb_collection() -> None:
 # ---------------------------------------------------------------------------- #
 
 # ----------------------------- Sync TMDB Company ---------------------------- #
+COMPANY_COLUMNS = ("id", "name", "description", "headquarters", "homepage", "logo_path", "origin_country", "parent_company")
+
 def get_tmdb_company(company_id: int) -> dict:
 	company = get_tmdb_data(f"company/{company_id}", {})
 	if (company is None):
@@ -646,101 +756,80 @@ def sync_tmdb_company() -> None:
 	try:
 		console.log("[sync_tmdb_company] Starting syncing tmdb_company", style="info")
 
-		db_list: list = get_table("tmdb_company", ["id"])
-		if not db_list:
-			raise Exception("Failed to download tmdb_company")
-		
-		tmdb_list: list = get_tmdb_export_ids("production_company", start_time)
-		if not tmdb_list:
+		tmdb_set: set = get_tmdb_export_ids("production_company", start_time)
+		if not tmdb_set:
 			raise Exception("Failed to get TMDB companies")
-		
-		db_set: set = {item[0] for item in db_list}
-		tmdb_set: set = {item["id"] for item in tmdb_list}
 
 		# Get difference between db and tmdb
-		missing_in_db: set = tmdb_set - db_set
-		missing_in_tmdb: set = db_set - tmdb_set
+		missing_in_db, missing_in_tmdb = get_table_diff("tmdb_company", "id", tmdb_set, "int")
 
 		# Delete missing in tmdb
 		if missing_in_tmdb:
 			console.log(f"[sync_tmdb_company] Found {len(missing_in_tmdb)} extra companies in db", style="warning")
-			make_query("DELETE FROM tmdb_company WHERE id IN %s", (tuple(missing_in_tmdb),))
-			db_set -= missing_in_tmdb
+			delete_rows("tmdb_company", "id", missing_in_tmdb, "int")
+		table_cache["tmdb_company"] = tmdb_set - missing_in_db
 
 		if missing_in_db:
 			console.log(f"[sync_tmdb_company] Found {len(missing_in_db)} missing companies in db", style="warning")
 			
-			# Insert in chunks of 500
-			chunks = list(chunked(missing_in_db, batch_size))
+			# Insert in chunks of COMPANY_BATCH, produced lazily
+			total_chunks: int = math.ceil(len(missing_in_db) / COMPANY_BATCH)
+			chunks = chunked(missing_in_db, COMPANY_BATCH)
 
 			# Add main progress bar for chunks and sub progress bar for companies
-			with Progress() as progress:
-				main_task: TaskID = progress.add_task("[cyan]Processing chunks", total=len(chunks))
-				for chunk in chunks:
-					with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-						items_to_insert = []
-						futures = []
-
-						# Re-use sub progress bar for each chunk
-						companies_task: TaskID = progress.add_task(f"Processing companies", total=len(chunk))
-						for company in chunk:
-							futures.append(executor.submit(get_tmdb_company, company))
-
-						for future in futures:
-							company = future.result()
-							if company:
-								items_to_insert.append(company)
-							progress.update(companies_task, advance=1)
-						
-						with psycopg2.connect(env_postgres_connection_string) as conn:
-							with conn.cursor() as cursor:
-								try:
-									# Démarrez la transaction
-									conn.autocommit = False
-
-									values_to_insert_company = [
-										{
-											'id': company_data['id'],
-											'name': company_data.get('name', None),
-											'description': company_data.get('description', None),
-											'headquarters': company_data.get('headquarters', None),
-											'homepage': company_data.get('homepage', None),
-											'logo_path': company_data.get('logo_path', None),
-											'origin_country': company_data.get('origin_country', None),
-											'parent_company': company_data.get('parent_company', None),
-										}
-										for company_data in items_to_insert
-									]
-
-									cursor.executemany("""
-										INSERT INTO tmdb_company (id, name, description, headquarters, homepage, logo_path, origin_country, parent_company)
-										VALUES (%(id)s, %(name)s, %(description)s, %(headquarters)s, %(homepage)s, %(logo_path)s, %(origin_country)s, %(parent_company)s)
-										ON CONFLICT (id) DO UPDATE
-										SET
-											name = EXCLUDED.name,
-											description = EXCLUDED.description,
-											headquarters = EXCLUDED.headquarters,
-											homepage = EXCLUDED.homepage,
-											logo_path = EXCLUDED.logo_path,
-											origin_country = EXCLUDED.origin_country,
-											parent_company = EXCLUDED.parent_company
-									""", values_to_insert_company)
-
-									conn.commit()
-
-									# Add chunk to db_set
-									db_set.update(set(chunk))
-								except Exception as e:
-									conn.rollback()
-									console.log(f"Inserting tmdb_company: {e}", style="error")
-								finally:
-									conn.autocommit = True
+			# One connection for every chunk, committed every COMMIT_EVERY chunks
+			# One pool for every chunk, the next chunk is fetched while the current one is written
+			with Progress() as progress, get_connection() as conn, ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+				pending_ids: set = set()
+				main_task: TaskID = progress.add_task("[cyan]Processing chunks", total=total_chunks)
+				# Re-use sub progress bar for each chunk
+				companies_task: TaskID = progress.add_task(f"Processing companies", total=COMPANY_BATCH)
+				futures = [executor.submit(get_tmdb_company, company) for company in next(chunks)]
+				for index in range(1, total_chunks + 1):
+					items_to_insert = []
+					progress.reset(companies_task, total=len(futures))
+
+					# Handle results as soon as they are ready so a slow request does not hold back the others
+					for future in as_completed(futures):
+						company = future.result()
+						if company:
+							items_to_insert.append(company)
+						progress.update(companies_task, advance=1)
+
+					if index < total_chunks:
+						futures = [executor.submit(get_tmdb_company, company) for company in next(chunks)]
+
+					chunk_ids = {company_data['id'] for company_data in items_to_insert}
+					try:
+						with conn.cursor() as cursor:
+							# A failing chunk only rolls back to its savepoint, the chunks already written in this transaction are kept
+							cursor.execute("SAVEPOINT chunk")
+							try:
+								values_to_insert_company = [
+									tuple(company_data.get(column) for column in COMPANY_COLUMNS)
+									for company_data in items_to_insert
+								]
+
+								copy_upsert(cursor, "tmdb_company", COMPANY_COLUMNS, values_to_insert_company, ["id"], COMPANY_COLUMNS[1:])
+							except Exception as e:
+								cursor.execute("ROLLBACK TO SAVEPOINT chunk")
+								console.log(f"Inserting tmdb_company: {e} ({len(chunk_ids)} companies skipped)", style="error")
+							else:
+								cursor.execute("RELEASE SAVEPOINT chunk")
+								pending_ids.update(chunk_ids)
+
+						if index % COMMIT_EVERY == 0 or index == total_chunks:
+							conn.commit()
+							table_cache["tmdb_company"].update(pending_ids)
+							pending_ids.clear()
+					except Exception as e:
+						conn.rollback()
+						console.log(f"Inserting tmdb_company: {e} ({len(pending_ids)} companies rolled back)", style="error")
+						pending_ids.clear()
 					progress.update(main_task, advance=1)
-					progress.remove_task(companies_task)
 
+				progress.remove_task(companies_task)
 				progress.remove_task(main_task)
-		# Create CSV file for tmdb_company
-		# utils.create_csv_file(os.getenv("TMP_DIR") + "/tmdb_company.csv", db_set)
 
 		# Insert sync log
 		insert_sync_log(start_time, "company", True)
@@ -750,153 +839,106 @@ def sync_tmdb_company() -> None:
 
 # ----------------------------- Sync TMDB Person ----------------------------- #
 def get_tmdb_person(person_id: int) -> dict:
-	person_en = get_tmdb_data(f"person/{person_id}", {"language": "en-US"})
-	person_fr = get_tmdb_data(f"person/{person_id}", {"language": "fr-FR"})
-
-	if (person_en is None or person_fr is None):
+	# The french biography comes from the appended translations, so one call is enough
+	person_en = get_tmdb_data(f"person/{person_id}", {"language": "en-US", "append_to_response": "translations"})
+	if (person_en is None):
 		return None
+
+	translation_fr = get_tmdb_translation(person_en, "fr", "FR")
 	return {
 		"en": person_en,
-		"fr": person_fr
+		"fr": {
+			"id": person_en["id"],
+			"biography": translation_fr.get("biography", "") if translation_fr else ""
+		}
 	}
 
-def update_db_person(persons_to_update: list) -> None:
+PERSON_COLUMNS = ("id", "adult", "also_known_as", "birthday", "deathday", "gender", "homepage", "imdb_id", "known_for_department", "name", "place_of_birth", "popularity", "profile_path")
+PERSON_DEFAULTS = {"adult": False, "also_known_as": []}
+
+def update_db_person(persons_to_update: list) -> bool:
 	try:
-		with psycopg2.connect(env_postgres_connection_string) as conn:
+		with get_connection() as conn:
 			with conn.cursor() as cursor:
 				try:
-					# Démarrez la transaction
-					conn.autocommit = False
-
 					values_to_insert_person = [
-						{
-							'id': person_data['en']['id'],
-							'adult': person_data['en'].get('adult', False),
-							'also_known_as': person_data['en'].get('also_known_as', []),
-							'birthday': person_data['en'].get('birthday', None),
-							'deathday': person_data['en'].get('deathday', None),
-							'gender': person_data['en'].get('gender', None),
-							'homepage': person_data['en'].get('homepage', None),
-							'imdb_id': person_data['en'].get('imdb_id', None),
-							'known_for_department': person_data['en'].get('known_for_department', None),
-							'name': person_data['en'].get('name', None),
-							'place_of_birth': person_data['en'].get('place_of_birth', None),
-							'popularity': person_data['en'].get('popularity', None),
-							'profile_path': person_data['en'].get('profile_path', None),
-						}
+						tuple(person_data['en'].get(column, PERSON_DEFAULTS.get(column)) for column in PERSON_COLUMNS)
 						for person_data in persons_to_update
 					]
 
-					cursor.executemany("""
-						INSERT INTO tmdb_person (id, adult, also_known_as, birthday, deathday, gender, homepage, imdb_id, known_for_department, name, place_of_birth, popularity, profile_path)
-						VALUES (%(id)s, %(adult)s, %(also_known_as)s, %(birthday)s, %(deathday)s, %(gender)s, %(homepage)s, %(imdb_id)s, %(known_for_department)s, %(name)s, %(place_of_birth)s, %(popularity)s, %(profile_path)s)
-						ON CONFLICT (id) DO UPDATE
-						SET
-							adult = EXCLUDED.adult,
-							also_known_as = EXCLUDED.also_known_as,
-							birthday = EXCLUDED.birthday,
-							deathday = EXCLUDED.deathday,
-							gender = EXCLUDED.gender,
-							homepage = EXCLUDED.homepage,
-							imdb_id = EXCLUDED.imdb_id,
-							known_for_department = EXCLUDED.known_for_department,
-							name = EXCLUDED.name,
-							place_of_birth = EXCLUDED.place_of_birth,
-							popularity = EXCLUDED.popularity,
-							profile_path = EXCLUDED.profile_path
-					""", values_to_insert_person)
-
+					copy_upsert(cursor, "tmdb_person", PERSON_COLUMNS, values_to_insert_person, ["id"], PERSON_COLUMNS[1:])
 
 					values_to_insert_person_translations = [
-						{
-							'person': person_data['en']['id'],
-							'language': 'en',
-							'biography': person_data['en'].get('biography', None),
-						}
-						for person_data in persons_to_update
-					] + [
-						{
-							'person': person_data['fr']['id'],
-							'language': 'fr',
-							'biography': person_data['fr'].get('biography', None),
-						}
+						(person_data[language]['id'], language, person_data[language].get('biography'))
 						for person_data in persons_to_update
+						for language in ('en', 'fr')
 					]
 
-					cursor.executemany("""
-						INSERT INTO tmdb_person_translation (person, language, biography)
-						VALUES (%(person)s, %(language)s, %(biography)s)
-						ON CONFLICT (person, language) DO UPDATE
-						SET biography = EXCLUDED.biography
-					""", values_to_insert_person_translations)
+					copy_upsert(
+						cursor, "tmdb_person_translation",
+						["person", "language", "biography"],
+						values_to_insert_person_translations,
+						["person", "language"],
+						["biography"]
+					)
 
 					conn.commit()
+					return True
 				
 				except Exception as e:
 					conn.rollback()
 					console.log(f"Inserting tmdb_person: {e}", style="error")
-				finally:
-					conn.autocommit = True
 	except Exception as e:
 		console.log(f"Inserting tmdb_person: {e}", style="error")
+	return False
 	
 def sync_tmdb_person_daily_export() -> None:
 	try:
 		console.log("[sync_tmdb_person_daily_export] Starting syncing tmdb_person daily export", style="info")
 
-		db_list: list = get_table("tmdb_person", ["id"])
-		if not db_list:
-			raise Exception("Failed to download tmdb_person")
+		db_set: set = get_table("tmdb_person", "id")
 		
-		tmdb_list: list = get_tmdb_export_ids("person", start_time)
-		if not tmdb_list:
+		tmdb_set: set = get_tmdb_export_ids("person", start_time)
+		if not tmdb_set:
 			raise Exception("Failed to get TMDB persons")
-		
-		db_set: set = {item[0] for item in db_list}
-		tmdb_set: set = {item["id"] for item in tmdb_list}
 
-		# Get difference between db and tmdb
-		missing_in_db: set = tmdb_set - db_set
-		missing_in_tmdb: set = db_set - tmdb_set
+		# Get difference between db and tmdb (db_set is not needed afterwards, so it is reduced in place)
+		missing_in_db: set = tmdb_set.difference(db_set)
+		db_set.difference_update(tmdb_set)
+		missing_in_tmdb: set = db_set
 
 		# Delete missing in tmdb
 		if missing_in_tmdb:
 			console.log(f"[sync_tmdb_person_daily_export] Found {len(missing_in_tmdb)} extra persons in db", style="warning")
-			make_query("DELETE FROM tmdb_person WHERE id IN %s", (tuple(missing_in_tmdb),))
-			db_set -= missing_in_tmdb
+			delete_rows("tmdb_person", "id", missing_in_tmdb, "int", DELETE_CASCADE_CHUNK_SIZE)
 
 		if missing_in_db:
 			console.log(f"[sync_tmdb_person_daily_export] Found {len(missing_in_db)} missing persons in db", style="warning")
 			
-			# Insert in chunks of 500
-			chunks = list(chunked(missing_in_db, batch_size))
+			# Insert in chunks of PERSON_BATCH, produced lazily
+			total_chunks: int = math.ceil(len(missing_in_db) / PERSON_BATCH)
+			chunks = chunked(missing_in_db, PERSON_BATCH)
 
 			# Add main progress bar for chunks and sub progress bar for persons
-			with Progress() as progress:
-				main_task: TaskID = progress.add_task("[cyan]Processing chunks", total=len(chunks))
+			# One pool for every chunk, only the DB writer stays serial
+			with Progress() as progress, background_writer(update_db_person) as write_batch, ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+				main_task: TaskID = progress.add_task("[cyan]Processing chunks", total=total_chunks)
+				# Re-use sub progress bar for each chunk
+				persons_task: TaskID = progress.add_task(f"Processing persons", total=PERSON_BATCH)
 				for chunk in chunks:
-					with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-						items_to_insert: list = []
-						futures: list = []
-
-						# Re-use sub progress bar for each chunk
-						persons_task: TaskID = progress.add_task(f"Processing persons", total=len(chunk))
-						for person in chunk:
-							futures.append(executor.submit(get_tmdb_person, person))
-
-						for future in futures:
-							person = future.result()
-							if person:
-								items_to_insert.append(person)
-							progress.update(persons_task, advance=1)
-						
-						update_db_person(items_to_insert)
-						progress.update(main_task, advance=1)
-						progress.remove_task(persons_task)
+					items_to_insert: list = []
+					progress.reset(persons_task, total=len(chunk))
+
+					for person in executor.map(get_tmdb_person, chunk):
+						if person:
+							items_to_insert.append(person)
+						progress.update(persons_task, advance=1)
 
+					write_batch(items_to_insert)
+					progress.update(main_task, advance=1)
+
+				progress.remove_task(persons_task)
 				progress.remove_task(main_task)
-		# Create CSV file for tmdb_person
-		# utils.create_csv_file(os.getenv("TMP_DIR") + "/tmdb_person.csv", db_set)
 	except Exception as e:
 		raise Exception(f"(sync_tmdb_person_daily_export) {e}")
 	
@@ -908,51 +950,58 @@ def sync_tmdb_person_changes_export() -> None:
 		if not last_sync_date:
 			raise Exception("Failed to get last sync date")
 		
-		current_page = 1
+		end_date: str = start_date
 		persons_to_update = []
 
-		first_page = get_tmdb_data("person/changes", {"start_date": last_sync_date, "end_date": start_time.strftime("%Y-%m-%d"), "page": current_page})
-		if not first_page:
-			raise Exception("Failed to get TMDB person changes")
-		total_to_update = first_page["total_results"]
-		console.log(f"[sync_tmdb_person_changes_export] Found {total_to_update} persons to update between {last_sync_date} and {start_time.strftime('%Y-%m-%d')}", style="info")
+		# Resume after the last page written by a previous run over the same window
+		current_page = get_sync_cursor("person", last_sync_date, end_date) + 1
+		if current_page > 1:
+			console.log(f"[sync_tmdb_person_changes_export] Resuming at page {current_page}", style="info")
 
-		with Progress() as progress:
+		changes_page = get_tmdb_data("person/changes", {"start_date": last_sync_date, "end_date": end_date, "page": current_page})
+		if not changes_page:
+			raise Exception("Failed to get TMDB person changes")
+		total_to_update = changes_page["total_results"]
+		console.log(f"[sync_tmdb_person_changes_export] Found {total_to_update} persons to update between {last_sync_date} and {end_date}", style="info")
+
+		# Save the cursor only after a successful write, and stop moving it once one batch failed
+		cursor_state = {"failed": False}
+		def write_persons(batch: tuple) -> None:
+			persons, page = batch
+			if update_db_person(persons) and not cursor_state["failed"]:
+				set_sync_cursor("person", last_sync_date, end_date, page)
+			else:
+				cursor_state["failed"] = True
+
+		with Progress() as progress, background_writer(write_persons) as write_batch, ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
 			main_task: TaskID = progress.add_task("[cyan]Processing persons", total=total_to_update)
-			while True:
-				changed_persons_response = get_tmdb_data("person/changes", {"start_date": last_sync_date, "end_date": start_time.strftime("%Y-%m-%d"), "page": current_page})
-				if not changed_persons_response:
-					raise Exception("Failed to get TMDB person changes")
-				
-				changed_persons = changed_persons_response["results"]
-				if not changed_persons or len(changed_persons) == 0:
-					break
+			while changes_page and changes_page["results"]:
+				for person in executor.map(get_tmdb_person, [changed_person['id'] for changed_person in changes_page["results"]]):
+					if person:
+						persons_to_update.append(person)
+					progress.update(main_task, advance=1)
 
-				with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-					futures = []
-					for person in changed_persons:
-						futures.append(executor.submit(get_tmdb_person, person['id']))
+				# Update db every PERSON_BATCH persons, on a page boundary so the cursor stays exact
+				if len(persons_to_update) >= PERSON_BATCH:
+					write_batch((persons_to_update, current_page))
+					persons_to_update = []
 
-					for future in futures:
-						person = future.result()
-						if person:
-							persons_to_update.append(person)
-						progress.update(main_task, advance=1)
-				
+				# Stop on the last page instead of asking for an empty one
+				if current_page >= changes_page["total_pages"]:
+					break
 				current_page += 1
+				changes_page = get_tmdb_data("person/changes", {"start_date": last_sync_date, "end_date": end_date, "page": current_page})
 
-				# Update db every 5 pages
-				if current_page % 5 == 0:
-					if len(persons_to_update):
-						update_db_person(persons_to_update)
-					persons_to_update = []
-			
 			# Update db for remaining persons
 			if len(persons_to_update):
-				update_db_person(persons_to_update)
+				write_batch((persons_to_update, current_page))
 
 			progress.remove_task(main_task)
 
+		# Fail the sync when a batch was not written: the sync log stays unsuccessful and the next run retries from the saved cursor
+		if cursor_state["failed"]:
+			raise Exception(f"Failed to write some persons, last written page kept for the next run")
+
 	except Exception as e:
 		raise Exception(f"(sync_tmdb_person_changes_export) {e}")
 
@@ -978,19 +1027,23 @@ def get_csv_data() -> None:
 	global csv_data
 	csv_data = {}
 	try:
-		csv_data['language'] = get_table("tmdb_language", ["iso_639_1"])
-		csv_data['country'] = get_table("tmdb_country", ["iso_3166_1"])
-		csv_data['genre'] = get_table("tmdb_genre", ["id"])
-		csv_data['keyword'] = get_table("tmdb_keyword", ["id"])
-		csv_data['collection'] = get_table("tmdb_collection", ["id"])
-		csv_data['company'] = get_table("tmdb_company", ["id"])
-		csv_data['person'] = get_table("tmdb_person", ["id"])
+		csv_data['language'] = frozenset(get_table_keys("tmdb_language", "iso_639_1"))
+		csv_data['country'] = frozenset(get_table_keys("tmdb_country", "iso_3166_1"))
+		csv_data['genre'] = frozenset(get_table_keys("tmdb_genre", "id"))
+		csv_data['keyword'] = frozenset(get_table_keys("tmdb_keyword", "id"))
+		csv_data['collection'] = frozenset(get_table_keys("tmdb_collection", "id"))
+		csv_data['company'] = frozenset(get_table_keys("tmdb_company", "id"))
 	except Exception as e:
 		raise Exception(f"(get_csv_data) {e}")
 
+# Separate pool for the french calls so they never wait behind the movie workers that submit them
+movie_fr_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+
 def get_tmdb_movie(movie_id: int) -> dict:
+	# Fetch both languages at the same time instead of one after the other
+	movie_fr_future = movie_fr_executor.submit(get_tmdb_data, f"movie/{movie_id}", {"language": "fr-FR", "append_to_response": "credits,keywords,videos,belongs_to_collection"})
 	movie_en = get_tmdb_data(f"movie/{movie_id}", {"language": "en-US", "append_to_response": "credits,keywords,videos,belongs_to_collection"})
-	movie_fr = get_tmdb_data(f"movie/{movie_id}", {"language": "fr-FR", "append_to_response": "credits,keywords,videos,belongs_to_collection"})
+	movie_fr = movie_fr_future.result()
 	if (movie_en is None or movie_fr is None):
 		return None
 	return {
@@ -998,523 +1051,283 @@ def get_tmdb_movie(movie_id: int) -> dict:
 		"french": movie_fr
 	}
 
-def update_db_movie(movies_to_update: list) -> None:
+# Writers for the movie child tables, one pooled connection each
+movie_child_executor = ThreadPoolExecutor(max_workers=CHILD_TABLE_WORKERS)
+
+# Credits of known persons and the roles of those credits in a single statement
+def copy_movie_credits(cursor, credits: list, roles: list) -> None:
+	if not credits:
+		return
+	credits_stage = copy_to_stage(cursor, "tmdb_movie_credits", ["id", "movie_id", "person_id", "department", "job"], credits)
+	roles_stage = copy_to_stage(cursor, "tmdb_movie_role", ["credit_id", "character", '"order"'], roles)
+	# The outer INSERT does not see the CTE's rows in tmdb_movie_credits, hence RETURNING for the new credits
+	cursor.execute(f"""
+		WITH inserted AS (
+			INSERT INTO tmdb_movie_credits (id, movie_id, person_id, department, job)
+			SELECT id, movie_id, person_id, department, job FROM {credits_stage} AS stage
+			WHERE EXISTS (SELECT 1 FROM tmdb_person WHERE tmdb_person.id = stage.person_id)
+			ON CONFLICT (id) DO NOTHING
+			RETURNING id
+		)
+		INSERT INTO tmdb_movie_role (credit_id, character, "order")
+		SELECT credit_id, character, "order" FROM {roles_stage} AS stage
+		WHERE stage.credit_id IN (SELECT id FROM inserted)
+			OR EXISTS (SELECT 1 FROM tmdb_movie_credits WHERE tmdb_movie_credits.id = stage.credit_id)
+		ON CONFLICT (credit_id) DO NOTHING
+	""")
+	cursor.execute(f"DROP TABLE {credits_stage}, {roles_stage}")
+
+MOVIE_COLUMNS = ("id", "adult", "backdrop_path", "budget", "homepage", "imdb_id", "original_language", "original_title", "popularity", "release_date", "revenue", "runtime", "status", "vote_average", "vote_count", "collection_id")
+MOVIE_VIDEO_TYPES = ("Teaser", "Trailer")
+
+# tmdb_movie_videos rows: only "Teaser" or "Trailer" videos in the language of the request, in one scan
+def build_video_rows(videos: list, movie_id: int, iso_639_1: str):
+	for video in videos:
+		if not isinstance(video, dict):
+			continue
+		if video.get('iso_639_1') != iso_639_1 or video.get('type') not in MOVIE_VIDEO_TYPES:
+			continue
+		yield (
+			video.get('id'),
+			movie_id,
+			video.get('iso_639_1'),
+			video.get('iso_3166_1'),
+			video.get('name'),
+			video.get('key'),
+			video.get('site'),
+			video.get('size'),
+			video.get('type'),
+			video.get('official', False),
+		)
+
+def update_db_movie(movies_to_update: list) -> bool:
 	try:
 		if not csv_data:
 			raise Exception("CSV data is empty")
-		with psycopg2.connect(env_postgres_connection_string) as connection:
+		# A failure rolls the open transaction back in get_connection() and is reported below
+		with get_connection() as connection:
 			with connection.cursor() as cursor:
-				try:
-					# Démarrez la transaction
-					connection.autocommit = False
-
-					# ========== START TMDB_MOVIE ========== #
-					# Construire les valeurs à insérer dans Supabase pour tmdb_movie
-					values_to_insert_movie = [
-						{
-							'id': movie_data['english']['id'],
-							'adult': movie_data['english'].get('adult', False),
-							'backdrop_path': movie_data['english'].get('backdrop_path', None),
-							'budget': movie_data['english'].get('budget', None),
-							'homepage': movie_data['english'].get('homepage', None),
-							'imdb_id': movie_data['english'].get('imdb_id', None),
-							'original_language': movie_data['english'].get('original_language', None),
-							'original_title': movie_data['english'].get('original_title', None),
-							'popularity': movie_data['english'].get('popularity', None),
-							'release_date': None if movie_data['english'].get('release_date') == '' else movie_data['english'].get('release_date', None),
-							'revenue': movie_data['english'].get('revenue', None),
-							'runtime': movie_data['english'].get('runtime', None),
-							'status': movie_data['english'].get('status', None),
-							'vote_average': movie_data['english'].get('vote_average', None),
-							'vote_count': movie_data['english'].get('vote_count', None),
-							'collection_id': movie_data['english']['belongs_to_collection']['id'] if movie_data['english'].get('belongs_to_collection') and movie_data['english']['belongs_to_collection']['id'] in csv_data['collection'] else None,						}
-						for movie_data in movies_to_update
-					]
-
-					# Insérer les valeurs dans Supabase pour tmdb_movie en utilisant ON CONFLICT pour l'upsert
-					cursor.execute(f"""
-						INSERT INTO tmdb_movie (id, adult, backdrop_path, budget, homepage, imdb_id, original_language, original_title, popularity, release_date, revenue, runtime, status, vote_average, vote_count, collection_id)
-						VALUES {', '.join(['(%(id)s, %(adult)s, %(backdrop_path)s, %(budget)s, %(homepage)s, %(imdb_id)s, %(original_language)s, %(original_title)s, %(popularity)s, %(release_date)s, %(revenue)s, %(runtime)s, %(status)s, %(vote_average)s, %(vote_count)s, %(collection_id)s)' for _ in values_to_insert_movie])}
-						ON CONFLICT (id) DO UPDATE
-						SET
-							adult = EXCLUDED.adult,
-							backdrop_path = EXCLUDED.backdrop_path,
-							budget = EXCLUDED.budget,
-							homepage = EXCLUDED.homepage,
-							imdb_id = EXCLUDED.imdb_id,
-							original_language = EXCLUDED.original_language,
-							original_title = EXCLUDED.original_title,
-							popularity = EXCLUDED.popularity,
-							release_date = EXCLUDED.release_date,
-							revenue = EXCLUDED.revenue,
-							runtime = EXCLUDED.runtime,
-							status = EXCLUDED.status,
-							vote_average = EXCLUDED.vote_average,
-							vote_count = EXCLUDED.vote_count,
-							collection_id = EXCLUDED.collection_id
-					""", [item for sublist in values_to_insert_movie for item in sublist])
-					
-					
-
-					# ========== END TMDB_MOVIE ========== #
-
-					# ========== START TMDB_MOVIE_TRANSLATION ========== #
-					# Construire les valeurs à insérer dans Supabase pour tmdb_movie_translation
-					values_to_insert_movie_translations = [
-						{
-							'movie_id': movie_data['english']['id'],
-							'language_id': 'en',
-							'overview': movie_data['english'].get('overview', None),
-							'poster_path': movie_data['english'].get('poster_path', None),
-							'tagline': movie_data['english'].get('tagline', None),
-							'title': movie_data['english'].get('title', None),
-						}
-						for movie_data in movies_to_update
-					] + [
-						{
-							'movie_id': movie_data['french']['id'],
-							'language_id': 'fr',
-							'overview': movie_data['french'].get('overview', None),
-							'poster_path': movie_data['french'].get('poster_path', None),
-							'tagline': movie_data['french'].get('tagline', None),
-							'title': movie_data['french'].get('title', None),
-						}
-						for movie_data in movies_to_update
-					]
-
-					# Insérer les valeurs dans Supabase pour tmdb_movie_translation en utilisant ON CONFLICT pour l'upsert
-					# cursor.executemany("""
-					# 	INSERT INTO tmdb_movie_translation (movie_id, language_id, overview, poster_path, tagline, title)
-					# 	VALUES (%(movie_id)s, %(language_id)s, %(overview)s, %(poster_path)s, %(tagline)s, %(title)s)
-					# 	ON CONFLICT (movie_id, language_id) DO UPDATE
-					# 	SET
-					# 		overview = EXCLUDED.overview,
-					# 		poster_path = EXCLUDED.poster_path,
-					# 		tagline = EXCLUDED.tagline,
-					# 		title = EXCLUDED.title
-					# """, values_to_insert_movie_translations)
-
-					# use execute instead of executemany to insert multiple rows
-					cursor.execute(f"""
-						INSERT INTO tmdb_movie_translation (movie_id, language_id, overview, poster_path, tagline, title)
-						VALUES {', '.join(['(%(movie_id)s, %(language_id)s, %(overview)s, %(poster_path)s, %(tagline)s, %(title)s)' for _ in values_to_insert_movie_translations])}
-						ON CONFLICT (movie_id, language_id) DO UPDATE
-						SET
-							overview = EXCLUDED.overview,
-							poster_path = EXCLUDED.poster_path,
-							tagline = EXCLUDED.tagline,
-							title = EXCLUDED.title
-					""", [item for sublist in values_to_insert_movie_translations for item in sublist])
-
-					# ========== END TMDB_MOVIE_TRANSLATION ========== #
-			
-					# ========== START TMDB_MOVIE_COUNTRY ========== #
-					# Construire les valeurs à insérer dans Supabase pour tmdb_movie_country
-					values_to_insert_movie_countries = [
-						{
-							'movie_id': movie_data['english']['id'],
-							'country_id': country_data['iso_3166_1'],
-						}
-						for movie_data in movies_to_update
-						for country_data in movie_data.get('english', {}).get('production_countries', [])
-						if country_data['iso_3166_1'] in csv_data['country']
-					]
-
-					# Insérer les valeurs dans Supabase pour tmdb_movie_country en utilisant ON CONFLICT pour l'upsert
-					# cursor.executemany("""
-					# 	INSERT INTO tmdb_movie_country (movie_id, country_id)
-					# 	VALUES (%(movie_id)s, %(country_id)s)
-					# 	ON CONFLICT (movie_id, country_id) DO NOTHING
-					# """, values_to_insert_movie_countries)
-
-					# use execute instead of executemany to insert multiple rows
-					cursor.execute(f"""
-						INSERT INTO tmdb_movie_country (movie_id, country_id)
-						VALUES {', '.join(['(%(movie_id)s, %(country_id)s)' for _ in values_to_insert_movie_countries])}
-						ON CONFLICT (movie_id, country_id) DO NOTHING
-					""", [item for sublist in values_to_insert_movie_countries for item in sublist])
-					
-					# ========== END TMDB_MOVIE_COUNTRY ========== #
-
-					# ========== START TMDB_MOVIE_CREDIT ========== #
-					# Construire les valeurs à insérer dans Supabase pour tmdb_movie_credits
-					values_to_insert_movie_credits = []
-					for movie_data in movies_to_update:
-						movie_id = movie_data['english']['id']
-						credits_data = movie_data.get('english', {}).get('credits', {})
-						
-						if credits_data:
-							cast = credits_data.get('cast', [])
-							crew = credits_data.get('crew', [])
-
-							# Traitement pour le cast
-							values_cast = [
-								{
-									'id': actor.get('credit_id', None) if isinstance(actor, dict) else None,
-									'movie_id': movie_id,
-									'person_id': actor.get('id', None) if isinstance(actor, dict) else None,
-									'department': 'Acting',
-									'job': 'Actor'
-								}
-								for actor in cast
-								if isinstance(actor, dict) and actor.get('id') in csv_data['person']
-							]
-
-							# Traitement pour le crew
-							values_crew = [
-								{
-									'id': crew_member.get('credit_id', None) if isinstance(crew_member, dict) else None,
-									'movie_id': movie_id,
-									'person_id': crew_member.get('id', None) if isinstance(crew_member, dict) else None,
-									'department': crew_member.get('department', None) if isinstance(crew_member, dict) else None,
-									'job': crew_member.get('job', None) if isinstance(crew_member, dict) else None
-								}
-								for crew_member in crew
-								if isinstance(crew_member, dict) and crew_member.get('id') in csv_data['person']
-							]
-
-							# Concaténer les valeurs pour avoir une seule liste de crédits
-							values_to_insert_movie_credits.extend(values_cast)
-							values_to_insert_movie_credits.extend(values_crew)
-
-					# Insérer les valeurs dans Supabase pour tmdb_movie_credits en utilisant ON CONFLICT pour l'upsert
-					# cursor.executemany("""
-					# 	INSERT INTO tmdb_movie_credits (id, movie_id, person_id, department, job)
-					# 	VALUES (%(id)s, %(movie_id)s, %(person_id)s, %(department)s, %(job)s)
-					# 	ON CONFLICT (id) DO NOTHING
-					# """, values_to_insert_movie_credits)
-
-					# use execute instead of executemany to insert multiple rows
-					cursor.execute(f"""
-						INSERT INTO tmdb_movie_credits (id, movie_id, person_id, department, job)
-						VALUES {', '.join(['(%(id)s, %(movie_id)s, %(person_id)s, %(department)s, %(job)s)' for _ in values_to_insert_movie_credits])}
-						ON CONFLICT (id) DO NOTHING
-					""", [item for sublist in values_to_insert_movie_credits for item in sublist])
-					
-					# ========== END TMDB_MOVIE_CREDIT ========== #
-
-					# ========== START TMDB_MOVIE_ROLE ========== #
-					values_to_insert_movie_roles = []
-					for movie_data in movies_to_update:
-						credits_data = movie_data.get('english', {}).get('credits', {})
-						
-						if credits_data:
-							cast = credits_data.get('cast', [])
-
-							# Traitement pour les rôles
-							values_roles = []
-							for actor in cast:
-								if isinstance(actor, dict):
-									credit_id = actor.get('credit_id', None)
-									if credit_id in [credit['id'] for credit in values_to_insert_movie_credits]:
-										values_roles.append({
-											'credit_id': credit_id,
-											'character': actor.get('character', None),
-											'order': actor.get('order', None),
-										})
-
-							# Concaténer les valeurs pour avoir une seule liste de rôles
-							values_to_insert_movie_roles.extend(values_roles)
-							
-					# Insérer les valeurs dans Supabase pour tmdb_movie_role en utilisant ON CONFLICT pour l'upsert
-					# cursor.executemany("""
-					# 	INSERT INTO tmdb_movie_role (credit_id, character, "order")
-					# 	VALUES (%(credit_id)s, %(character)s, %(order)s)
-					# 	ON CONFLICT (credit_id) DO NOTHING
-					# """, values_to_insert_movie_roles)
-
-					# use execute instead of executemany to insert multiple rows
-					cursor.execute(f"""
-						INSERT INTO tmdb_movie_role (credit_id, character, "order")
-						VALUES {', '.join(['(%(credit_id)s, %(character)s, %(order)s)' for _ in values_to_insert_movie_roles])}
-						ON CONFLICT (credit_id) DO NOTHING
-					""", [item for sublist in values_to_insert_movie_roles for item in sublist])
-					
-					# ========== END TMDB_MOVIE_ROLE ========== #
-
-					# ========== START TMDB_MOVIE_GENRE ========== #
-					# Construire les valeurs à insérer dans Supabase pour tmdb_movie_genre
-					values_to_insert_movie_genres = []
-
-					for movie_data in movies_to_update:
-						genres_data = movie_data.get('english', {}).get('genres', [])
-
-						# Traitement pour les genres
-						values_genres = [
-							{
-								'movie_id': movie_data['english']['id'],
-								'genre_id': genre.get('id', None) if isinstance(genre, dict) else None,
-							}
-							for genre in genres_data
-							if isinstance(genre, dict) and genre.get('id') in csv_data['genre']
-						]
-
-						# Concaténer les valeurs pour avoir une seule liste de genres
-						values_to_insert_movie_genres.extend(values_genres)
-						
-					# Insérer les valeurs dans Supabase pour tmdb_movie_genre en utilisant ON CONFLICT pour l'upsert
-					# cursor.executemany("""
-					# 	INSERT INTO tmdb_movie_genre (movie_id, genre_id)
-					# 	VALUES (%(movie_id)s, %(genre_id)s)
-					# 	ON CONFLICT (movie_id, genre_id) DO NOTHING
-					# """, values_to_insert_movie_genres)
-
-					# use execute instead of executemany to insert multiple rows
-					cursor.execute(f"""
-						INSERT INTO tmdb_movie_genre (movie_id, genre_id)
-						VALUES {', '.join(['(%(movie_id)s, %(genre_id)s)' for _ in values_to_insert_movie_genres])}
-						ON CONFLICT (movie_id, genre_id) DO NOTHING
-					""", [item for sublist in values_to_insert_movie_genres for item in sublist])
-					
-					# ========== END TMDB_MOVIE_GENRE ========== #
-
-					# ========== START TMDB_MOVIE_KEYWORD ========== #
-					# Construire les valeurs à insérer dans Supabase pour tmdb_movie_keyword
-					values_to_insert_movie_keywords = []
-
-					for movie_data in movies_to_update:
-						keywords_data = movie_data.get('english', {}).get('keywords', [])
-
-						# Traitement pour les mots-clés
-						values_keywords = [
-							{
-								'movie_id': movie_data['english']['id'],
-								'keyword_id': keyword.get('id', None) if isinstance(keyword, dict) else keyword.get('id', None),
-							}
-							for keyword in keywords_data.get('keywords', [])
-							if isinstance(keyword, dict) and keyword.get('id') in csv_data['keyword']
-						]
-
-						# Concaténer les valeurs pour avoir une seule liste de mots-clés
-						values_to_insert_movie_keywords.extend(values_keywords)
-						
-					# Insérer les valeurs dans Supabase pour tmdb_movie_keyword en utilisant ON CONFLICT pour l'upsert
-					# cursor.executemany("""
-					# 	INSERT INTO tmdb_movie_keyword (movie_id, keyword_id)
-					# 	VALUES (%(movie_id)s, %(keyword_id)s)
-					# 	ON CONFLICT (movie_id, keyword_id) DO NOTHING
-					# """, values_to_insert_movie_keywords)
-
-					# use execute instead of executemany to insert multiple rows
-					cursor.execute(f"""
-						INSERT INTO tmdb_movie_keyword (movie_id, keyword_id)
-						VALUES {', '.join(['(%(movie_id)s, %(keyword_id)s)' for _ in values_to_insert_movie_keywords])}
-						ON CONFLICT (movie_id, keyword_id) DO NOTHING
-					""", [item for sublist in values_to_insert_movie_keywords for item in sublist])
-					
-					# ========== END TMDB_MOVIE_KEYWORD ========== #
-
-					# ========== START TMDB_MOVIE_LANGUAGE ========== #
-					# Construire les valeurs à insérer dans Supabase pour tmdb_movie_language
-					values_to_insert_movie_languages = []
-
-					for movie_data in movies_to_update:
-						languages_data = movie_data.get('english', {}).get('spoken_languages', [])
-
-						# Traitement pour les langues
-						values_languages = [
-							{
-								'movie_id': movie_data['english']['id'],
-								'language_id': language.get('iso_639_1', None) if isinstance(language, dict) else None,
-							}
-							for language in languages_data
-							if isinstance(language, dict) and language.get('iso_639_1') in csv_data['language']
-						]
-
-						# Concaténer les valeurs pour avoir une seule liste de langues
-						values_to_insert_movie_languages.extend(values_languages)
-						
-					# Insérer les valeurs dans Supabase pour tmdb_movie_language en utilisant ON CONFLICT pour l'upsert
-					# cursor.executemany("""
-					# 	INSERT INTO tmdb_movie_language (movie_id, language_id)
-					# 	VALUES (%(movie_id)s, %(language_id)s)
-					# 	ON CONFLICT (movie_id, language_id) DO NOTHING
-					# """, values_to_insert_movie_languages)
-
-					# use execute instead of executemany to insert multiple rows
-					cursor.execute(f"""
-						INSERT INTO tmdb_movie_language (movie_id, language_id)
-						VALUES {', '.join(['(%(movie_id)s, %(language_id)s)' for _ in values_to_insert_movie_languages])}
-						ON CONFLICT (movie_id, language_id) DO NOTHING
-					""", [item for sublist in values_to_insert_movie_languages for item in sublist])
-					
-					# ========== END TMDB_MOVIE_LANGUAGE ========== #
-
-					# ========== START TMDB_MOVIE_PRODUCTION ========== #
-					# Construire les valeurs à insérer dans Supabase pour tmdb_movie_production
-					values_to_insert_movie_production = []
-
-					for movie_data in movies_to_update:
-						production_companies_data = movie_data.get('english', {}).get('production_companies', [])
-
-						# Traitement pour les sociétés de production
-						values_production = [
-							{
-								'movie_id': movie_data['english']['id'],
-								'company_id': company.get('id', None) if isinstance(company, dict) else None,
-							}
-							for company in production_companies_data
-							if isinstance(company, dict) and company.get('id') in csv_data['company']
-						]
-
-						# Concaténer les valeurs pour avoir une seule liste de sociétés de production
-						values_to_insert_movie_production.extend(values_production)
-
-					# Insérer les valeurs dans Supabase pour tmdb_movie_production en utilisant ON CONFLICT pour l'upsert
-					# cursor.executemany("""
-					# 	INSERT INTO tmdb_movie_production (movie_id, company_id)
-					# 	VALUES (%(movie_id)s, %(company_id)s)
-					# 	ON CONFLICT (movie_id, company_id) DO NOTHING
-					# """, values_to_insert_movie_production)
-
-					# use execute instead of executemany to insert multiple rows
-					cursor.execute(f"""
-						INSERT INTO tmdb_movie_production (movie_id, company_id)
-						VALUES {', '.join(['(%(movie_id)s, %(company_id)s)' for _ in values_to_insert_movie_production])}
-						ON CONFLICT (movie_id, company_id) DO NOTHING
-					""", [item for sublist in values_to_insert_movie_production for item in sublist])
-
-					# ========== END TMDB_MOVIE_PRODUCTION ========== #
-
-					# ========== START TMDB_MOVIE_VIDEOS========== #
-					# Construire les valeurs à insérer dans Supabase pour tmdb_movie_videos
-					values_to_insert_movie_videos = []
-
-					for movie_data in movies_to_update:
-						videos_data_en = movie_data.get('english', {}).get('videos', {}).get('results', [])
-						videos_data_fr = movie_data.get('french', {}).get('videos', {}).get('results', [])
-
-						# Filtrer les vidéos pour ne prendre que celles de type "Teaser" ou "Trailer"
-						videos_en = [video for video in videos_data_en if video.get('iso_639_1') == 'en' and (video.get('type') == 'Teaser' or video.get('type') == 'Trailer')]
-						videos_fr = [video for video in videos_data_fr if video.get('iso_639_1') == 'fr' and (video.get('type') == 'Teaser' or video.get('type') == 'Trailer')]
-
-						# Traitement pour les vidéos en anglais
-						values_videos_en = [
-							{
-								'id': video.get('id', None) if isinstance(video, dict) else None,
-								'movie_id': movie_data['english']['id'],
-								'iso_639_1': video.get('iso_639_1', None) if isinstance(video, dict) else None,
-								'iso_3166_1': video.get('iso_3166_1', None) if isinstance(video, dict) else None,
-								'name': video.get('name', None) if isinstance(video, dict) else None,
-								'key': video.get('key', None) if isinstance(video, dict) else None,
-								'site': video.get('site', None) if isinstance(video, dict) else None,
-								'size': video.get('size', None) if isinstance(video, dict) else None,
-								'type': video.get('type', None) if isinstance(video, dict) else None,
-								'official': video.get('official', False) if isinstance(video, dict) else False,
-							}
-							for video in videos_en
-						]
-
-						# Traitement pour les vidéos en français
-						values_videos_fr = [
-							{
-								'id': video.get('id', None) if isinstance(video, dict) else None,
-								'movie_id': movie_data['french']['id'],
-								'iso_639_1': video.get('iso_639_1', None) if isinstance(video, dict) else None,
-								'iso_3166_1': video.get('iso_3166_1', None) if isinstance(video, dict) else None,
-								'name': video.get('name', None) if isinstance(video, dict) else None,
-								'key': video.get('key', None) if isinstance(video, dict) else None,
-								'site': video.get('site', None) if isinstance(video, dict) else None,
-								'size': video.get('size', None) if isinstance(video, dict) else None,
-								'type': video.get('type', None) if isinstance(video, dict) else None,
-								'official': video.get('official', False) if isinstance(video, dict) else False,
-							}
-							for video in videos_fr
-						]
-
-						# Concaténer les valeurs pour avoir une seule liste de vidéos
-						values_to_insert_movie_videos.extend(values_videos_en)
-						values_to_insert_movie_videos.extend(values_videos_fr)
-						
-					# Insérer les valeurs dans Supabase pour tmdb_movie_videos en utilisant ON CONFLICT pour l'upsert
-					# cursor.executemany("""
-					# 	INSERT INTO tmdb_movie_videos (id, movie_id, iso_639_1, iso_3166_1, name, key, site, size, type, official)
-					# 	VALUES (%(id)s, %(movie_id)s, %(iso_639_1)s, %(iso_3166_1)s, %(name)s, %(key)s, %(site)s, %(size)s, %(type)s, %(official)s)
-					# 	ON CONFLICT (id) DO NOTHING
-					# """, values_to_insert_movie_videos)	
-
-					# use execute instead of executemany to insert multiple rows
-					cursor.execute(f"""
-						INSERT INTO tmdb_movie_videos (id, movie_id, iso_639_1, iso_3166_1, name, key, site, size, type, official)
-						VALUES {', '.join(['(%(id)s, %(movie_id)s, %(iso_639_1)s, %(iso_3166_1)s, %(name)s, %(key)s, %(site)s, %(size)s, %(type)s, %(official)s)' for _ in values_to_insert_movie_videos])}
-						ON CONFLICT (id) DO NOTHING
-					""", [item for sublist in values_to_insert_movie_videos for item in sublist])	
-					
-					# ========== END TMDB_MOVIE_VIDEOS========== #
-
-					# Valider les modifications
-					connection.commit()
-
-					print(f"Successfully updated {len(movies_to_update)} movies in Supabase")
-
-				except Exception as e:
-					# En cas d'erreur, annulez la transaction
-					connection.rollback()
-					print(f"Error uploading TMDB movies in Supabase: {e}")
-
-				finally:
-					# Rétablissez le mode autocommit à True
-					connection.autocommit = True
+				# ========== START BUILD ROWS ========== #
+				# Un seul passage sur les films pour construire les valeurs de toutes les tables
+				# Link tables are dicts used as ordered sets, so duplicate pairs are sent once
+				values_to_insert_movie = []
+				values_to_insert_movie_translations = []
+				values_to_insert_movie_countries = {}
+				values_to_insert_movie_credits = []
+				values_to_insert_movie_roles = []
+				values_to_insert_movie_genres = {}
+				values_to_insert_movie_keywords = {}
+				values_to_insert_movie_languages = {}
+				values_to_insert_movie_production = {}
+				values_to_insert_movie_videos = []
+
+				# A movie listed twice in a batch would make the DO UPDATE upserts touch the same row twice
+				movies_by_id = {movie_data['english']['id']: movie_data for movie_data in movies_to_update}
+
+				for movie_data in movies_by_id.values():
+					en = movie_data['english']
+					fr = movie_data['french']
+					movie_id = en['id']
+
+					# tmdb_movie
+					collection = en.get('belongs_to_collection')
+					values_to_insert_movie.append((
+						movie_id,
+						en.get('adult', False),
+						en.get('backdrop_path', None),
+						en.get('budget', None),
+						en.get('homepage', None),
+						en.get('imdb_id', None),
+						en.get('original_language', None),
+						en.get('original_title', None),
+						en.get('popularity', None),
+						en.get('release_date') or None,
+						en.get('revenue', None),
+						en.get('runtime', None),
+						en.get('status', None),
+						en.get('vote_average', None),
+						en.get('vote_count', None),
+						collection['id'] if collection and collection['id'] in csv_data['collection'] else None,
+					))
+
+					# tmdb_movie_translation
+					for language, data in (('en', en), ('fr', fr)):
+						values_to_insert_movie_translations.append((
+							data['id'],
+							language,
+							data.get('overview', None),
+							data.get('poster_path', None),
+							data.get('tagline', None),
+							data.get('title', None),
+						))
+
+					# tmdb_movie_country
+					for country_data in en.get('production_countries', []):
+						if country_data['iso_3166_1'] in csv_data['country']:
+							values_to_insert_movie_countries[(movie_id, country_data['iso_3166_1'])] = None
+
+					# tmdb_movie_credits et tmdb_movie_role
+					credits_data = en.get('credits', {})
+					if credits_data:
+						for actor in credits_data.get('cast', []):
+							if isinstance(actor, dict):
+								values_to_insert_movie_credits.append((actor.get('credit_id', None), movie_id, actor.get('id', None), 'Acting', 'Actor'))
+								values_to_insert_movie_roles.append((actor.get('credit_id', None), actor.get('character', None), actor.get('order', None)))
+						for crew_member in credits_data.get('crew', []):
+							if isinstance(crew_member, dict):
+								values_to_insert_movie_credits.append((
+									crew_member.get('credit_id', None),
+									movie_id,
+									crew_member.get('id', None),
+									crew_member.get('department', None),
+									crew_member.get('job', None),
+								))
+
+					# tmdb_movie_genre
+					for genre in en.get('genres', []):
+						if isinstance(genre, dict) and genre.get('id') in csv_data['genre']:
+							values_to_insert_movie_genres[(movie_id, genre['id'])] = None
+
+					# tmdb_movie_keyword
+					for keyword in en.get('keywords', {}).get('keywords', []):
+						if isinstance(keyword, dict) and keyword.get('id') in csv_data['keyword']:
+							values_to_insert_movie_keywords[(movie_id, keyword['id'])] = None
+
+					# tmdb_movie_language
+					for language in en.get('spoken_languages', []):
+						if isinstance(language, dict) and language.get('iso_639_1') in csv_data['language']:
+							values_to_insert_movie_languages[(movie_id, language['iso_639_1'])] = None
+
+					# tmdb_movie_production
+					for company in en.get('production_companies', []):
+						if isinstance(company, dict) and company.get('id') in csv_data['company']:
+							values_to_insert_movie_production[(movie_id, company['id'])] = None
+
+					# tmdb_movie_videos
+					values_to_insert_movie_videos.extend(build_video_rows(en.get('videos', {}).get('results', []), movie_id, 'en'))
+					values_to_insert_movie_videos.extend(build_video_rows(fr.get('videos', {}).get('results', []), movie_id, 'fr'))
+
+				# ========== END BUILD ROWS ========== #
+
+				# ========== START TMDB_MOVIE ========== #
+				# Insérer les valeurs dans Supabase pour tmdb_movie en utilisant ON CONFLICT pour l'upsert
+				bulk_upsert(cursor, "tmdb_movie", MOVIE_COLUMNS, values_to_insert_movie, ["id"], MOVIE_COLUMNS[1:])
+
+				# Insérer les valeurs dans Supabase pour tmdb_movie_translation en utilisant ON CONFLICT pour l'upsert
+				bulk_upsert(
+					cursor, "tmdb_movie_translation",
+					["movie_id", "language_id", "overview", "poster_path", "tagline", "title"],
+					values_to_insert_movie_translations,
+					["movie_id", "language_id"],
+					["overview", "poster_path", "tagline", "title"]
+				)
+				# ========== END TMDB_MOVIE ========== #
+
+				# Valider tmdb_movie d'abord : les tables enfants y font référence
+				connection.commit()
+
+				# ========== START TMDB_MOVIE CHILD TABLES ========== #
+				# Disjoint child tables are written in parallel, each group on its own connection and transaction.
+				# Credits and roles are written by one statement (see copy_movie_credits).
+				# Insert-only child tables go through COPY into a staging table (see copy_upsert)
+				# Each write comes with its rows: empty tables are skipped, and so are groups with nothing to write
+				child_groups = [
+					[
+						(values_to_insert_movie_credits, lambda cursor: copy_movie_credits(cursor, values_to_insert_movie_credits, values_to_insert_movie_roles)),
+					],
+					[
+						(values_to_insert_movie_countries, lambda cursor: copy_upsert(cursor, "tmdb_movie_country", ["movie_id", "country_id"], list(values_to_insert_movie_countries), ["movie_id", "country_id"])),
+						(values_to_insert_movie_genres, lambda cursor: copy_upsert(cursor, "tmdb_movie_genre", ["movie_id", "genre_id"], list(values_to_insert_movie_genres), ["movie_id", "genre_id"])),
+						(values_to_insert_movie_keywords, lambda cursor: copy_upsert(cursor, "tmdb_movie_keyword", ["movie_id", "keyword_id"], list(values_to_insert_movie_keywords), ["movie_id", "keyword_id"])),
+					],
+					[
+						(values_to_insert_movie_languages, lambda cursor: copy_upsert(cursor, "tmdb_movie_language", ["movie_id", "language_id"], list(values_to_insert_movie_languages), ["movie_id", "language_id"])),
+						(values_to_insert_movie_production, lambda cursor: copy_upsert(cursor, "tmdb_movie_production", ["movie_id", "company_id"], list(values_to_insert_movie_production), ["movie_id", "company_id"])),
+					],
+					[
+						(values_to_insert_movie_videos, lambda cursor: bulk_upsert(
+							cursor, "tmdb_movie_videos",
+							["id", "movie_id", "iso_639_1", "iso_3166_1", "name", "key", "site", "size", "type", "official"],
+							values_to_insert_movie_videos,
+							["id"]
+						)),
+					],
+				]
+				child_futures = [
+					movie_child_executor.submit(write_tables, *(write for rows, write in group if rows))
+					for group in child_groups
+					if any(rows for rows, _ in group)
+				]
+				# Raise the first failure, the other groups keep their own commit
+				for future in child_futures:
+					future.result()
+				# ========== END TMDB_MOVIE CHILD TABLES ========== #
+
+				row_counts = {
+					"tmdb_movie": len(values_to_insert_movie),
+					"tmdb_movie_translation": len(values_to_insert_movie_translations),
+					"tmdb_movie_credits": len(values_to_insert_movie_credits),
+					"tmdb_movie_role": len(values_to_insert_movie_roles),
+					"tmdb_movie_country": len(values_to_insert_movie_countries),
+					"tmdb_movie_genre": len(values_to_insert_movie_genres),
+					"tmdb_movie_keyword": len(values_to_insert_movie_keywords),
+					"tmdb_movie_language": len(values_to_insert_movie_languages),
+					"tmdb_movie_production": len(values_to_insert_movie_production),
+					"tmdb_movie_videos": len(values_to_insert_movie_videos),
+				}
+				print(f"Successfully updated {len(movies_by_id)} movies in Supabase ({', '.join(f'{table}: {count}' for table, count in row_counts.items())})")
+				return True
 	except Exception as e:
 		print(f"Error updating TMDB movies in Supabase: {e}")
+	return False
 
 def sync_tmdb_movie_daily_export() -> None:
 	try:
 		console.log("[sync_tmdb_movie_daily_export] Starting syncing tmdb_movie daily export", style="info")
 
-		db_list: list = get_table("tmdb_movie", ["id"])
-		if not db_list:
-			raise Exception("Failed to download tmdb_movie")
+		db_set: set = get_table("tmdb_movie", "id")
 		
-		tmdb_list: list = get_tmdb_export_ids("movie", start_time)
-		if not tmdb_list:
+		tmdb_set: set = get_tmdb_export_ids("movie", start_time)
+		if not tmdb_set:
 			raise Exception("Failed to get TMDB movies")
-		
-		db_set: set = {item[0] for item in db_list}
-		tmdb_set: set = {item["id"] for item in tmdb_list}
 
-		# Get difference between db and tmdb
-		missing_in_db: set = tmdb_set - db_set
-		missing_in_tmdb: set = db_set - tmdb_set
+		# Get difference between db and tmdb (db_set is not needed afterwards, so it is reduced in place)
+		missing_in_db: set = tmdb_set.difference(db_set)
+		db_set.difference_update(tmdb_set)
+		missing_in_tmdb: set = db_set
 
 		# Delete missing in tmdb
 		if missing_in_tmdb:
 			console.log(f"[sync_tmdb_movie_daily_export] Found {len(missing_in_tmdb)} extra movies in db", style="warning")
-			make_query("DELETE FROM tmdb_movie WHERE id IN %s", (tuple(missing_in_tmdb),))
-			db_set -= missing_in_tmdb
+			delete_rows("tmdb_movie", "id", missing_in_tmdb, "int", DELETE_CASCADE_CHUNK_SIZE)
 
 		if missing_in_db:
 			console.log(f"[sync_tmdb_movie_daily_export] Found {len(missing_in_db)} missing movies in db", style="warning")
 			
-			# Insert in chunks of 500
-			chunks = list(chunked(missing_in_db, batch_size))
+			# Insert in chunks of batch_size, produced lazily
+			total_chunks: int = math.ceil(len(missing_in_db) / batch_size)
+			chunks = chunked(missing_in_db, batch_size)
 
 			# Add main progress bar for chunks and sub progress bar for movies
-			with Progress() as progress:
-				main_task: TaskID = progress.add_task("[cyan]Processing chunks", total=len(chunks))
+			# One pool for every chunk, only the DB writer stays serial
+			with Progress() as progress, background_writer(update_db_movie) as write_batch, ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+				main_task: TaskID = progress.add_task("[cyan]Processing chunks", total=total_chunks)
+				# Re-use sub progress bar for each chunk
+				movies_task: TaskID = progress.add_task(f"Processing movies", total=batch_size)
 				for chunk in chunks:
-					with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-						items_to_insert: list = []
-						futures: list = []
-
-						# Re-use sub progress bar for each chunk
-						movies_task: TaskID = progress.add_task(f"Processing movies", total=len(chunk))
-						for movie in chunk:
-							futures.append(executor.submit(get_tmdb_movie, movie))
-
-						for future in futures:
-							movie = future.result()
-							if movie:
-								items_to_insert.append(movie)
-							progress.update(movies_task, advance=1)
-						
-						update_db_movie(items_to_insert)
-						progress.update(main_task, advance=1)
-						progress.remove_task(movies_task)
+					items_to_insert: list = []
+					progress.reset(movies_task, total=len(chunk))
+
+					for movie in executor.map(get_tmdb_movie, chunk):
+						if movie:
+							items_to_insert.append(movie)
+						progress.update(movies_task, advance=1)
+
+					write_batch(items_to_insert)
+					progress.update(main_task, advance=1)
 
+				progress.remove_task(movies_task)
 				progress.remove_task(main_task)
-		# Create CSV file for tmdb_movie
-		# utils.create_csv_file(os.getenv("TMP_DIR") + "/tmdb_movie.csv", db_set)		
 	except Exception as e:
 		raise Exception(f"(sync_tmdb_movie_daily_export) {e}")
 	
@@ -1526,50 +1339,58 @@ def sync_tmdb_movie_changes_export() -> None:
 		if not last_sync_date:
 			raise Exception("Failed to get last sync date")
 		
-		current_page = 1
+		end_date: str = start_date
 		movies_to_update = []
 
-		first_page = get_tmdb_data("movie/changes", {"start_date": last_sync_date, "end_date": start_time.strftime("%Y-%m-%d"), "page": current_page})
-		if not first_page:
-			raise Exception("Failed to get TMDB movie changes")
-		total_to_update = first_page["total_results"]
-		console.log(f"[sync_tmdb_movie_changes_export] Found {total_to_update} movies to update between {last_sync_date} and {start_time.strftime('%Y-%m-%d')}", style="info")
+		# Resume after the last page written by a previous run over the same window
+		current_page = get_sync_cursor("movie", last_sync_date, end_date) + 1
+		if current_page > 1:
+			console.log(f"[sync_tmdb_movie_changes_export] Resuming at page {current_page}", style="info")
 
-		with Progress() as progress:
+		changes_page = get_tmdb_data("movie/changes", {"start_date": last_sync_date, "end_date": end_date, "page": current_page})
+		if not changes_page:
+			raise Exception("Failed to get TMDB movie changes")
+		total_to_update = changes_page["total_results"]
+		console.log(f"[sync_tmdb_movie_changes_export] Found {total_to_update} movies to update between {last_sync_date} and {end_date}", style="info")
+
+		# Save the cursor only after a successful write, and stop moving it once one batch failed
+		cursor_state = {"failed": False}
+		def write_movies(batch: tuple) -> None:
+			movies, page = batch
+			if update_db_movie(movies) and not cursor_state["failed"]:
+				set_sync_cursor("movie", last_sync_date, end_date, page)
+			else:
+				cursor_state["failed"] = True
+
+		with Progress() as progress, background_writer(write_movies) as write_batch, ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
 			main_task: TaskID = progress.add_task("[cyan]Processing movies", total=total_to_update)
-			while True:
-				changed_movies_response = get_tmdb_data("movie/changes", {"start_date": last_sync_date, "end_date": start_time.strftime("%Y-%m-%d"), "page": current_page})
-				if not changed_movies_response:
-					raise Exception("Failed to get TMDB movie changes")
-				
-				changed_movies = changed_movies_response["results"]
-				if not changed_movies or len(changed_movies) == 0:
-					break
+			while changes_page and changes_page["results"]:
+				for movie in executor.map(get_tmdb_movie, [changed_movie['id'] for changed_movie in changes_page["results"]]):
+					if movie:
+						movies_to_update.append(movie)
+					progress.update(main_task, advance=1)
 
-				with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-					futures = []
-					for movie in changed_movies:
-						futures.append(executor.submit(get_tmdb_movie, movie['id']))
+				# Update db every batch_size movies, on a page boundary so the cursor stays exact
+				if len(movies_to_update) >= batch_size:
+					write_batch((movies_to_update, current_page))
+					movies_to_update = []
 
-					for future in futures:
-						movie = future.result()
-						if movie:
-							movies_to_update.append(movie)
-						progress.update(main_task, advance=1)
-				
+				# Stop on the last page instead of asking for an empty one
+				if current_page >= changes_page["total_pages"]:
+					break
 				current_page += 1
+				changes_page = get_tmdb_data("movie/changes", {"start_date": last_sync_date, "end_date": end_date, "page": current_page})
 
-				# Update db every 5 pages
-				if current_page % 5 == 0:
-					if len(movies_to_update):
-						update_db_movie(movies_to_update)
-					movies_to_update = []
-			
 			# Update db for remaining movies
 			if len(movies_to_update):
-				update_db_movie(movies_to_update)
+				write_batch((movies_to_update, current_page))
 
 			progress.remove_task(main_task)
+
+		# Fail the sync when a batch was not written: the sync log stays unsuccessful and the next run retries from the saved cursor
+		if cursor_state["failed"]:
+			raise Exception(f"Failed to write some movies, last written page kept for the next run")
+
 	except Exception as e:
 		raise Exception(f"(sync_tmdb_movie_changes_export) {e}")
 
@@ -1599,6 +1420,7 @@ if __name__ == "__main__":
 	# start_time = datetime.now()
 	# set manual start time to 20 september 2024
 	start_time = datetime(2024, 9, 20, 0, 0, 0)
+	start_date = start_time.strftime("%Y-%m-%d")
 	console.log("Starting sync TMDB with script v" + os.getenv("VERSION") + " at " + start_time.strftime("%Y-%m-%d %H:%M:%S"), style="info")
 	try:
 		# Check if TMDB API keys are set
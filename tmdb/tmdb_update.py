@@ -5,17 +5,28 @@
 
 from datetime import datetime, timedelta
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import gzip
-import shutil
-import json
+import orjson
+import io
 import os
 from dotenv import load_dotenv
 from more_itertools import chunked
 import psycopg2
+import psycopg2.pool
+from psycopg2.extras import execute_values
 import csv
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED, ALL_COMPLETED
 from tqdm import tqdm
+import itertools
+import hashlib
+import threading
+import queue
+import collections
+from contextlib import contextmanager
+import atexit
 
 load_dotenv()
 
@@ -28,51 +39,130 @@ load_dotenv()
 supabase_connection_string = os.getenv("POSTGRES_CONNECTION_STRING")
 supabase_tmdb_changes_logs_table = "tmdb_update_logs"
 tmdb_api_keys = os.getenv("TMDB_API_KEYS").split(",")
-api_key_index = 0
+# Rotation des clés API partagée entre les threads
+api_key_cycle = itertools.cycle(tmdb_api_keys)
+api_key_lock = threading.Lock()
 MAX_WORKERS = 10
+# Requêtes de détails TMDB en vol : 5 par clé API, plafonnées à 50
+FETCH_WORKERS = min(len(tmdb_api_keys) * 5, 50)
+# Nombre de chunks écrits par transaction dans les boucles collection / company
+CHUNKS_PER_COMMIT = 10
+# Nombre de persons accumulées avant chaque écriture Supabase dans le flux Changes List
+PERSONS_PER_FLUSH = 1000
+# Requêtes de détails en vol au plus dans les flux Changes List : borne la mémoire des résultats non consommés
+DETAILS_IN_FLIGHT = FETCH_WORKERS * 4
+# Nombre de films écrits dans une seule transaction par les flux Daily Export et Changes List
+MOVIES_PER_BATCH = 2000
+# Pages de la Changes List des films récupérées d'avance pendant que les détails de la page courante sont traités
+CHANGES_PAGES_PREFETCH = 4
+
+# Débit TMDB visé : au plus TMDB_MAX_REQUESTS requêtes par fenêtre glissante de TMDB_RATE_WINDOW secondes
+TMDB_MAX_REQUESTS = 40
+TMDB_RATE_WINDOW = 1.0
+# Délai maximal (secondes) d'une requête TMDB, pour qu'un worker ne reste jamais bloqué
+REQUEST_TIMEOUT = 10
+
+# Session HTTP keep-alive partagée par tous les appels TMDB
+session = requests.Session()
+session_adapter = HTTPAdapter(
+	pool_connections=MAX_WORKERS,
+	pool_maxsize=FETCH_WORKERS * 2,
+	max_retries=Retry(total=5, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+)
+session.mount("https://", session_adapter)
+session.mount("http://", session_adapter)
+
+# Connexions Postgres partagées par tous les helpers et les fonctions d'update
+db_pool = psycopg2.pool.ThreadedConnectionPool(minconn=1, maxconn=MAX_WORKERS + 2, dsn=supabase_connection_string)
+atexit.register(db_pool.closeall)
 
 # ---------------------------------------------------------------------------- #
 
 # ========== START TOOLS ========== #
-def download_file(url: str) -> str:
-	print(f"Downloading {url}")
-	response = requests.get(url)
-
-	if response.status_code != 200:
-		print(f"Failed to download {url}. Status code: {response.status_code}")
-		return None
-	
-	file_name = url.split("/")[-1]
-
-	with open(file_name, 'wb') as file:
-		file.write(response.content)
-
-	print(f"Downloaded {file_name}")
-	return file_name
-
-def decompress_gzip(file_path: str) -> str:
-	print(f"Decompressing {file_path}")
-	with gzip.open(file_path, 'rb') as f_in:
-		with open(file_path[:-3], 'wb') as f_out:
-			shutil.copyfileobj(f_in, f_out)
-
-	print(f"Decompressed {file_path[:-3]}")
-	return file_path[:-3]
+# Emprunter une connexion du pool, dans une transaction comme `with psycopg2.connect(...)`
+@contextmanager
+def get_connection():
+	connection = db_pool.getconn()
+	try:
+		with connection:
+			yield connection
+	finally:
+		db_pool.putconn(connection)
+
+# Lecture anticipée d'un flux dans un thread : le réseau et la décompression avancent en parallèle
+class PrefetchReader(io.RawIOBase):
+	def __init__(self, raw, chunk_size: int = 1 << 20, depth: int = 4):
+		self.chunks = queue.Queue(maxsize=depth)
+		# Tampons réutilisés entre le thread et le lecteur : pas de nouvel objet bytes par chunk
+		self.free = queue.Queue()
+		for _ in range(depth + 2):
+			self.free.put(bytearray(chunk_size))
+		self.buffer = None
+		self.current = memoryview(b'')
+		self.error = None
+		threading.Thread(target=self._fill, args=(raw,), daemon=True).start()
+
+	def _fill(self, raw):
+		try:
+			while True:
+				buffer = self.free.get()
+				size = raw.readinto(buffer)
+				if not size:
+					break
+				self.chunks.put((buffer, size))
+		except Exception as e:
+			self.error = e
+		finally:
+			self.chunks.put((None, 0))
+
+	def readable(self) -> bool:
+		return True
+
+	def readinto(self, buffer) -> int:
+		if not self.current:
+			# Rendre le tampon consommé au thread de lecture
+			if self.buffer is not None:
+				self.free.put(self.buffer)
+				self.buffer = None
+			chunk, size = self.chunks.get()
+			if chunk is None:
+				# Garder la fin de flux pour les appels suivants
+				self.chunks.put((None, 0))
+				if self.error:
+					raise self.error
+				return 0
+			self.buffer = chunk
+			self.current = memoryview(chunk)[:size]
+		size = min(len(buffer), len(self.current))
+		buffer[:size] = self.current[:size]
+		self.current = self.current[size:]
+		return size
+
+# Écrire le log dans la transaction de la mise à jour (validé avec les données), ou dans une nouvelle connexion sans `connection`
+def supabase_tmdb_update_log(connection, cursor, date: datetime, success: bool, type: str):
+	log_values = {
+		'date': date.date(),
+		'success': success,
+		'type': type,
+	}
+	log_command = """
+		INSERT INTO tmdb_update_logs (date, success, type)
+		VALUES (%(date)s, %(success)s, %(type)s)
+	"""
+
+	if connection is not None:
+		if cursor is not None:
+			cursor.execute(log_command, log_values)
+		else:
+			with connection.cursor() as log_cursor:
+				log_cursor.execute(log_command, log_values)
+		return
 
-def supabase_tmdb_update_log(date: datetime, success: bool, type: str):
 	try:
-		with psycopg2.connect(supabase_connection_string) as connection:
+		with get_connection() as connection:
 			with connection.cursor() as cursor:
 				try:
-					log_values = {
-						'date': date.date(),
-						'success': success,
-						'type': type,
-					}
-					cursor.execute("""
-						INSERT INTO tmdb_update_logs (date, success, type)
-						VALUES (%(date)s, %(success)s, %(type)s)
-					""", log_values)
+					cursor.execute(log_command, log_values)
 
 					connection.commit()
 
@@ -82,8 +172,9 @@ def supabase_tmdb_update_log(date: datetime, success: bool, type: str):
 	except Exception as e:
 		print(f"Error adding log to tmdb_update_logs: {e}")
 
-def execute_sql_command(sql_command, values=None, fetch_results=False):
-	connection = psycopg2.connect(supabase_connection_string)
+# Sans `conn`, emprunter une connexion du pool et valider tout de suite ; avec `conn`, la validation revient à l'appelant
+def execute_sql_command(sql_command, values=None, fetch_results=False, conn=None):
+	connection = conn if conn is not None else db_pool.getconn()
 	cursor = connection.cursor()
 	try:
 		if values:
@@ -92,55 +183,235 @@ def execute_sql_command(sql_command, values=None, fetch_results=False):
 			cursor.execute(sql_command)
 		
 		# Valider les modifications pour les commandes d'insertion, de suppression, etc.
-		connection.commit()
+		if conn is None:
+			connection.commit()
 
 		if fetch_results:
 			result = cursor.fetchall()
 			return result
 	finally:
 		cursor.close()
-		connection.close()
+		if conn is None:
+			db_pool.putconn(connection)
 
 def create_csv_file(file_name, data, append=False):
-	mode = 'a' if append else 'w'
+	mode = 'ab' if append else 'wb'
 
-	with open(file_name, mode, newline='', encoding='utf-8') as file:
-		writer = csv.writer(file)
+	# Si on crée un nouveau fichier, écrire l'en-tête
+	header = b'' if append else b'id\n'
 
-		# Si on crée un nouveau fichier, écrire l'en-tête
-		if not append:
-			# Utiliser la liste d'ISO 639-1 comme en-tête
-			header = ['id']
-			writer.writerow(header)
+	# Une seule ligne "id" par valeur : construire tout le contenu et l'écrire en une fois
+	payload = header + b''.join(f"{value}\n".encode('utf-8') for value in data)
 
-		# Écrire toutes les valeurs de data
-		for value in data:
-			writer.writerow([value])
+	with open(file_name, mode) as file:
+		file.write(payload)
 
-def load_csv_file(file_name):
-	data_set = set()
+# Les ids numériques sont relus en int pour que les tests `in` correspondent aux ids des réponses TMDB
+def load_csv_file(file_name) -> frozenset:
 	try:
 		with open(file_name, 'r', newline='', encoding='utf-8') as file:
 			reader = csv.reader(file)
-			next(reader)  # Skip header
-			for row in reader:
-				if row:  # Ensure row is not empty
-					data_set.add(row[0])
+			next(reader, None)  # Skip header
+			return frozenset(
+				int(row[0]) if row[0].isdigit() else row[0]
+				for row in reader
+				if row  # Ensure row is not empty
+			)
 	except FileNotFoundError:
-		pass  # Handle the case where the file doesn't exist
-	return data_set
+		return frozenset()  # Handle the case where the file doesn't exist
+
+# Garder la première ligne pour chaque clé (la ligne entière par défaut), dans l'ordre, comme ON CONFLICT DO NOTHING
+def unique_rows(rows: list, key=None) -> list:
+	if key is None:
+		return list(dict.fromkeys(rows))
+
+	unique = {}
+	for row in rows:
+		unique.setdefault(key(row), row)
+	return list(unique.values())
+
+def copy_value(value) -> str:
+	if value is None:
+		return ''
+	if isinstance(value, bool):
+		return 't' if value else 'f'
+	if isinstance(value, (int, float)):
+		return str(value)
+	return '"' + str(value).replace('"', '""') + '"'
+
+# Upsert des lignes (tuples dans l'ordre de `columns`) via COPY dans une table temporaire puis un seul INSERT ... SELECT
+def copy_upsert(cursor, table_name: str, columns: list, rows: list, conflict_columns: list, update_columns: list = None):
+	if not rows:
+		return
+	stage_name = f"stage_{table_name}"
+	buffer = io.StringIO()
+	for row in rows:
+		buffer.write(','.join(copy_value(value) for value in row))
+		buffer.write('\n')
+	buffer.seek(0)
+
+	cursor.execute(f"CREATE TEMP TABLE {stage_name} (LIKE {table_name} INCLUDING DEFAULTS) ON COMMIT DROP")
+	cursor.copy_expert(f"COPY {stage_name} ({', '.join(columns)}) FROM STDIN WITH CSV", buffer)
+
+	if update_columns:
+		conflict_action = "DO UPDATE SET " + ', '.join(f"{column} = EXCLUDED.{column}" for column in update_columns)
+	else:
+		conflict_action = "DO NOTHING"
+	cursor.execute(f"""
+		INSERT INTO {table_name} ({', '.join(columns)})
+		SELECT {', '.join(columns)} FROM {stage_name}
+		ON CONFLICT ({', '.join(conflict_columns)}) {conflict_action}
+	""")
+	cursor.execute(f"DROP TABLE {stage_name}")
+
+# Comparer les ids TMDB à ceux d'une table côté serveur : seuls les deux écarts reviennent (manquants, en trop)
+def get_id_differences(connection, table_name: str, ids: set) -> tuple:
+	buffer = io.StringIO(''.join(f"{id}\n" for id in ids))
+	with connection.cursor() as cursor:
+		cursor.execute("CREATE TEMP TABLE tmdb_ids (id int PRIMARY KEY) ON COMMIT DROP")
+		cursor.copy_expert("COPY tmdb_ids (id) FROM STDIN", buffer)
+		cursor.execute(f"SELECT id FROM tmdb_ids EXCEPT SELECT id FROM {table_name}")
+		missing_in_supabase = {row[0] for row in cursor.fetchall()}
+		cursor.execute(f"SELECT id FROM {table_name} EXCEPT SELECT id FROM tmdb_ids")
+		missing_in_tmdb = {row[0] for row in cursor.fetchall()}
+		cursor.execute("DROP TABLE tmdb_ids")
+	return missing_in_supabase, missing_in_tmdb
+
+# Empreinte d'une réponse TMDB, indépendante de l'ordre des clés
+def get_payload_signature(payload) -> str:
+	return hashlib.blake2b(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS), digest_size=16).hexdigest()
+
+# Dernière empreinte enregistrée pour un type de mise à jour (None si aucune)
+def get_update_signature(connection, type: str) -> str:
+	with connection.cursor() as cursor:
+		cursor.execute("SELECT signature FROM tmdb_update_signatures WHERE type = %s", (type,))
+		row = cursor.fetchone()
+	return row[0] if row else None
+
+# Enregistrer l'empreinte dans la transaction de la mise à jour
+def set_update_signature(cursor, type: str, signature: str, date: datetime):
+	cursor.execute("""
+		INSERT INTO tmdb_update_signatures (type, signature, date)
+		VALUES (%s, %s, %s)
+		ON CONFLICT (type) DO UPDATE
+		SET signature = EXCLUDED.signature, date = EXCLUDED.date
+	""", (type, signature, date.date()))
+
+# ETag de la dernière réponse détails écrite pour chaque film, pour rejouer les requêtes en conditionnel
+def get_movie_etags(connection, movie_ids: list) -> dict:
+	with connection.cursor() as cursor:
+		cursor.execute("SELECT movie_id, etag FROM tmdb_movie_etags WHERE movie_id = ANY(%s)", (list(movie_ids),))
+		return dict(cursor.fetchall())
 
 # ========== END TOOLS ========== #
 
 # ========== START TMDB ========== #
+# Limiteur de débit partagé par les threads : fenêtre glissante, pause sur les en-têtes de quota et AIMD sur les 429
+class RateLimiter:
+	def __init__(self, max_requests: int, window: float):
+		self.max_requests = max_requests
+		self.limit = float(max_requests)
+		self.window = window
+		self.requests = collections.deque()
+		self.paused_until = 0.0
+		self.lock = threading.Lock()
+
+	# Bloquer jusqu'à ce qu'une requête soit autorisée dans la fenêtre ; l'attente se fait hors du verrou
+	def wait(self):
+		while True:
+			with self.lock:
+				now = time.monotonic()
+				while self.requests and now - self.requests[0] >= self.window:
+					self.requests.popleft()
+				if now < self.paused_until:
+					delay = self.paused_until - now
+				elif len(self.requests) >= int(self.limit):
+					delay = self.requests[0] + self.window - now
+				else:
+					self.requests.append(now)
+					return
+			time.sleep(delay)
+
+	# Ajuster le débit après une réponse : moitié moins sur un 429 (même absorbé par les retries), +1 par fenêtre réussie
+	def update(self, response: requests.Response):
+		history = getattr(getattr(response.raw, 'retries', None), 'history', None) or ()
+		throttled = response.status_code == 429 or any(entry.status == 429 for entry in history)
+		retry_after = response.headers.get('Retry-After')
+
+		# Faire une pause jusqu'au reset quand il reste moins de 10 % du quota annoncé
+		remaining = response.headers.get('x-ratelimit-remaining')
+		limit = response.headers.get('x-ratelimit-limit')
+		reset = response.headers.get('x-ratelimit-reset')
+
+		with self.lock:
+			if throttled:
+				self.limit = max(1.0, self.limit / 2)
+				if retry_after and retry_after.isdigit():
+					self.paused_until = max(self.paused_until, time.monotonic() + int(retry_after))
+			else:
+				self.limit = min(float(self.max_requests), self.limit + 1 / self.limit)
+
+			if remaining and limit and reset and int(remaining) < int(limit) * 0.1:
+				self.paused_until = max(self.paused_until, time.monotonic() + max(0.0, float(reset) - time.time()))
+
+tmdb_rate_limiter = RateLimiter(TMDB_MAX_REQUESTS, TMDB_RATE_WINDOW)
+
+def next_api_key() -> str:
+	with api_key_lock:
+		return next(api_key_cycle)
+
+# GET sur l'API TMDB, derrière le limiteur de débit
+def tmdb_get(url: str, params: dict = None, headers: dict = None) -> requests.Response:
+	tmdb_rate_limiter.wait()
+	response = session.get(url, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
+	tmdb_rate_limiter.update(response)
+	return response
+
+# Récupérer les détails au fil de l'eau (un tuple d'arguments de get_details par élément de args_iter) avec au plus
+# DETAILS_IN_FLIGHT requêtes en vol, et écrire par lots de batch_size dans un thread dédié pendant que la récupération continue.
+# Chaque future est oubliée dès son résultat lu, et une seule écriture attend à la fois
+def fetch_and_flush(args_iter, get_details, flush, batch_size: int):
+	in_flight = set()
+	details_batch = []
+	pending_flush = None
+
+	with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor, ThreadPoolExecutor(max_workers=1) as flush_executor:
+		def collect(return_when):
+			nonlocal details_batch, pending_flush
+			done, _ = wait(in_flight, return_when=return_when)
+			in_flight.difference_update(done)
+			for future in done:
+				details = future.result()
+				if details is not None:
+					details_batch.append(details)
+
+				if len(details_batch) >= batch_size:
+					# Attendre l'écriture précédente : les lots ne s'accumulent pas si Supabase est plus lent que TMDB
+					if pending_flush is not None:
+						pending_flush.result()
+					pending_flush = flush_executor.submit(flush, details_batch)
+					details_batch = []
+
+		for args in args_iter:
+			if len(in_flight) >= DETAILS_IN_FLIGHT:
+				collect(FIRST_COMPLETED)
+			in_flight.add(executor.submit(get_details, *args))
+
+		if in_flight:
+			collect(ALL_COMPLETED)
+
+		if pending_flush is not None:
+			pending_flush.result()
+
+	if len(details_batch):
+		flush(details_batch)
+
 def get_tmdb_data(url: str, params) -> dict:
-	global api_key_index
-	params["api_key"] = tmdb_api_keys[api_key_index]
-	response = requests.get(url, params=params)
+	params["api_key"] = next_api_key()
+	response = tmdb_get(url, params=params)
 	response.raise_for_status()
-	api_key_index = (api_key_index + 1) % len(tmdb_api_keys)
 
-	data = response.json()
+	data = orjson.loads(response.content)
 
 	if ('success' in data and not data['success']):
 		print(f"L'appel à l'API TMDB a échoué. Code d'erreur: {data['status_code']}")
@@ -148,21 +419,23 @@ def get_tmdb_data(url: str, params) -> dict:
 	
 	return data
 
-def get_tmdb_export_ids(type: str, date: datetime):
-	tmdb_export_collection_url_template = "http://files.tmdb.org/p/exports/{type}_ids_{date}.json.gz"
-	
-	tmdb_export_collection_ids_url = tmdb_export_collection_url_template.format(type=type,date=date.strftime("%m_%d_%Y"))
+# Lire l'export ligne par ligne depuis le flux HTTP décompressé, sans fichier intermédiaire
+def iter_tmdb_export(type: str, date: datetime):
+	tmdb_export_url_template = "http://files.tmdb.org/p/exports/{type}_ids_{date}.json.gz"
 
-	downloaded_file = download_file(tmdb_export_collection_ids_url)
-	if not downloaded_file:
-		return None
-	
-	decompressed_file = decompress_gzip(downloaded_file)
-	
-	if os.path.exists(downloaded_file):
-		os.remove(downloaded_file)
+	tmdb_export_url = tmdb_export_url_template.format(type=type, date=date.strftime("%m_%d_%Y"))
+
+	print(f"Streaming {tmdb_export_url}")
+	with session.get(tmdb_export_url, stream=True, timeout=REQUEST_TIMEOUT) as response:
+		if response.status_code != 200:
+			raise Exception(f"Failed to download {tmdb_export_url}. Status code: {response.status_code}")
 
-	return decompressed_file
+		with gzip.GzipFile(fileobj=io.BufferedReader(PrefetchReader(response.raw))) as file:
+			for line in file:
+				yield orjson.loads(line)
+
+def get_tmdb_export_ids(type: str, date: datetime) -> set:
+	return {item['id'] for item in iter_tmdb_export(type, date)}
 # ========== END TMDB ========== #
 
 # ========== START TMDB CONFIGURATION ========== #
@@ -170,90 +443,86 @@ def get_tmdb_export_ids(type: str, date: datetime):
 def tmdb_update_language(current_date: datetime, file_name: str = "tmdb_language.csv"):
 	try:
 		print("Starting TMDB update languages")
-		supabase_languages = execute_sql_command("SELECT iso_639_1 FROM tmdb_language", fetch_results=True)
-
-		if not supabase_languages:
-			raise Exception("Error: Unable to retrieve Supabase languages. Skipping update.")
-
 		tmdb_languages = get_tmdb_data(f"https://api.themoviedb.org/3/configuration/languages", {})
 
 		if not tmdb_languages or 'success' in tmdb_languages and not tmdb_languages['success']:
 			raise Exception("Error: Unable to retrieve TMDB languages. Skipping update.")
 
-		# Créer un ensemble des iso_639_1 pour chaque source
-		supabase_set = {language[0] for language in supabase_languages}
-		tmdb_set = {language['iso_639_1'] for language in tmdb_languages}
-
-		# Creer un fichier CSV avec les langues de Supabase
-		create_csv_file(file_name, supabase_set)
-
-		# Identifier les différences entre les deux ensembles
-		missing_in_tmdb = supabase_set - tmdb_set
-		missing_in_supabase = tmdb_set - supabase_set
-
-		# Si des langues sont en trop dans Supabase, les supprimer
-		if missing_in_tmdb:
-			print(f"Found {len(missing_in_tmdb)} extra languages in Supabase")
-			delete_command = "DELETE FROM tmdb_language WHERE iso_639_1 IN %s"
-			execute_sql_command(delete_command, (tuple(missing_in_tmdb),))
-			# Mettre à jour le fichier CSV
-			create_csv_file(file_name, supabase_set - missing_in_tmdb)
-			supabase_set -= missing_in_tmdb
-		
-		# Mettre à jour les langues dans Supabase
-		with psycopg2.connect(supabase_connection_string) as connection:
+		# Une seule connexion pour toute la mise à jour
+		with get_connection() as connection:
+			# Un seul tableau au lieu d'une ligne par id
+			supabase_languages = execute_sql_command("SELECT COALESCE(array_agg(iso_639_1), ARRAY[]::text[]) FROM tmdb_language", fetch_results=True, conn=connection)[0][0]
+
+			if not supabase_languages:
+				raise Exception("Error: Unable to retrieve Supabase languages. Skipping update.")
+
+			# Créer un ensemble des iso_639_1 pour chaque source
+			supabase_set = set(supabase_languages)
+
+			# Un seul passage sur la réponse TMDB pour les ids et les valeurs à insérer dans tmdb_language et tmdb_language_translation
+			tmdb_set = set()
+			values_to_insert_language = []
+			for language in tmdb_languages:
+				tmdb_set.add(language['iso_639_1'])
+				values_to_insert_language.append((language['iso_639_1'], language['name'], language['english_name']))
+
+			# Identifier les différences entre les deux ensembles
+			missing_in_tmdb = supabase_set - tmdb_set
+			missing_in_supabase = tmdb_set - supabase_set
+
+			# Rien à faire si les langues sont les mêmes en base et si la réponse TMDB n'a pas changé depuis la dernière mise à jour
+			signature = get_payload_signature(tmdb_languages)
+			if not missing_in_tmdb and not missing_in_supabase and signature == get_update_signature(connection, 'language'):
+				print("TMDB languages unchanged, skipping update")
+				create_csv_file(file_name, supabase_set)
+				supabase_tmdb_update_log(connection, None, current_date, True, 'language')
+				return
+
+			# Mettre à jour les langues dans Supabase
 			with connection.cursor() as cursor:
 				try:
-					# Démarrez la transaction
-					connection.autocommit = False
-
-					# Construire les valeurs à insérer dans Supabase pour tmdb_language
-					values_to_insert_language = [
-						(language['iso_639_1'], language['name'])
-						for language in tmdb_languages
-						if language['iso_639_1'] in tmdb_set
-					]
-					# Construire les valeurs à insérer dans Supabase pour tmdb_language_translation
-					values_to_insert_translation = [
-						(language['iso_639_1'], 'en', language['english_name'])
-						for language in tmdb_languages
-						if language['iso_639_1'] in tmdb_set
-					]
-
-					# Insérer les valeurs dans Supabase pour tmdb_language en utilisant ON CONFLICT pour l'upsert
-					cursor.executemany("""
-						INSERT INTO tmdb_language (iso_639_1, name_in_native_language)
-						VALUES (%s, %s)
-						ON CONFLICT (iso_639_1) DO UPDATE
-						SET name_in_native_language = EXCLUDED.name_in_native_language
-					""", values_to_insert_language)
-
-					# Insérer les valeurs dans Supabase pour tmdb_language_translation en utilisant ON CONFLICT pour l'upsert
-					cursor.executemany("""
+					# Supprimer les langues en trop dans Supabase, dans la même transaction que l'upsert
+					if missing_in_tmdb:
+						print(f"Found {len(missing_in_tmdb)} extra languages in Supabase")
+						cursor.execute("DELETE FROM tmdb_language WHERE iso_639_1 IN %s", (tuple(missing_in_tmdb),))
+
+					# Insérer tmdb_language et tmdb_language_translation en une seule requête, avec ON CONFLICT pour l'upsert
+					execute_values(cursor, """
+						WITH data (iso_639_1, name_in_native_language, english_name) AS (VALUES %s),
+						upserted_language AS (
+							INSERT INTO tmdb_language (iso_639_1, name_in_native_language)
+							SELECT iso_639_1, name_in_native_language FROM data
+							ON CONFLICT (iso_639_1) DO UPDATE
+							SET name_in_native_language = EXCLUDED.name_in_native_language
+						)
 						INSERT INTO tmdb_language_translation (iso_639_1, language, name)
-						VALUES (%s, %s, %s)
+						SELECT iso_639_1, 'en', english_name FROM data
 						ON CONFLICT (iso_639_1, language) DO UPDATE
 						SET name = EXCLUDED.name
-					""", values_to_insert_translation)
+					""", values_to_insert_language, page_size=1000)
+
+					set_update_signature(cursor, 'language', signature, current_date)
+
+					# Ajouter le log dans la même transaction que les données
+					supabase_tmdb_update_log(connection, cursor, current_date, True, 'language')
 
 					# Valider les modifications
 					connection.commit()
 
-					# Mettre à jour le fichier CSV
-					create_csv_file(file_name, supabase_set | missing_in_supabase)
-					supabase_set = supabase_set | missing_in_supabase
+					# Mettre à jour l'ensemble des ids en base
+					supabase_set.difference_update(missing_in_tmdb)
+					supabase_set.update(missing_in_supabase)
 
 				except Exception as e:
 					# En cas d'erreur, annulez la transaction
 					connection.rollback()
 					print(f"Error updating TMDB language: {e}")
 
-				finally:
-					# Rétablissez le mode autocommit à True
-					connection.autocommit = True
+					# Le log ne peut plus être écrit dans la transaction annulée
+					supabase_tmdb_update_log(None, None, current_date, False, 'language')
 
-		# Ajouter un log dans la table supabase tmdb_update_logs
-		supabase_tmdb_update_log(current_date, True, 'language')
+		# Écrire le fichier CSV une seule fois, avec l'état final
+		create_csv_file(file_name, supabase_set)
 
 		print("TMDB update languages COMPLETED")
 	
@@ -261,94 +530,95 @@ def tmdb_update_language(current_date: datetime, file_name: str = "tmdb_language
 		print(f"Error updating TMDB language: {e}")
 
 		# Ajouter un log dans la table supabase tmdb_update_logs
-		supabase_tmdb_update_log(current_date, False, 'language')
+		supabase_tmdb_update_log(None, None, current_date, False, 'language')
 
 def tmdb_update_country(current_date: datetime, file_name: str = "tmdb_country.csv"):
 	try:
 		print("Starting TMDB update countries")
-		supabase_countries = execute_sql_command("SELECT iso_3166_1 FROM tmdb_country", fetch_results=True)
-
-		if not supabase_countries:
-			raise Exception("Error: Unable to retrieve Supabase countries. Skipping update.")
-
 		tmdb_countries = get_tmdb_data(f"https://api.themoviedb.org/3/configuration/countries", {'language': 'fr-FR'})
 
 		if not tmdb_countries or 'success' in tmdb_countries and not tmdb_countries['success']:
 			raise Exception("Error: Unable to retrieve TMDB countries. Skipping update.")
 
-		# Créer un ensemble des codes pour chaque source
-		supabase_set = {country[0] for country in supabase_countries}
-		tmdb_set = {country['iso_3166_1'] for country in tmdb_countries}
-
-		# Identifier les différences entre les deux ensembles
-		missing_in_supabase = tmdb_set - supabase_set
-		missing_in_tmdb = supabase_set - tmdb_set
-
-		# Créez un fichier CSV avec les pays de Supabase
-		create_csv_file(file_name, supabase_set)
-
-		# Si des pays sont en trop dans Supabase, les supprimer
-		if missing_in_tmdb:
-			print(f"Found {len(missing_in_tmdb)} extra countries in Supabase")
-			delete_command = "DELETE FROM tmdb_country WHERE iso_3166_1 IN %s"
-			execute_sql_command(delete_command, (tuple(missing_in_tmdb),))
-			# Mettre à jour le fichier CSV
-			create_csv_file(file_name, supabase_set - missing_in_tmdb)
-			supabase_set -= missing_in_tmdb
-		
-		# Mettre à jour les pays dans Supabase
-		with psycopg2.connect(supabase_connection_string) as connection:
+		# Une seule connexion pour toute la mise à jour
+		with get_connection() as connection:
+			# Un seul tableau au lieu d'une ligne par id
+			supabase_countries = execute_sql_command("SELECT COALESCE(array_agg(iso_3166_1), ARRAY[]::text[]) FROM tmdb_country", fetch_results=True, conn=connection)[0][0]
+
+			if not supabase_countries:
+				raise Exception("Error: Unable to retrieve Supabase countries. Skipping update.")
+
+			# Créer un ensemble des codes pour chaque source
+			supabase_set = set(supabase_countries)
+
+			# Un seul passage sur la réponse TMDB pour les codes et les valeurs à insérer dans tmdb_country et tmdb_country_translation
+			tmdb_set = set()
+			values_to_insert_country = []
+			for country in tmdb_countries:
+				tmdb_set.add(country['iso_3166_1'])
+				values_to_insert_country.append((country['iso_3166_1'], country['english_name'], country['native_name']))
+
+			# Identifier les différences entre les deux ensembles
+			missing_in_supabase = tmdb_set - supabase_set
+			missing_in_tmdb = supabase_set - tmdb_set
+
+			# Rien à faire si les pays sont les mêmes en base et si la réponse TMDB n'a pas changé depuis la dernière mise à jour
+			signature = get_payload_signature(tmdb_countries)
+			if not missing_in_tmdb and not missing_in_supabase and signature == get_update_signature(connection, 'country'):
+				print("TMDB countries unchanged, skipping update")
+				create_csv_file(file_name, supabase_set)
+				supabase_tmdb_update_log(connection, None, current_date, True, 'country')
+				return
+
+			# Mettre à jour les pays dans Supabase
 			with connection.cursor() as cursor:
 				try:
-					# Démarrez la transaction
-					connection.autocommit = False
+					# Supprimer les pays en trop dans Supabase, dans la même transaction que l'upsert
+					if missing_in_tmdb:
+						print(f"Found {len(missing_in_tmdb)} extra countries in Supabase")
+						cursor.execute("DELETE FROM tmdb_country WHERE iso_3166_1 IN %s", (tuple(missing_in_tmdb),))
 
 					if missing_in_supabase:
 						print(f"Found {len(missing_in_supabase)} countries missing in Supabase")
-						# Insérer les valeurs dans Supabase pour tmdb_country en utilisant ON CONFLICT pour l'upsert
-						cursor.execute("""
+
+					# Insérer tmdb_country et tmdb_country_translation (en et fr) en une seule requête, avec ON CONFLICT pour l'upsert
+					execute_values(cursor, """
+						WITH data (iso_3166_1, english_name, native_name) AS (VALUES %s),
+						inserted_country AS (
 							INSERT INTO tmdb_country (iso_3166_1)
-							VALUES %s
+							SELECT iso_3166_1 FROM data
 							ON CONFLICT (iso_3166_1) DO NOTHING
-						""", (tuple(missing_in_supabase),))
-
-					# Construire les valeurs à insérer dans Supabase pour tmdb_country_translation
-					values_to_insert_translation = [
-						(country['iso_3166_1'], 'en', country['english_name'])
-						for country in tmdb_countries
-						if country['iso_3166_1'] in tmdb_set
-					] + [
-						(country['iso_3166_1'], 'fr', country['native_name'])
-						for country in tmdb_countries
-						if country['iso_3166_1'] in tmdb_set
-					]
-					
-					# Insérer les valeurs dans Supabase pour tmdb_country_translation en utilisant ON CONFLICT pour l'upsert
-					cursor.executemany("""
+						)
 						INSERT INTO tmdb_country_translation (iso_3166_1, iso_639_1, name)
-						VALUES (%s, %s, %s)
+						SELECT iso_3166_1, 'en', english_name FROM data
+						UNION ALL
+						SELECT iso_3166_1, 'fr', native_name FROM data
 						ON CONFLICT (iso_3166_1, iso_639_1) DO UPDATE
 						SET name = EXCLUDED.name
-					""", values_to_insert_translation)
+					""", values_to_insert_country, page_size=1000)
+
+					set_update_signature(cursor, 'country', signature, current_date)
+
+					# Ajouter le log dans la même transaction que les données
+					supabase_tmdb_update_log(connection, cursor, current_date, True, 'country')
 
 					# Valider les modifications
 					connection.commit()
 
-					# Mettre à jour le fichier CSV
-					create_csv_file(file_name, supabase_set | missing_in_supabase)
-					supabase_set = supabase_set | missing_in_supabase
+					# Mettre à jour l'ensemble des ids en base
+					supabase_set.difference_update(missing_in_tmdb)
+					supabase_set.update(missing_in_supabase)
 
 				except Exception as e:
 					# En cas d'erreur, annulez la transaction
 					connection.rollback()
 					print(f"Error updating TMDB countries: {e}")
 
-				finally:
-					# Rétablissez le mode autocommit à True
-					connection.autocommit = True
+					# Le log ne peut plus être écrit dans la transaction annulée
+					supabase_tmdb_update_log(None, None, current_date, False, 'country')
 
-		# Ajouter un log dans la table supabase tmdb_update_logs
-		supabase_tmdb_update_log(current_date, True, 'country')
+		# Écrire le fichier CSV une seule fois, avec l'état final
+		create_csv_file(file_name, supabase_set)
 
 		print("TMDB update countries COMPLETED")
 
@@ -356,28 +626,27 @@ def tmdb_update_country(current_date: datetime, file_name: str = "tmdb_country.c
 		print(f"Error updating TMDB countries: {e}")
 
 		# Ajouter un log dans la table supabase tmdb_update_logs
-		supabase_tmdb_update_log(current_date, False, 'country')
+		supabase_tmdb_update_log(None, None, current_date, False, 'country')
 
 # ========== END TMDB CONFIGURATION ========== #
 		
 # ========== START TMDB GENRE ========== #
 def get_tmdb_genre_list(genre_type: str) -> dict:
-	global api_key_index
-	url_fr = f"https://api.themoviedb.org/3/genre/{genre_type}/list?api_key={tmdb_api_keys[api_key_index]}&language=fr-FR"
-	url_en = f"https://api.themoviedb.org/3/genre/{genre_type}/list?api_key={tmdb_api_keys[api_key_index]}&language=en-US"
+	api_key = next_api_key()
+	url_fr = f"https://api.themoviedb.org/3/genre/{genre_type}/list?api_key={api_key}&language=fr-FR"
+	url_en = f"https://api.themoviedb.org/3/genre/{genre_type}/list?api_key={api_key}&language=en-US"
 
-	response_fr = requests.get(url_fr)
-	response_en = requests.get(url_en)
+	response_fr = tmdb_get(url_fr)
+	response_en = tmdb_get(url_en)
 
-	genres_fr = response_fr.json()
-	genres_en = response_en.json()
+	genres_fr = orjson.loads(response_fr.content)
+	genres_en = orjson.loads(response_en.content)
 
 	# Vérifier si la clé 'success' existe et a la valeur False dans 'english' ou 'french'
 	if ('success' in genres_en and not genres_en['success']) or ('success' in genres_fr and not genres_fr['success']):
 		print(f"La récupération des genres de type {genre_type} a échoué.")
 		return None
 
-	api_key_index = (api_key_index + 1) % len(tmdb_api_keys)
 
 	return {"french": genres_fr['genres'], "english": genres_en['genres']}
 
@@ -386,11 +655,6 @@ def tmdb_update_genre(current_date: datetime, file_name: str = "tmdb_genre.csv")
 	try:
 		print("Starting TMDB update genres")
 
-		supabase_genres = execute_sql_command("SELECT id FROM tmdb_genre", fetch_results=True)
-
-		if not supabase_genres:
-			raise Exception("Error: Unable to retrieve Supabase genres. Skipping update.")
-		
 		# Récupérer les genres de films
 		tmdb_movie_genres = get_tmdb_genre_list("movie")
 		
@@ -399,66 +663,68 @@ def tmdb_update_genre(current_date: datetime, file_name: str = "tmdb_genre.csv")
 		
 		if not tmdb_movie_genres or not tmdb_tv_genres:
 			raise Exception("Error: Unable to retrieve TMDB genres. Skipping update.")
-		
-		# Créer un ensemble des ids pour chaque source
-		supabase_set = {genre[0] for genre in supabase_genres}
-		tmdb_set = {genre['id'] for genre in tmdb_movie_genres["english"] + tmdb_tv_genres["english"]}
-
-		# Créer un fichier CSV avec les genres
-		create_csv_file(file_name, supabase_set)
-
-		missing_in_supabase = tmdb_set - supabase_set
-		missing_in_tmdb = supabase_set - tmdb_set
 
-		# Si des genres sont en trop dans Supabase, les supprimer
-		if missing_in_tmdb:
-			print(f"Found {len(missing_in_tmdb)} extra genres in Supabase")
-			delete_command = "DELETE FROM tmdb_genre WHERE id IN %s"
-			execute_sql_command(delete_command, (tuple(missing_in_tmdb),))
-			# Mettre à jour le fichier CSV
-			create_csv_file(file_name, supabase_set - missing_in_tmdb)
-			supabase_set -= missing_in_tmdb
+		# Une seule connexion pour toute la mise à jour
+		with get_connection() as connection:
+			# Un seul tableau au lieu d'une ligne par id
+			supabase_genres = execute_sql_command("SELECT COALESCE(array_agg(id), ARRAY[]::int[]) FROM tmdb_genre", fetch_results=True, conn=connection)[0][0]
+
+			if not supabase_genres:
+				raise Exception("Error: Unable to retrieve Supabase genres. Skipping update.")
+
+			# Créer un ensemble des ids pour chaque source
+			supabase_set = set(supabase_genres)
+
+			# Construire les valeurs à insérer dans Supabase pour tmdb_genre et tmdb_genre_translation, indexées par id
+			# Les genres communs aux films et aux séries n'apparaissent qu'une fois : un upsert ne peut pas toucher deux fois la même ligne
+			genres_fr = {genre['id']: genre['name'] for genre in itertools.chain(tmdb_movie_genres["french"], tmdb_tv_genres["french"])}
+			tmdb_genres = {
+				genre['id']: (genre['id'], genre['name'], genres_fr.get(genre['id']))
+				for genre in itertools.chain(tmdb_movie_genres["english"], tmdb_tv_genres["english"])
+			}
+			tmdb_set = set(tmdb_genres)
+
+			missing_in_supabase = tmdb_set - supabase_set
+			missing_in_tmdb = supabase_set - tmdb_set
+
+			# Si des genres sont en trop dans Supabase, les supprimer
+			if missing_in_tmdb:
+				print(f"Found {len(missing_in_tmdb)} extra genres in Supabase")
+				delete_command = "DELETE FROM tmdb_genre WHERE id IN %s"
+				execute_sql_command(delete_command, (tuple(missing_in_tmdb),), conn=connection)
 		
-		if missing_in_supabase:
-			print(f"Found {len(missing_in_supabase)} genres missing in Supabase")
+			if missing_in_supabase:
+				print(f"Found {len(missing_in_supabase)} genres missing in Supabase")
 		
-		# Mettre à jour les genres dans Supabase
-		with psycopg2.connect(supabase_connection_string) as connection:
+			# Mettre à jour les genres dans Supabase
 			with connection.cursor() as cursor:
 				try:
-					# Démarrez la transaction
-					connection.autocommit = False
-
-					# Construire les valeurs à insérer dans Supabase pour tmdb_genre
-					values_to_insert_genre = [
-						(genre['id'],) for genre in tmdb_movie_genres["english"] + tmdb_tv_genres["english"]
-					]
-
-					# Insérer les valeurs dans Supabase pour tmdb_genre en utilisant ON CONFLICT pour l'upsert
-					cursor.executemany("""
-						INSERT INTO tmdb_genre (id)
-						VALUES (%s)
-						ON CONFLICT (id) DO NOTHING
-					""", values_to_insert_genre)
-
-					# Construire les valeurs à insérer dans Supabase pour tmdb_genre_translation
-					values_to_insert_translation = [
-						(genre['id'], 'en', genre['name']) for genre in tmdb_movie_genres["english"] + tmdb_tv_genres["english"]
-					] + [
-						(genre['id'], 'fr', genre['name']) for genre in tmdb_movie_genres["french"] + tmdb_tv_genres["french"]
-					]
-
-					# Insérer les valeurs dans Supabase pour tmdb_genre_translation en utilisant ON CONFLICT pour l'upsert
-					cursor.executemany("""
+					# Insérer tmdb_genre et tmdb_genre_translation (en et fr) en une seule requête, avec ON CONFLICT pour l'upsert
+					execute_values(cursor, """
+						WITH data (id, name_en, name_fr) AS (VALUES %s),
+						inserted_genre AS (
+							INSERT INTO tmdb_genre (id)
+							SELECT id FROM data
+							ON CONFLICT (id) DO NOTHING
+						)
 						INSERT INTO tmdb_genre_translation (genre, language, name)
-						VALUES (%s, %s, %s)
+						SELECT id, 'en', name_en FROM data
+						UNION ALL
+						SELECT id, 'fr', name_fr FROM data WHERE name_fr IS NOT NULL
 						ON CONFLICT (genre, language) DO UPDATE
 						SET name = EXCLUDED.name
-					""", values_to_insert_translation)
+					""", list(tmdb_genres.values()), page_size=1000)
+
+					# Ajouter le log dans la même transaction que les données
+					supabase_tmdb_update_log(connection, cursor, current_date, True, 'genre')
 
 					# Valider les modifications
 					connection.commit()
 
+					# Mettre à jour l'ensemble des ids en base
+					supabase_set.difference_update(missing_in_tmdb)
+					supabase_set.update(missing_in_supabase)
+
 					print("TMDB update genres COMPLETED")
 
 				except Exception as e:
@@ -466,100 +732,78 @@ def tmdb_update_genre(current_date: datetime, file_name: str = "tmdb_genre.csv")
 					connection.rollback()
 					print(f"Error updating TMDB genres: {e}")
 
-				finally:
-					# Rétablissez le mode autocommit à True
-					connection.autocommit = True
+					# Le log ne peut plus être écrit dans la transaction annulée
+					supabase_tmdb_update_log(None, None, current_date, False, 'genre')
 
-		# Ajouter un log dans la table supabase tmdb_update_logs
-		supabase_tmdb_update_log(current_date, True, 'genre')
+		# Écrire le fichier CSV une seule fois, avec l'état final
+		create_csv_file(file_name, supabase_set)
 	
 	except Exception as e:
 		print(f"Error updating TMDB genres: {e}")
 		
 		# Ajouter un log dans la table supabase tmdb_update_logs
-		supabase_tmdb_update_log(current_date, False, 'genre')
+		supabase_tmdb_update_log(None, None, current_date, False, 'genre')
 # ========== END TMDB GENRE ========== #
 		
 # ========== START TMDB KEYWORD ========== #
 def tmdb_update_keyword(current_date: datetime, file_name: str = "tmdb_keyword.csv"):
 	try:
 		print("Starting TMDB update keywords")
-		tmdb_keywords_export = get_tmdb_export_ids(type="keyword", date=current_date)
-		if not tmdb_keywords_export:
+		# Garder uniquement le nom de chaque keyword, indexé par id
+		tmdb_keywords = {keyword['id']: keyword['name'] for keyword in iter_tmdb_export(type="keyword", date=current_date)}
+		if not tmdb_keywords:
 			raise Exception("Error: Unable to retrieve TMDB keyword. Skipping update.")
 
-		supabase_keywords = execute_sql_command("SELECT id FROM tmdb_keyword", fetch_results=True)
-		if not supabase_keywords:
-			raise Exception("Error: Unable to retrieve Supabase keywords. Skipping update.")
+		# Extraire les IDs des keywords de l'export
+		tmdb_ids_set = set(tmdb_keywords)
 
-		# Lire le fichier JSON
-		with open(tmdb_keywords_export, 'r', encoding='utf-8') as file:
-			tmdb_keywords = [json.loads(line) for line in file]
+		# Une seule connexion pour toute la mise à jour
+		with get_connection() as connection:
+			# Calculer les différences côté serveur : seuls les ids manquants ou en trop reviennent
+			missing_in_supabase, missing_in_tmdb = get_id_differences(connection, "tmdb_keyword", tmdb_ids_set)
 
-		# Extraire les IDs des collections du fichier JSON
-		tmdb_ids_set = {keyword['id'] for keyword in tmdb_keywords}
+			# Ids en base une fois les ids en trop supprimés
+			supabase_ids_set = tmdb_ids_set - missing_in_supabase
 
-		# Extraire les IDs des collections dans Supabase
-		supabase_ids_set = {row[0] for row in supabase_keywords}
-
-		# Identifier les différences
-		missing_in_supabase = tmdb_ids_set - supabase_ids_set
-		missing_in_tmdb = supabase_ids_set - tmdb_ids_set
-
-		# Créez un fichier CSV avec les keywords de Supabase
-		create_csv_file(file_name, supabase_ids_set)
+			# Si des keywords sont en trop dans Supabase, les supprimer
+			if missing_in_tmdb:
+				print(f"Found {len(missing_in_tmdb)} extra keywords in Supabase")
+				delete_command = "DELETE FROM tmdb_keyword WHERE id IN %s"
+				execute_sql_command(delete_command, (tuple(missing_in_tmdb),), conn=connection)
 
-		# Si des keywords sont en trop dans Supabase, les supprimer
-		if missing_in_tmdb:
-			print(f"Found {len(missing_in_tmdb)} extra keywords in Supabase")
-			delete_command = "DELETE FROM tmdb_keyword WHERE id IN %s"
-			execute_sql_command(delete_command, (tuple(missing_in_tmdb),))
-			# Mettre à jour le fichier CSV
-			create_csv_file(file_name, supabase_ids_set - missing_in_tmdb)
-			supabase_ids_set -= missing_in_tmdb
+				# Valider la suppression : un rollback des insertions ne doit pas l'annuler
+				connection.commit()
 		
-		# Si des keywords sont manquants dans Supabase, les ajouter
-		if missing_in_supabase:
-			print(f"Found {len(missing_in_supabase)} keyword missing in Supabase")
-			with psycopg2.connect(supabase_connection_string) as connection:
+			# Si des keywords sont manquants dans Supabase, les ajouter
+			if missing_in_supabase:
+				print(f"Found {len(missing_in_supabase)} keyword missing in Supabase")
 				with connection.cursor() as cursor:
 					try:
-						# Démarrez la transaction
-						connection.autocommit = False
-
 						# Construire les valeurs à insérer dans Supabase pour tmdb_keyword
 						values_to_insert_keyword = [
-							(keyword['id'], keyword['name'])
-							for keyword in tmdb_keywords
-							if keyword['id'] in missing_in_supabase
+							(keyword_id, tmdb_keywords[keyword_id])
+							for keyword_id in missing_in_supabase
 						]
 
 						# Insérer les valeurs dans Supabase pour tmdb_keyword en utilisant ON CONFLICT pour l'upsert
-						cursor.executemany("""
-							INSERT INTO tmdb_keyword (id, name)
-							VALUES (%s, %s)
-							ON CONFLICT (id) DO UPDATE
-							SET name = EXCLUDED.name
-						""", values_to_insert_keyword)
+						copy_upsert(cursor, "tmdb_keyword", ["id", "name"], values_to_insert_keyword, ["id"], ["name"])
 
 						# Valider les modifications
 						connection.commit()
 
-						# Mettre à jour le fichier CSV
-						create_csv_file(file_name, supabase_ids_set | missing_in_supabase)
-						supabase_ids_set = supabase_ids_set | missing_in_supabase
+						# Mettre à jour l'ensemble des ids en base
+						supabase_ids_set.update(missing_in_supabase)
 
 					except Exception as e:
 						# En cas d'erreur, annulez la transaction
 						connection.rollback()
 						print(f"Error updating TMDB keyword: {e}")
 
-					finally:
-						# Rétablissez le mode autocommit à True
-						connection.autocommit = True
+			# Ajouter le log dans la transaction de la mise à jour
+			supabase_tmdb_update_log(connection, None, current_date, True, 'keyword')
 
-		# Ajouter un log dans la table supabase tmdb_update_logs
-		supabase_tmdb_update_log(current_date, True, 'keyword')
+		# Écrire le fichier CSV une seule fois, avec l'état final
+		create_csv_file(file_name, supabase_ids_set)
 
 		print("TMDB update keywords COMPLETED")
 	
@@ -567,30 +811,31 @@ def tmdb_update_keyword(current_date: datetime, file_name: str = "tmdb_keyword.c
 		print(f"Error updating TMDB keywords: {e}")
 
 		# Ajouter un log dans la table supabase tmdb_update_logs
-		supabase_tmdb_update_log(current_date, False, 'keyword')
-	finally:
-		if os.path.exists(tmdb_keywords_export):
-			os.remove(tmdb_keywords_export)
+		supabase_tmdb_update_log(None, None, current_date, False, 'keyword')
 # ========== END TMDB KEYWORD ========== #
 		
 # ========== START TMDB COLLECTION ========== #
+# Pool séparé pour les requêtes secondaires (fr), lancées depuis les workers du pool principal
+details_executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS)
+
 def get_tmdb_collection_details(collection_id: int) -> dict:
-	global api_key_index
-	url_fr = f"https://api.themoviedb.org/3/collection/{collection_id}?api_key={tmdb_api_keys[api_key_index]}&language=fr-FR"
-	url_en = f"https://api.themoviedb.org/3/collection/{collection_id}?api_key={tmdb_api_keys[api_key_index]}&language=en-US"
+	api_key = next_api_key()
+	url_fr = f"https://api.themoviedb.org/3/collection/{collection_id}?api_key={api_key}&language=fr-FR"
+	url_en = f"https://api.themoviedb.org/3/collection/{collection_id}?api_key={api_key}&language=en-US"
 
-	response_fr = requests.get(url_fr)
-	response_en = requests.get(url_en)
+	# Récupérer la version française en parallèle de la version anglaise
+	future_fr = details_executor.submit(tmdb_get, url_fr)
+	response_en = tmdb_get(url_en)
+	response_fr = future_fr.result()
 
-	details_fr = response_fr.json()
-	details_en = response_en.json()
+	details_fr = orjson.loads(response_fr.content)
+	details_en = orjson.loads(response_en.content)
 
 	# Vérifier si la clé 'success' existe et a la valeur False dans 'english' ou 'french'
 	if ('success' in details_en and not details_en['success']) or ('success' in details_fr and not details_fr['success']):
 		print(f"La récupération des détails de la collection {collection_id} a échoué.")
 		return None
 
-	api_key_index = (api_key_index + 1) % len(tmdb_api_keys)
 
 	return {"french": details_fr, "english": details_en}
 
@@ -599,132 +844,110 @@ def tmdb_update_collection(current_date: datetime, file_name: str = "tmdb_collec
 		print("Starting TMDB update collection")
 		count_added = 0
 		count_deleted = 0
-		tmdb_collection_export = get_tmdb_export_ids(type="collection", date=current_date)
-		if not tmdb_collection_export:
+		tmdb_ids_set = get_tmdb_export_ids(type="collection", date=current_date)
+		if not tmdb_ids_set:
 			raise Exception("Error: Unable to retrieve TMDB collections. Skipping update.")
 		
-		supabase_collections = execute_sql_command("SELECT id FROM tmdb_collection", fetch_results=True)
-		if not supabase_collections:
-			raise Exception("Error: Unable to retrieve Supabase collections. Skipping update.")
-
-		# Lire le fichier JSON
-		with open(tmdb_collection_export, 'r', encoding='utf-8') as file:
-			tmdb_collections = [json.loads(line) for line in file]
+		# Une seule connexion pour toute la mise à jour
+		with get_connection() as connection:
+			# Calculer les différences côté serveur : seuls les ids manquants ou en trop reviennent
+			missing_in_supabase, missing_in_tmdb = get_id_differences(connection, "tmdb_collection", tmdb_ids_set)
 
-		# Extraire les IDs des collections du fichier JSON
-		tmdb_ids_set = {collection['id'] for collection in tmdb_collections}
+			# Ids en base une fois les ids en trop supprimés
+			supabase_ids_set = tmdb_ids_set - missing_in_supabase
 
-		# Extraire les IDs des collections dans Supabase
-		supabase_ids_set = {row[0] for row in supabase_collections}
+			count_deleted = len(missing_in_tmdb)
+			count_added = len(missing_in_supabase)
 
-		# Identifier les différences
-		missing_in_supabase = tmdb_ids_set - supabase_ids_set
-		missing_in_tmdb = supabase_ids_set - tmdb_ids_set
+			if missing_in_tmdb:
+				print(f"Found {len(missing_in_tmdb)} extra collections in Supabase")
+				delete_command = "DELETE FROM tmdb_collection WHERE id IN %s"
+				execute_sql_command(delete_command, (tuple(missing_in_tmdb),), conn=connection)
 
-		count_deleted = len(missing_in_tmdb)
-		count_added = len(missing_in_supabase)
+				# Valider la suppression : un rollback des insertions ne doit pas l'annuler
+				connection.commit()
+		
+			if missing_in_supabase:
+				print(f"Found {len(missing_in_supabase)} collections missing in Supabase")
+		
+				# Ids des chunks écrits depuis le dernier commit
+				pending_ids = []
 
-		# Créez un fichier CSV avec les collections de Supabase
-		create_csv_file(file_name, supabase_ids_set)
+				# Un seul pool pour tous les chunks, dimensionné sur les clés API plutôt que sur MAX_WORKERS
+				with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor, connection.cursor() as cursor:
+					for index, chunk in enumerate(chunked(missing_in_supabase, 500), start=1):
+						# Créer une liste pour stocker les détails des personnes
+						current_collections_to_update = []
 
-		if missing_in_tmdb:
-			print(f"Found {len(missing_in_tmdb)} extra collections in Supabase")
-			delete_command = "DELETE FROM tmdb_collection WHERE id IN %s"
-			execute_sql_command(delete_command, (tuple(missing_in_tmdb),))
-			# Mettre à jour le fichier CSV
-			create_csv_file(file_name, supabase_ids_set - missing_in_tmdb)
-			supabase_ids_set -= missing_in_tmdb
-		
-		if missing_in_supabase:
-			chunks = list(chunked(missing_in_supabase, 500))
+						for future in as_completed([executor.submit(get_tmdb_collection_details, collection_id) for collection_id in chunk]):
+							collection_details = future.result()
+							if collection_details is not None:
+								current_collections_to_update.append(collection_details)
 
-			print(f"Found {len(missing_in_supabase)} collections missing in Supabase")
-		
-			for chunk in chunks:
-				# Créer une liste pour stocker les détails des personnes
-				current_collections_to_update = []
-
-				# Use ThreadPoolExecutor to execute tasks in parallel
-				with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-					futures = [executor.submit(get_tmdb_collection_details, collection_id) for collection_id in chunk]
-
-					for future in futures:
-						collection_details = future.result()
-						if collection_details is not None:
-							current_collections_to_update.append(collection_details)
-
-				# Mettre à jour les collections dans Supabase
-				with psycopg2.connect(supabase_connection_string) as connection:
-					with connection.cursor() as cursor:
+						# Mettre à jour les collections dans Supabase
 						try:
-							# Démarrez la transaction
-							connection.autocommit = False
+							# Un savepoint par chunk : une erreur n'annule que ce chunk, pas le lot en cours
+							cursor.execute("SAVEPOINT chunk")
 
 							# Construire les valeurs à insérer dans Supabase pour tmdb_collection
 							values_to_insert_collection = [
-								{
-									'id': collection_data['english']['id'],
-									'backdrop_path': collection_data['english'].get('backdrop_path', None),
-								}
+								(
+									collection_data['english']['id'],
+									collection_data['english'].get('backdrop_path', None),
+								)
 								for collection_data in current_collections_to_update
 							]
 							# Insérer les valeurs dans Supabase pour tmdb_collection en utilisant ON CONFLICT pour l'upsert
-							cursor.executemany("""
-								INSERT INTO tmdb_collection (id, backdrop_path)
-								VALUES (%(id)s, %(backdrop_path)s)
-								ON CONFLICT (id) DO NOTHING
-							""", values_to_insert_collection)
+							copy_upsert(cursor, "tmdb_collection", ["id", "backdrop_path"], values_to_insert_collection, ["id"])
 
-							# Construire les valeurs à insérer dans Supabase pour tmdb_collection_translations
+							# Construire les valeurs à insérer dans Supabase pour tmdb_collection_translations, en et fr en un seul passage
 							values_to_insert_translations = [
-								{
-									'collection': collection_data['english']['id'],
-									'language': 'en',
-									'overview': collection_data['english'].get('overview', None),
-									'poster_path': collection_data['english'].get('poster_path', None),
-									'name': collection_data['english'].get('name', None),
-								}
-								for collection_data in current_collections_to_update
-							] + [
-								{
-									'collection': collection_data['french']['id'],
-									'language': 'fr',
-									'overview': collection_data['french'].get('overview', None),
-									'poster_path': collection_data['french'].get('poster_path', None),
-									'name': collection_data['french'].get('name', None),
-								}
+								(
+									collection_data['english']['id'],
+									language,
+									details.get('overview', None),
+									details.get('poster_path', None),
+									details.get('name', None),
+								)
 								for collection_data in current_collections_to_update
+								for language, details in (('en', collection_data['english']), ('fr', collection_data['french']))
 							]
-							
-							# Insérer les valeurs dans Supabase pour tmdb_collection_translations en utilisant ON CONFLICT pour l'upsert
-							cursor.executemany("""
-								INSERT INTO tmdb_collection_translation (collection, language, overview, poster_path, name)
-								VALUES (%(collection)s, %(language)s, %(overview)s, %(poster_path)s, %(name)s)
-								ON CONFLICT (collection, language) DO UPDATE
-								SET overview = EXCLUDED.overview,
-									poster_path = EXCLUDED.poster_path,
-									name = EXCLUDED.name
-							""", values_to_insert_translations)
-
-							# Valider les modifications
-							connection.commit()
 
-							# Mettre à jour le fichier CSV
-							chunk_set = set(chunk)
-							create_csv_file(file_name, supabase_ids_set | chunk_set)
-							supabase_ids_set = supabase_ids_set | chunk_set
+							# Insérer les valeurs dans Supabase pour tmdb_collection_translations en utilisant ON CONFLICT pour l'upsert
+							copy_upsert(
+								cursor, "tmdb_collection_translation",
+								["collection", "language", "overview", "poster_path", "name"],
+								values_to_insert_translations,
+								["collection", "language"],
+								["overview", "poster_path", "name"]
+							)
+
+							cursor.execute("RELEASE SAVEPOINT chunk")
+							# Seuls les ids réellement écrits vont dans le fichier CSV : un id dont les détails ont échoué casserait la clé étrangère des films
+							pending_ids.extend(collection_data['english']['id'] for collection_data in current_collections_to_update)
 
 						except Exception as e:
-							# En cas d'erreur, annulez la transaction
-							connection.rollback()
+							# En cas d'erreur, annuler uniquement ce chunk
+							cursor.execute("ROLLBACK TO SAVEPOINT chunk")
 							print(f"Error updating TMDB collections: {e}")
 
-						finally:
-							# Rétablissez le mode autocommit à True
-							connection.autocommit = True
-		
-		# Ajouter un log dans la table supabase tmdb_update_logs
-		supabase_tmdb_update_log(current_date, True, 'collection')
+						# Valider tous les CHUNKS_PER_COMMIT chunks
+						if index % CHUNKS_PER_COMMIT == 0:
+							connection.commit()
+
+							# Mettre à jour l'ensemble des ids en base
+							supabase_ids_set.update(pending_ids)
+							pending_ids.clear()
+
+					# Valider les derniers chunks
+					connection.commit()
+					supabase_ids_set.update(pending_ids)
+
+			# Ajouter le log dans la transaction de la mise à jour
+			supabase_tmdb_update_log(connection, None, current_date, True, 'collection')
+
+		# Écrire le fichier CSV une seule fois, avec l'état final
+		create_csv_file(file_name, supabase_ids_set)
 
 		print(f"TMDB update collections (added: {count_added}, deleted: {count_deleted}) COMPLETED")
 	
@@ -732,27 +955,23 @@ def tmdb_update_collection(current_date: datetime, file_name: str = "tmdb_collec
 		print(f"Error updating TMDB collections: {e}")
 
 		# Ajouter un log dans la table supabase tmdb_update_logs
-		supabase_tmdb_update_log(current_date, False, 'collection')
-	finally:
-		if os.path.exists(tmdb_collection_export):
-			os.remove(tmdb_collection_export)
+		supabase_tmdb_update_log(None, None, current_date, False, 'collection')
 # ========== END TMDB COLLECTION ========== #
 
 # ========== START TMDB COMPANY ========== #
 def get_tmdb_company_details(company_id: int) -> dict:
-	global api_key_index
-	url = f"https://api.themoviedb.org/3/company/{company_id}?api_key={tmdb_api_keys[api_key_index]}"
+	api_key = next_api_key()
+	url = f"https://api.themoviedb.org/3/company/{company_id}?api_key={api_key}"
 
-	response = requests.get(url)
+	response = tmdb_get(url)
 
-	details = response.json()
+	details = orjson.loads(response.content)
 
 	# Vérifier si la clé 'success' existe et a la valeur False dans 'english' ou 'french'
 	if ('success' in details and not details['success']):
 		print(f"La récupération des détails de la company {company_id} a échoué.")
 		return None
 
-	api_key_index = (api_key_index + 1) % len(tmdb_api_keys)
 
 	return details
 
@@ -761,116 +980,101 @@ def tmdb_update_company(current_date: datetime, file_name: str = "tmdb_company.c
 		print("Starting TMDB update companies")
 		count_added = 0
 		count_deleted = 0
-		tmdb_company_export = get_tmdb_export_ids(type="production_company", date=current_date)
-		if not tmdb_company_export:
+		tmdb_ids_set = get_tmdb_export_ids(type="production_company", date=current_date)
+		if not tmdb_ids_set:
 			raise Exception("Error: Unable to retrieve TMDB companies. Skipping update.")
 		
-		supabase_companies = execute_sql_command("SELECT id FROM tmdb_company", fetch_results=True)
-		if not supabase_companies:
-			raise Exception("Error: Unable to retrieve Supabase companies. Skipping update.")
+		# Une seule connexion pour toute la mise à jour
+		with get_connection() as connection:
+			# Calculer les différences côté serveur : seuls les ids manquants ou en trop reviennent
+			missing_in_supabase, missing_in_tmdb = get_id_differences(connection, "tmdb_company", tmdb_ids_set)
 
-		# Lire le fichier JSON
-		with open(tmdb_company_export, 'r', encoding='utf-8') as file:
-			tmdb_companies = [json.loads(line) for line in file]
+			# Ids en base une fois les ids en trop supprimés
+			supabase_ids_set = tmdb_ids_set - missing_in_supabase
 
-		# Extraire les IDs des companies du fichier JSON
-		tmdb_ids_set = {company['id'] for company in tmdb_companies}
+			count_deleted = len(missing_in_tmdb)
+			count_added = len(missing_in_supabase)
 
-		# Extraire les IDs des companies dans Supabase
-		supabase_ids_set = {row[0] for row in supabase_companies}
+			if missing_in_tmdb:
+				print(f"Found {len(missing_in_tmdb)} extra companies in Supabase")
+				delete_command = "DELETE FROM tmdb_company WHERE id IN %s"
+				execute_sql_command(delete_command, (tuple(missing_in_tmdb),), conn=connection)
 
-		# Identifier les différences
-		missing_in_supabase = tmdb_ids_set - supabase_ids_set
-		missing_in_tmdb = supabase_ids_set - tmdb_ids_set
-
-		count_deleted = len(missing_in_tmdb)
-		count_added = len(missing_in_supabase)
-
-		# Créez un fichier CSV avec les companies de Supabase
-		create_csv_file(file_name, supabase_ids_set)
-
-		if missing_in_tmdb:
-			print(f"Found {len(missing_in_tmdb)} extra companies in Supabase")
-			delete_command = "DELETE FROM tmdb_company WHERE id IN %s"
-			execute_sql_command(delete_command, (tuple(missing_in_tmdb),))
-			# Mettre à jour le fichier CSV
-			create_csv_file(file_name, supabase_ids_set - missing_in_tmdb)
-			supabase_ids_set -= missing_in_tmdb
+				# Valider la suppression : un rollback des insertions ne doit pas l'annuler
+				connection.commit()
 		
-		if missing_in_supabase:
-			chunks = list(chunked(missing_in_supabase, 500))
-
-			print(f"Found {len(missing_in_supabase)} companies missing in Supabase")
+			if missing_in_supabase:
+				print(f"Found {len(missing_in_supabase)} companies missing in Supabase")
 		
-			for chunk in chunks:
-				# Créer une liste pour stocker les détails des personnes
-				current_companies_to_update = []
-
-				# Use ThreadPoolExecutor to execute tasks in parallel
-				with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-					futures = [executor.submit(get_tmdb_company_details, company_id) for company_id in chunk]
-
-					for future in futures:
-						company_details = future.result()
-						if company_details is not None:
-							current_companies_to_update.append(company_details)
-
-				print(f"Found {len(current_companies_to_update)} companies to update")
-			 	# Mettre à jour les companies dans Supabase
-				with psycopg2.connect(supabase_connection_string) as connection:
-					with connection.cursor() as cursor:
+				# Ids des chunks écrits depuis le dernier commit
+				pending_ids = []
+
+				# Un seul pool pour tous les chunks, dimensionné sur les clés API plutôt que sur MAX_WORKERS
+				with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor, connection.cursor() as cursor:
+					for index, chunk in enumerate(chunked(missing_in_supabase, 500), start=1):
+						# Créer une liste pour stocker les détails des personnes
+						current_companies_to_update = []
+
+						for future in as_completed([executor.submit(get_tmdb_company_details, company_id) for company_id in chunk]):
+							company_details = future.result()
+							if company_details is not None:
+								current_companies_to_update.append(company_details)
+
+						print(f"Found {len(current_companies_to_update)} companies to update")
+						# Mettre à jour les companies dans Supabase
 						try:
-							# Démarrez la transaction
-							connection.autocommit = False
+							# Un savepoint par chunk : une erreur n'annule que ce chunk, pas le lot en cours
+							cursor.execute("SAVEPOINT chunk")
 
 							# Construire les valeurs à insérer dans Supabase pour tmdb_company
 							values_to_insert_company = [
-								{
-									'id': company_data['id'],
-									'name': company_data.get('name', None),
-									'description': company_data.get('description', None),
-									'headquarters': company_data.get('headquarters', None),
-									'homepage': company_data.get('homepage', None),
-									'logo_path': company_data.get('logo_path', None),
-									'origin_country': company_data.get('origin_country', None),
-									'parent_company': company_data.get('parent_company', None),
-								}
+								(
+									company_data['id'],
+									company_data.get('name', None),
+									company_data.get('description', None),
+									company_data.get('headquarters', None),
+									company_data.get('homepage', None),
+									company_data.get('logo_path', None),
+									company_data.get('origin_country', None),
+									company_data.get('parent_company', None),
+								)
 								for company_data in current_companies_to_update
 							]
 							# Insérer les valeurs dans Supabase pour tmdb_company en utilisant ON CONFLICT pour l'upsert
-							cursor.executemany("""
-								INSERT INTO tmdb_company (id, name, description, headquarters, homepage, logo_path, origin_country, parent_company)
-								VALUES (%(id)s, %(name)s, %(description)s, %(headquarters)s, %(homepage)s, %(logo_path)s, %(origin_country)s, %(parent_company)s)
-								ON CONFLICT (id) DO UPDATE
-								SET
-									name = EXCLUDED.name,
-									description = EXCLUDED.description,
-									headquarters = EXCLUDED.headquarters,
-									homepage = EXCLUDED.homepage,
-									logo_path = EXCLUDED.logo_path,
-									origin_country = EXCLUDED.origin_country,
-									parent_company = EXCLUDED.parent_company
-							""", values_to_insert_company)
-
-							# Valider les modifications
-							connection.commit()
-
-							# Mettre à jour le fichier CSV
-							chunk_set = set(chunk)
-							create_csv_file(file_name, supabase_ids_set | chunk_set)
-							supabase_ids_set = supabase_ids_set | chunk_set
+							copy_upsert(
+								cursor, "tmdb_company",
+								["id", "name", "description", "headquarters", "homepage", "logo_path", "origin_country", "parent_company"],
+								values_to_insert_company,
+								["id"],
+								["name", "description", "headquarters", "homepage", "logo_path", "origin_country", "parent_company"]
+							)
+
+							cursor.execute("RELEASE SAVEPOINT chunk")
+							# Seuls les ids réellement écrits vont dans le fichier CSV : un id dont les détails ont échoué casserait la clé étrangère des films
+							pending_ids.extend(company_data['id'] for company_data in current_companies_to_update)
 
 						except Exception as e:
-							# En cas d'erreur, annulez la transaction
-							connection.rollback()
+							# En cas d'erreur, annuler uniquement ce chunk
+							cursor.execute("ROLLBACK TO SAVEPOINT chunk")
 							print(f"Error updating TMDB companies: {e}")
 
-						finally:
-							# Rétablissez le mode autocommit à True
-							connection.autocommit = True
-		
-		# Ajouter un log dans la table supabase tmdb_update_logs
-		supabase_tmdb_update_log(current_date, True, 'company')
+						# Valider tous les CHUNKS_PER_COMMIT chunks
+						if index % CHUNKS_PER_COMMIT == 0:
+							connection.commit()
+
+							# Mettre à jour l'ensemble des ids en base
+							supabase_ids_set.update(pending_ids)
+							pending_ids.clear()
+
+					# Valider les derniers chunks
+					connection.commit()
+					supabase_ids_set.update(pending_ids)
+
+			# Ajouter le log dans la transaction de la mise à jour
+			supabase_tmdb_update_log(connection, None, current_date, True, 'company')
+
+		# Écrire le fichier CSV une seule fois, avec l'état final
+		create_csv_file(file_name, supabase_ids_set)
 
 		print(f"TMDB update companies (added: {count_added}, deleted: {count_deleted}) COMPLETED")
 	
@@ -878,194 +1082,173 @@ def tmdb_update_company(current_date: datetime, file_name: str = "tmdb_company.c
 		print(f"Error updating TMDB companies: {e}")
 
 		# Ajouter un log dans la table supabase tmdb_update_logs
-		supabase_tmdb_update_log(current_date, False, 'company')
-	finally:
-		if os.path.exists(tmdb_company_export):
-			os.remove(tmdb_company_export)
+		supabase_tmdb_update_log(None, None, current_date, False, 'company')
 # ========== END TMDB COMPANY ========== #
 
 # ========== START TMDB PERSON ========== #
+# Données de la traduction française incluse par append_to_response=translations ({} si absente)
+def get_french_translation(details: dict) -> dict:
+	for translation in details.get('translations', {}).get('translations', []):
+		if translation.get('iso_639_1') == 'fr':
+			return translation.get('data', {})
+	return {}
+
 def get_tmdb_person_details(person_id: int) -> dict:
-	global api_key_index
-	url_fr = f"https://api.themoviedb.org/3/person/{person_id}?api_key={tmdb_api_keys[api_key_index]}&language=fr-FR"
-	url_en = f"https://api.themoviedb.org/3/person/{person_id}?api_key={tmdb_api_keys[api_key_index]}&language=en-US"
+	api_key = next_api_key()
+	# Une seule requête : la version française vient des traductions
+	url_en = f"https://api.themoviedb.org/3/person/{person_id}?api_key={api_key}&language=en-US&append_to_response=translations"
 	
-	response_en = requests.get(url_en)
-	response_fr = requests.get(url_fr)
+	response_en = tmdb_get(url_en)
 
-	details_en = response_en.json()
-	details_fr = response_fr.json()
+	details_en = orjson.loads(response_en.content)
 
-	# Vérifier si la clé 'success' existe et a la valeur False dans 'english' ou 'french'
-	if ('success' in details_en and not details_en['success']) or ('success' in details_fr and not details_fr['success']):
+	# Vérifier si la clé 'success' existe et a la valeur False
+	if ('success' in details_en and not details_en['success']):
 		print(f"La récupération des détails de la person {person_id} a échoué.")
 		return None
 
-	api_key_index = (api_key_index + 1) % len(tmdb_api_keys)
+	translation_fr = get_french_translation(details_en)
+	details_fr = {
+		'id': details_en['id'],
+		'biography': translation_fr.get('biography', ''),
+	}
 
 	return {"french": details_fr, "english": details_en}
 
-def update_supabase_tmdb_person(persons_to_update: list):
+# Retourne False si le lot n'a pas été écrit, pour que l'appelant ne l'ajoute pas au fichier CSV
+def update_supabase_tmdb_person(persons_to_update: list) -> bool:
 	try:
-		with psycopg2.connect(supabase_connection_string) as connection:
-			with connection.cursor() as cursor:
-				try:
-					# Démarrez la transaction
-					connection.autocommit = False
-
-					# Construire les valeurs à insérer dans Supabase pour tmdb_person
-					values_to_insert_person = [
-						{
-							'id': person_data['english']['id'],
-							'adult': person_data['english'].get('adult', False),
-							'also_known_as': person_data['english'].get('also_known_as', []),
-							'birthday': person_data['english'].get('birthday', None),
-							'deathday': person_data['english'].get('deathday', None),
-							'gender': person_data['english'].get('gender', None),
-							'homepage': person_data['english'].get('homepage', None),
-							'imdb_id': person_data['english'].get('imdb_id', None),
-							'known_for_department': person_data['english'].get('known_for_department', None),
-							'name': person_data['english'].get('name', None),
-							'place_of_birth': person_data['english'].get('place_of_birth', None),
-							'popularity': person_data['english'].get('popularity', None),
-							'profile_path': person_data['english'].get('profile_path', None),
-						}
-						for person_data in persons_to_update
-					]
-					# Insérer les valeurs dans Supabase pour tmdb_person en utilisant ON CONFLICT pour l'upsert
-					cursor.executemany("""
-						INSERT INTO tmdb_person (id, adult, also_known_as, birthday, deathday, gender, homepage, imdb_id, known_for_department, name, place_of_birth, popularity, profile_path)
-						VALUES (%(id)s, %(adult)s, %(also_known_as)s, %(birthday)s, %(deathday)s, %(gender)s, %(homepage)s, %(imdb_id)s, %(known_for_department)s, %(name)s, %(place_of_birth)s, %(popularity)s, %(profile_path)s)
-						ON CONFLICT (id) DO UPDATE
-						SET
-							adult = EXCLUDED.adult,
-							also_known_as = EXCLUDED.also_known_as,
-							birthday = EXCLUDED.birthday,
-							deathday = EXCLUDED.deathday,
-							gender = EXCLUDED.gender,
-							homepage = EXCLUDED.homepage,
-							imdb_id = EXCLUDED.imdb_id,
-							known_for_department = EXCLUDED.known_for_department,
-							name = EXCLUDED.name,
-							place_of_birth = EXCLUDED.place_of_birth,
-							popularity = EXCLUDED.popularity,
-							profile_path = EXCLUDED.profile_path
-					""", values_to_insert_person)
-
-					# Construire les valeurs à insérer dans Supabase pour tmdb_person_translation
-					values_to_insert_person_translations = [
-						{
-							'person': person_data['english']['id'],
-							'language': 'en',
-							'biography': person_data['english'].get('biography', None),
-						}
-						for person_data in persons_to_update
-					] + [
-						{
-							'person': person_data['french']['id'],
-							'language': 'fr',
-							'biography': person_data['french'].get('biography', None),
-						}
-						for person_data in persons_to_update
-					]
-
-					# Insérer les valeurs dans Supabase pour tmdb_person_translation en utilisant ON CONFLICT pour l'upsert
-					cursor.executemany("""
-						INSERT INTO tmdb_person_translation (person, language, biography)
-						VALUES (%(person)s, %(language)s, %(biography)s)
-						ON CONFLICT (person, language) DO UPDATE
-						SET biography = EXCLUDED.biography
-					""", values_to_insert_person_translations)
+		# Un upsert par lot ne peut pas toucher deux fois la même ligne : garder un seul détail par id
+		persons_to_update = list({person_data['english']['id']: person_data for person_data in persons_to_update}.values())
 
-					# Valider les modifications
-					connection.commit()
-
-				except Exception as e:
-					# En cas d'erreur, annulez la transaction
-					connection.rollback()
-					print(f"Error uploading TMDB persons in Supabase: {e}")
+		# get_connection() valide la transaction à la sortie du bloc et l'annule si une exception le traverse
+		with get_connection() as connection:
+			with connection.cursor() as cursor:
+				# Construire les valeurs à insérer dans Supabase pour tmdb_person
+				values_to_insert_person = [
+					(
+						person_data['english']['id'],
+						person_data['english'].get('adult', False),
+						person_data['english'].get('also_known_as', []),
+						person_data['english'].get('birthday', None),
+						person_data['english'].get('deathday', None),
+						person_data['english'].get('gender', None),
+						person_data['english'].get('homepage', None),
+						person_data['english'].get('imdb_id', None),
+						person_data['english'].get('known_for_department', None),
+						person_data['english'].get('name', None),
+						person_data['english'].get('place_of_birth', None),
+						person_data['english'].get('popularity', None),
+						person_data['english'].get('profile_path', None),
+					)
+					for person_data in persons_to_update
+				]
+				# Insérer les valeurs dans Supabase pour tmdb_person en utilisant ON CONFLICT pour l'upsert
+				execute_values(cursor, """
+					INSERT INTO tmdb_person (id, adult, also_known_as, birthday, deathday, gender, homepage, imdb_id, known_for_department, name, place_of_birth, popularity, profile_path)
+					VALUES %s
+					ON CONFLICT (id) DO UPDATE
+					SET
+						adult = EXCLUDED.adult,
+						also_known_as = EXCLUDED.also_known_as,
+						birthday = EXCLUDED.birthday,
+						deathday = EXCLUDED.deathday,
+						gender = EXCLUDED.gender,
+						homepage = EXCLUDED.homepage,
+						imdb_id = EXCLUDED.imdb_id,
+						known_for_department = EXCLUDED.known_for_department,
+						name = EXCLUDED.name,
+						place_of_birth = EXCLUDED.place_of_birth,
+						popularity = EXCLUDED.popularity,
+						profile_path = EXCLUDED.profile_path
+				""", values_to_insert_person, page_size=1000)
+
+				# Construire les valeurs à insérer dans Supabase pour tmdb_person_translation
+				values_to_insert_person_translations = [
+					(
+						person_data['english']['id'],
+						'en',
+						person_data['english'].get('biography', None),
+					)
+					for person_data in persons_to_update
+				] + [
+					(
+						person_data['french']['id'],
+						'fr',
+						person_data['french'].get('biography', None),
+					)
+					for person_data in persons_to_update
+				]
+
+				# Insérer les valeurs dans Supabase pour tmdb_person_translation en utilisant ON CONFLICT pour l'upsert
+				execute_values(cursor, """
+					INSERT INTO tmdb_person_translation (person, language, biography)
+					VALUES %s
+					ON CONFLICT (person, language) DO UPDATE
+					SET biography = EXCLUDED.biography
+				""", values_to_insert_person_translations, page_size=1000)
+
+		return True
 
-				finally:
-					# Rétablissez le mode autocommit à True
-					connection.autocommit = True
 	except Exception as e:
 		print(f"Error uploading TMDB persons in Supabase: {e}")
+		return False
 
 def tmdb_update_person_with_daily_export(current_date: datetime, file_name: str = "tmdb_person.csv") :
 	try:
 		print("Starting with TMDB Daily Export")
 		count_added = 0
 		count_deleted = 0
-		tmdb_person_export = get_tmdb_export_ids(type="person", date=current_date)
-		if not tmdb_person_export:
+		tmdb_ids_set = get_tmdb_export_ids(type="person", date=current_date)
+		if not tmdb_ids_set:
 			raise Exception("Error: Unable to retrieve TMDB persons. Skipping update.")
 		
-		supabase_persons = execute_sql_command("SELECT id FROM tmdb_person", fetch_results=True)
-		if not supabase_persons:
-			raise Exception("Error: Unable to retrieve Supabase persons. Skipping update.")
-
-		# Lire le fichier JSON
-		with open(tmdb_person_export, 'r', encoding='utf-8') as file:
-			tmdb_persons = [json.loads(line) for line in file]
+		with get_connection() as connection:
+			# Calculer les différences côté serveur : seuls les ids manquants ou en trop reviennent
+			missing_in_supabase, missing_in_tmdb = get_id_differences(connection, "tmdb_person", tmdb_ids_set)
 
-		# Extraire les IDs des persons du fichier JSON
-		tmdb_ids_set = {person['id'] for person in tmdb_persons}
+			count_deleted = len(missing_in_tmdb)
+			count_added = len(missing_in_supabase)
 
-		# Extraire les IDs des persons dans Supabase
-		supabase_ids_set = {row[0] for row in supabase_persons}
+			if missing_in_tmdb:
+				print(f"Found {len(missing_in_tmdb)} extra persons in Supabase")
+				delete_command = "DELETE FROM tmdb_person WHERE id IN %s"
+				execute_sql_command(delete_command, (tuple(missing_in_tmdb),), conn=connection)
 
-		# Identifier les différences
-		missing_in_supabase = tmdb_ids_set - supabase_ids_set
-		missing_in_tmdb = supabase_ids_set - tmdb_ids_set
-
-		count_deleted = len(missing_in_tmdb)
-		count_added = len(missing_in_supabase)
+		# Ids en base une fois les ids en trop supprimés
+		supabase_ids_set = tmdb_ids_set - missing_in_supabase
 
 		# Créez un fichier CSV avec les persons de Supabase
 		create_csv_file(file_name, supabase_ids_set)
-
-		if missing_in_tmdb:
-			print(f"Found {len(missing_in_tmdb)} extra persons in Supabase")
-			delete_command = "DELETE FROM tmdb_person WHERE id IN %s"
-			execute_sql_command(delete_command, (tuple(missing_in_tmdb),))
-			# Mettre à jour le fichier CSV
-			create_csv_file(file_name, supabase_ids_set - missing_in_tmdb)
-			supabase_ids_set -= missing_in_tmdb
 		
 		if missing_in_supabase:
-			chunks = list(chunked(missing_in_supabase, 500))
-
 			print(f"Found {len(missing_in_supabase)} persons missing in Supabase")
 		
-			for chunk in chunks:
-				# Créer une liste pour stocker les détails des personnes
-				current_persons_to_update = []
-
-				# Use ThreadPoolExecutor to execute tasks in parallel
-				with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-					futures = [executor.submit(get_tmdb_person_details, person_id) for person_id in chunk]
+			# Un seul pool pour tous les chunks, dimensionné sur les clés API plutôt que sur MAX_WORKERS
+			with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+				for chunk in chunked(missing_in_supabase, 500):
+					# Créer une liste pour stocker les détails des personnes
+					current_persons_to_update = []
 
-					for future in futures:
+					for future in as_completed([executor.submit(get_tmdb_person_details, person_id) for person_id in chunk]):
 						person_details = future.result()
 						if person_details is not None:
 							current_persons_to_update.append(person_details)
 		
-				print(f"Found {len(current_persons_to_update)} persons to update")
-			 	# Mettre à jour les persons dans Supabase
-				update_supabase_tmdb_person(current_persons_to_update)
+					print(f"Found {len(current_persons_to_update)} persons to update")
+					# Mettre à jour les persons dans Supabase
+					if not update_supabase_tmdb_person(current_persons_to_update):
+						continue
 
-				# Mettre à jour le fichier CSV
-				chunk_set = set(chunk)
-				create_csv_file(file_name, supabase_ids_set | chunk_set)
-				supabase_ids_set = supabase_ids_set | chunk_set
+					# Mettre à jour le fichier CSV avec les seules persons écrites
+					chunk_set = {person['english']['id'] for person in current_persons_to_update} - supabase_ids_set
+					create_csv_file(file_name, chunk_set, append=True)
+					supabase_ids_set |= chunk_set
 
 		print(f"TMDB update with TMDB Daily Export (added: {count_added}, deleted: {count_deleted}) COMPLETED")
 	
 	except Exception as e:
 		print(f"Error updating TMDB persons with TMDB Daily Export: {e}")
-	finally:
-		if os.path.exists(tmdb_person_export):
-			os.remove(tmdb_person_export)
 
 def tmdb_update_person_with_changes_list(current_date: datetime, file_name: str = "tmdb_person.csv"):
 	try:
@@ -1073,53 +1256,39 @@ def tmdb_update_person_with_changes_list(current_date: datetime, file_name: str
 		count_updated = 0
 		last_update = execute_sql_command("SELECT MAX(date) FROM tmdb_update_logs WHERE type = 'person' AND success = TRUE", fetch_results=True)[0][0]
 
-		current_page = 1
-		persons_to_update = []
-		supabase_ids_set = load_csv_file(file_name)
+		supabase_ids_set = set(load_csv_file(file_name))
 
 		print(f"Curent date: {current_date}")
 		print(f"Last update: {last_update}")
 
-		while True:
-			# Récupérer les changements de personne pour la page actuelle
-			changed_persons_response = get_tmdb_data(url=f"https://api.themoviedb.org/3/person/changes", params={"page": current_page, "start_date": last_update, "end_date": current_date.strftime("%Y-%m-%d")})
-			if not changed_persons_response:
-				raise Exception("Error: Unable to retrieve TMDB changed persons. Skipping update.")
+		def flush_persons(persons: list):
+			if not update_supabase_tmdb_person(persons):
+				return
+			# N'ajouter au fichier que les ids absents, au lieu de le réécrire en entier
+			chunk_set = {person['english']['id'] for person in persons} - supabase_ids_set
+			create_csv_file(file_name, chunk_set, append=True)
+			supabase_ids_set.update(chunk_set)
+
+		# Lister les pages au fur et à mesure que les détails sont consommés
+		def changed_persons_args():
+			nonlocal count_updated
+			current_page = 1
+			while True:
+				# Récupérer les changements de personne pour la page actuelle
+				changed_persons_response = get_tmdb_data(url=f"https://api.themoviedb.org/3/person/changes", params={"page": current_page, "start_date": last_update, "end_date": current_date.strftime("%Y-%m-%d")})
+				if not changed_persons_response:
+					raise Exception("Error: Unable to retrieve TMDB changed persons. Skipping update.")
 			
-			changed_persons = changed_persons_response["results"]
-			if not changed_persons or not len(changed_persons):
-				break
-
-			count_updated += len(changed_persons)
-
-			# Use ThreadPoolExecutor to execute tasks in parallel
-			with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-				futures = [executor.submit(get_tmdb_person_details, person['id']) for person in changed_persons]
+				changed_persons = changed_persons_response["results"]
+				if not changed_persons or not len(changed_persons):
+					return
 
-				for future in futures:
-					person_details = future.result()
-					if person_details is not None:
-						persons_to_update.append(person_details)
+				count_updated += len(changed_persons)
+				yield from ((person['id'],) for person in changed_persons)
 			
-			if current_page % 2 == 0:
-				# Batch update every 2 pages
-				if len(persons_to_update):
-					update_supabase_tmdb_person(persons_to_update)
-					# Mettre à jour le fichier CSV
-					chunk_set = set([person['english']['id'] for person in persons_to_update])
-					create_csv_file(file_name, supabase_ids_set | chunk_set)
-					supabase_ids_set = supabase_ids_set | chunk_set
-
-				persons_to_update = []
-			
-			current_page += 1
+				current_page += 1
 
-		if len(persons_to_update):
-			update_supabase_tmdb_person(persons_to_update)
-			# Mettre à jour le fichier CSV
-			chunk_set = set([person['english']['id'] for person in persons_to_update])
-			create_csv_file(file_name, supabase_ids_set | chunk_set)
-			supabase_ids_set = supabase_ids_set | chunk_set
+		fetch_and_flush(changed_persons_args(), get_tmdb_person_details, flush_persons, PERSONS_PER_FLUSH)
 
 		print(f"TMDB update with TMDB Changes List (updated: {count_updated}) COMPLETED")
 	except Exception as e:
@@ -1133,7 +1302,7 @@ def tmdb_update_person(current_date: datetime, file_name: str = "tmdb_person.csv
 		tmdb_update_person_with_changes_list(current_date, file_name=file_name)
 
 		# Ajouter un log dans la table supabase tmdb_update_logs
-		supabase_tmdb_update_log(current_date, True, 'person')
+		supabase_tmdb_update_log(None, None, current_date, True, 'person')
 
 		print("TMDB update persons COMPLETED")
 	
@@ -1141,424 +1310,265 @@ def tmdb_update_person(current_date: datetime, file_name: str = "tmdb_person.csv
 		print(f"Error updating TMDB persons: {e}")
 
 		# Ajouter un log dans la table supabase tmdb_update_logs
-		supabase_tmdb_update_log(current_date, False, 'person')
+		supabase_tmdb_update_log(None, None, current_date, False, 'person')
 # ========== END TMDB PERSON ========== #
 
 # ========== START TMDB MOVIE ========== #
-def get_tmdb_movie_details(movie_id: int) -> dict:
-	global api_key_index
-	url_fr = f"https://api.themoviedb.org/3/movie/{movie_id}?api_key={tmdb_api_keys[api_key_index]}&language=fr-FR&append_to_response=credits,keywords,videos,belongs_to_collection"
-	url_en = f"https://api.themoviedb.org/3/movie/{movie_id}?api_key={tmdb_api_keys[api_key_index]}&language=en-US&append_to_response=credits,keywords,videos,belongs_to_collection"
+def get_tmdb_movie_details(movie_id: int, etag: str = None) -> dict:
+	api_key = next_api_key()
+	# Une seule requête : la version française vient des traductions et des images fr, les vidéos en et fr sont demandées ensemble
+	url_en = f"https://api.themoviedb.org/3/movie/{movie_id}?api_key={api_key}&language=en-US&append_to_response=credits,keywords,videos,belongs_to_collection,translations,images&include_video_language=en,fr&include_image_language=fr,null"
 	
-	response_en = requests.get(url_en)
-	response_fr = requests.get(url_fr)
-
-	details_en = response_en.json()
-	details_fr = response_fr.json()
+	response_en = tmdb_get(url_en, headers={"If-None-Match": etag} if etag else None)
 
-	# Vérifier si la clé 'success' existe et a la valeur False dans 'english' ou 'french'
-	if ('success' in details_en and not details_en['success']) or ('success' in details_fr and not details_fr['success']):
-		print(f"La récupération des détails du film {movie_id} a échoué.")
+	# Réponse identique à celle déjà écrite : rien à mettre à jour
+	if response_en.status_code == 304:
 		return None
 
-	api_key_index = (api_key_index + 1) % len(tmdb_api_keys)
+	details_en = orjson.loads(response_en.content)
 
-	return {"french": details_fr, "english": details_en}
+	# Vérifier si la clé 'success' existe et a la valeur False
+	if ('success' in details_en and not details_en['success']):
+		print(f"La récupération des détails du film {movie_id} a échoué.")
+		return None
 
-def update_supabase_tmdb_movie(movies_to_update: list):
+	translation_fr = get_french_translation(details_en)
+	details_fr = {
+		'id': details_en['id'],
+		'overview': translation_fr.get('overview', ''),
+		# Les traductions ne contiennent pas d'affiche : prendre la première affiche fr, sinon celle de la réponse en
+		'poster_path': next(
+			(poster.get('file_path') for poster in details_en.get('images', {}).get('posters', []) if poster.get('iso_639_1') == 'fr'),
+			details_en.get('poster_path', None)
+		),
+		'tagline': translation_fr.get('tagline', ''),
+		'title': translation_fr.get('title') or details_en.get('title', None),
+		# Les vidéos fr sont filtrées par iso_639_1 à l'insertion
+		'videos': details_en.get('videos', {}),
+	}
+
+	return {"french": details_fr, "english": details_en, "etag": response_en.headers.get('ETag')}
+
+# Ids connus en base pour les tables liées aux films, chargés une fois par mise à jour et non par lot
+def load_movie_csv_data() -> dict:
+	csv_data = {}
+	csv_data['language']= load_csv_file('tmdb_language.csv')
+	csv_data['country'] = load_csv_file('tmdb_country.csv')
+	csv_data['genre'] = load_csv_file('tmdb_genre.csv')
+	csv_data['keyword'] = load_csv_file('tmdb_keyword.csv')
+	csv_data['collection'] = load_csv_file('tmdb_collection.csv')
+	csv_data['company'] = load_csv_file('tmdb_company.csv')
+	csv_data['person'] = load_csv_file('tmdb_person.csv')
+	return csv_data
+
+def update_supabase_tmdb_movie(movies_to_update: list, csv_data: dict):
 	try:
-		csv_data = {}
-		csv_data['language']= load_csv_file('tmdb_language.csv')
-		csv_data['country'] = load_csv_file('tmdb_country.csv')
-		csv_data['genre'] = load_csv_file('tmdb_genre.csv')
-		csv_data['keyword'] = load_csv_file('tmdb_keyword.csv')
-		csv_data['collection'] = load_csv_file('tmdb_collection.csv')
-		csv_data['company'] = load_csv_file('tmdb_company.csv')
-		csv_data['person'] = load_csv_file('tmdb_person.csv')
-
-		with psycopg2.connect(supabase_connection_string) as connection:
+		# Un upsert par lot ne peut pas toucher deux fois la même ligne : garder un seul détail par id
+		movies_to_update = list({movie_data['english']['id']: movie_data for movie_data in movies_to_update}.values())
+
+		# Construire les valeurs de toutes les tables en un seul passage sur les films
+		values_to_insert_movie = []
+		values_to_insert_movie_translations = []
+		values_to_insert_movie_countries = []
+		values_to_insert_movie_credits = []
+		values_to_insert_movie_roles = []
+		values_to_insert_movie_genres = []
+		values_to_insert_movie_keywords = []
+		values_to_insert_movie_languages = []
+		values_to_insert_movie_production = []
+		values_to_insert_movie_videos = []
+		values_to_insert_movie_etags = []
+
+		for movie_data in movies_to_update:
+			en = movie_data['english']
+			fr = movie_data['french']
+			movie_id = en['id']
+			collection = en.get('belongs_to_collection')
+			credits_data = en.get('credits', {})
+
+			# tmdb_movie
+			values_to_insert_movie.append((
+				movie_id,
+				en.get('adult', False),
+				en.get('backdrop_path', None),
+				en.get('budget', None),
+				en.get('homepage', None),
+				en.get('imdb_id', None),
+				en.get('original_language', None),
+				en.get('original_title', None),
+				en.get('popularity', None),
+				None if en.get('release_date') == '' else en.get('release_date', None),
+				en.get('revenue', None),
+				en.get('runtime', None),
+				en.get('status', None),
+				en.get('vote_average', None),
+				en.get('vote_count', None),
+				collection['id'] if collection and collection['id'] in csv_data['collection'] else None,
+			))
+
+			# tmdb_movie_etags
+			if movie_data.get('etag'):
+				values_to_insert_movie_etags.append((movie_id, movie_data['etag']))
+
+			# tmdb_movie_translation
+			values_to_insert_movie_translations.append((movie_id, 'en', en.get('overview', None), en.get('poster_path', None), en.get('tagline', None), en.get('title', None)))
+			values_to_insert_movie_translations.append((movie_id, 'fr', fr.get('overview', None), fr.get('poster_path', None), fr.get('tagline', None), fr.get('title', None)))
+
+			# tmdb_movie_country
+			values_to_insert_movie_countries.extend(
+				(movie_id, country_data['iso_3166_1'])
+				for country_data in en.get('production_countries', [])
+				if country_data['iso_3166_1'] in csv_data['country']
+			)
+
+			if credits_data:
+				# tmdb_movie_credits et tmdb_movie_role : le rôle d'un acteur vient du même passage que son crédit
+				for actor in credits_data.get('cast', []):
+					if isinstance(actor, dict) and actor.get('id') in csv_data['person']:
+						credit_id = actor.get('credit_id', None)
+						values_to_insert_movie_credits.append((credit_id, movie_id, actor.get('id', None), 'Acting', 'Actor'))
+						values_to_insert_movie_roles.append((credit_id, actor.get('character', None), actor.get('order', None)))
+
+				values_to_insert_movie_credits.extend(
+					(
+						crew_member.get('credit_id', None),
+						movie_id,
+						crew_member.get('id', None),
+						crew_member.get('department', None),
+						crew_member.get('job', None),
+					)
+					for crew_member in credits_data.get('crew', [])
+					if isinstance(crew_member, dict) and crew_member.get('id') in csv_data['person']
+				)
+
+			# tmdb_movie_genre
+			values_to_insert_movie_genres.extend(
+				(movie_id, genre.get('id', None))
+				for genre in en.get('genres', [])
+				if isinstance(genre, dict) and genre.get('id') in csv_data['genre']
+			)
+
+			# tmdb_movie_keyword
+			values_to_insert_movie_keywords.extend(
+				(movie_id, keyword.get('id', None))
+				for keyword in en.get('keywords', {}).get('keywords', [])
+				if isinstance(keyword, dict) and keyword.get('id') in csv_data['keyword']
+			)
+
+			# tmdb_movie_language
+			values_to_insert_movie_languages.extend(
+				(movie_id, language.get('iso_639_1', None))
+				for language in en.get('spoken_languages', [])
+				if isinstance(language, dict) and language.get('iso_639_1') in csv_data['language']
+			)
+
+			# tmdb_movie_production
+			values_to_insert_movie_production.extend(
+				(movie_id, company.get('id', None))
+				for company in en.get('production_companies', [])
+				if isinstance(company, dict) and company.get('id') in csv_data['company']
+			)
+
+			# tmdb_movie_videos : uniquement les vidéos de type "Teaser" ou "Trailer", en et fr
+			# Les vidéos en et fr arrivent dans la même réponse (include_video_language=en,fr) : un seul passage filtre et projette
+			values_to_insert_movie_videos.extend(
+				(
+					video.get('id', None),
+					movie_id,
+					video.get('iso_639_1', None),
+					video.get('iso_3166_1', None),
+					video.get('name', None),
+					video.get('key', None),
+					video.get('site', None),
+					video.get('size', None),
+					video.get('type', None),
+					video.get('official', False),
+				)
+				for video in en.get('videos', {}).get('results', [])
+				if isinstance(video, dict) and video.get('iso_639_1') in ('en', 'fr') and video.get('type') in ('Teaser', 'Trailer')
+			)
+
+		# Retirer les doublons avant l'envoi : chacun coûte sinon un tuple transmis et une sonde d'index pour rien
+		values_to_insert_movie_credits = unique_rows(values_to_insert_movie_credits, key=lambda row: row[0])
+		values_to_insert_movie_roles = unique_rows(values_to_insert_movie_roles, key=lambda row: row[0])
+		values_to_insert_movie_countries = unique_rows(values_to_insert_movie_countries)
+		values_to_insert_movie_genres = unique_rows(values_to_insert_movie_genres)
+		values_to_insert_movie_keywords = unique_rows(values_to_insert_movie_keywords)
+		values_to_insert_movie_languages = unique_rows(values_to_insert_movie_languages)
+		values_to_insert_movie_production = unique_rows(values_to_insert_movie_production)
+		values_to_insert_movie_videos = unique_rows(values_to_insert_movie_videos, key=lambda row: row[0])
+
+		# get_connection() valide la transaction à la sortie du bloc et l'annule si une exception le traverse
+		with get_connection() as connection:
 			with connection.cursor() as cursor:
-				try:
-					# Démarrez la transaction
-					connection.autocommit = False
-
-					# ========== START TMDB_MOVIE ========== #
-					# Construire les valeurs à insérer dans Supabase pour tmdb_movie
-					values_to_insert_movie = [
-						{
-							'id': movie_data['english']['id'],
-							'adult': movie_data['english'].get('adult', False),
-							'backdrop_path': movie_data['english'].get('backdrop_path', None),
-							'budget': movie_data['english'].get('budget', None),
-							'homepage': movie_data['english'].get('homepage', None),
-							'imdb_id': movie_data['english'].get('imdb_id', None),
-							'original_language': movie_data['english'].get('original_language', None),
-							'original_title': movie_data['english'].get('original_title', None),
-							'popularity': movie_data['english'].get('popularity', None),
-							'release_date': None if movie_data['english'].get('release_date') == '' else movie_data['english'].get('release_date', None),
-							'revenue': movie_data['english'].get('revenue', None),
-							'runtime': movie_data['english'].get('runtime', None),
-							'status': movie_data['english'].get('status', None),
-							'vote_average': movie_data['english'].get('vote_average', None),
-							'vote_count': movie_data['english'].get('vote_count', None),
-							'collection_id': movie_data['english']['belongs_to_collection']['id'] if movie_data['english'].get('belongs_to_collection') and movie_data['english']['belongs_to_collection']['id'] in csv_data['collection'] else None,						}
-						for movie_data in movies_to_update
-					]
-
-					# Insérer les valeurs dans Supabase pour tmdb_movie en utilisant ON CONFLICT pour l'upsert
-					cursor.executemany("""
-						INSERT INTO tmdb_movie (id, adult, backdrop_path, budget, homepage, imdb_id, original_language, original_title, popularity, release_date, revenue, runtime, status, vote_average, vote_count, collection_id)
-						VALUES (%(id)s, %(adult)s, %(backdrop_path)s, %(budget)s, %(homepage)s, %(imdb_id)s, %(original_language)s, %(original_title)s, %(popularity)s, %(release_date)s, %(revenue)s, %(runtime)s, %(status)s, %(vote_average)s, %(vote_count)s, %(collection_id)s)
-						ON CONFLICT (id) DO UPDATE
-						SET
-							adult = EXCLUDED.adult,
-							backdrop_path = EXCLUDED.backdrop_path,
-							budget = EXCLUDED.budget,
-							homepage = EXCLUDED.homepage,
-							imdb_id = EXCLUDED.imdb_id,
-							original_language = EXCLUDED.original_language,
-							original_title = EXCLUDED.original_title,
-							popularity = EXCLUDED.popularity,
-							release_date = EXCLUDED.release_date,
-							revenue = EXCLUDED.revenue,
-							runtime = EXCLUDED.runtime,
-							status = EXCLUDED.status,
-							vote_average = EXCLUDED.vote_average,
-							vote_count = EXCLUDED.vote_count,
-							collection_id = EXCLUDED.collection_id
-					""", values_to_insert_movie)
-					
-					# ========== END TMDB_MOVIE ========== #
-
-					# ========== START TMDB_MOVIE_TRANSLATION ========== #
-					# Construire les valeurs à insérer dans Supabase pour tmdb_movie_translation
-					values_to_insert_movie_translations = [
-						{
-							'movie_id': movie_data['english']['id'],
-							'language_id': 'en',
-							'overview': movie_data['english'].get('overview', None),
-							'poster_path': movie_data['english'].get('poster_path', None),
-							'tagline': movie_data['english'].get('tagline', None),
-							'title': movie_data['english'].get('title', None),
-						}
-						for movie_data in movies_to_update
-					] + [
-						{
-							'movie_id': movie_data['french']['id'],
-							'language_id': 'fr',
-							'overview': movie_data['french'].get('overview', None),
-							'poster_path': movie_data['french'].get('poster_path', None),
-							'tagline': movie_data['french'].get('tagline', None),
-							'title': movie_data['french'].get('title', None),
-						}
-						for movie_data in movies_to_update
-					]
-
-					# Insérer les valeurs dans Supabase pour tmdb_movie_translation en utilisant ON CONFLICT pour l'upsert
-					cursor.executemany("""
-						INSERT INTO tmdb_movie_translation (movie_id, language_id, overview, poster_path, tagline, title)
-						VALUES (%(movie_id)s, %(language_id)s, %(overview)s, %(poster_path)s, %(tagline)s, %(title)s)
-						ON CONFLICT (movie_id, language_id) DO UPDATE
-						SET
-							overview = EXCLUDED.overview,
-							poster_path = EXCLUDED.poster_path,
-							tagline = EXCLUDED.tagline,
-							title = EXCLUDED.title
-					""", values_to_insert_movie_translations)
-
-					# ========== END TMDB_MOVIE_TRANSLATION ========== #
-			
-					# ========== START TMDB_MOVIE_COUNTRY ========== #
-					# Construire les valeurs à insérer dans Supabase pour tmdb_movie_country
-					values_to_insert_movie_countries = [
-						{
-							'movie_id': movie_data['english']['id'],
-							'country_id': country_data['iso_3166_1'],
-						}
-						for movie_data in movies_to_update
-						for country_data in movie_data.get('english', {}).get('production_countries', [])
-						if country_data['iso_3166_1'] in csv_data['country']
-					]
-
-					# Insérer les valeurs dans Supabase pour tmdb_movie_country en utilisant ON CONFLICT pour l'upsert
-					cursor.executemany("""
-						INSERT INTO tmdb_movie_country (movie_id, country_id)
-						VALUES (%(movie_id)s, %(country_id)s)
-						ON CONFLICT (movie_id, country_id) DO NOTHING
-					""", values_to_insert_movie_countries)
-					
-					# ========== END TMDB_MOVIE_COUNTRY ========== #
-
-					# ========== START TMDB_MOVIE_CREDIT ========== #
-					# Construire les valeurs à insérer dans Supabase pour tmdb_movie_credits
-					values_to_insert_movie_credits = []
-					for movie_data in movies_to_update:
-						movie_id = movie_data['english']['id']
-						credits_data = movie_data.get('english', {}).get('credits', {})
-						
-						if credits_data:
-							cast = credits_data.get('cast', [])
-							crew = credits_data.get('crew', [])
-
-							# Traitement pour le cast
-							values_cast = [
-								{
-									'id': actor.get('credit_id', None) if isinstance(actor, dict) else None,
-									'movie_id': movie_id,
-									'person_id': actor.get('id', None) if isinstance(actor, dict) else None,
-									'department': 'Acting',
-									'job': 'Actor'
-								}
-								for actor in cast
-								if isinstance(actor, dict) and actor.get('id') in csv_data['person']
-							]
-
-							# Traitement pour le crew
-							values_crew = [
-								{
-									'id': crew_member.get('credit_id', None) if isinstance(crew_member, dict) else None,
-									'movie_id': movie_id,
-									'person_id': crew_member.get('id', None) if isinstance(crew_member, dict) else None,
-									'department': crew_member.get('department', None) if isinstance(crew_member, dict) else None,
-									'job': crew_member.get('job', None) if isinstance(crew_member, dict) else None
-								}
-								for crew_member in crew
-								if isinstance(crew_member, dict) and crew_member.get('id') in csv_data['person']
-							]
-
-							# Concaténer les valeurs pour avoir une seule liste de crédits
-							values_to_insert_movie_credits.extend(values_cast)
-							values_to_insert_movie_credits.extend(values_crew)
-
-					# Insérer les valeurs dans Supabase pour tmdb_movie_credits en utilisant ON CONFLICT pour l'upsert
-					cursor.executemany("""
-						INSERT INTO tmdb_movie_credits (id, movie_id, person_id, department, job)
-						VALUES (%(id)s, %(movie_id)s, %(person_id)s, %(department)s, %(job)s)
-						ON CONFLICT (id) DO NOTHING
-					""", values_to_insert_movie_credits)
-					
-					# ========== END TMDB_MOVIE_CREDIT ========== #
-
-					# ========== START TMDB_MOVIE_ROLE ========== #
-					values_to_insert_movie_roles = []
-					for movie_data in movies_to_update:
-						credits_data = movie_data.get('english', {}).get('credits', {})
-						
-						if credits_data:
-							cast = credits_data.get('cast', [])
-
-							# Traitement pour les rôles
-							values_roles = []
-							for actor in cast:
-								if isinstance(actor, dict):
-									credit_id = actor.get('credit_id', None)
-									if credit_id in [credit['id'] for credit in values_to_insert_movie_credits]:
-										values_roles.append({
-											'credit_id': credit_id,
-											'character': actor.get('character', None),
-											'order': actor.get('order', None),
-										})
-
-							# Concaténer les valeurs pour avoir une seule liste de rôles
-							values_to_insert_movie_roles.extend(values_roles)
-							
-					# Insérer les valeurs dans Supabase pour tmdb_movie_role en utilisant ON CONFLICT pour l'upsert
-					cursor.executemany("""
-						INSERT INTO tmdb_movie_role (credit_id, character, "order")
-						VALUES (%(credit_id)s, %(character)s, %(order)s)
-						ON CONFLICT (credit_id) DO NOTHING
-					""", values_to_insert_movie_roles)
-					
-					# ========== END TMDB_MOVIE_ROLE ========== #
-
-					# ========== START TMDB_MOVIE_GENRE ========== #
-					# Construire les valeurs à insérer dans Supabase pour tmdb_movie_genre
-					values_to_insert_movie_genres = []
-
-					for movie_data in movies_to_update:
-						genres_data = movie_data.get('english', {}).get('genres', [])
-
-						# Traitement pour les genres
-						values_genres = [
-							{
-								'movie_id': movie_data['english']['id'],
-								'genre_id': genre.get('id', None) if isinstance(genre, dict) else None,
-							}
-							for genre in genres_data
-							if isinstance(genre, dict) and genre.get('id') in csv_data['genre']
-						]
-
-						# Concaténer les valeurs pour avoir une seule liste de genres
-						values_to_insert_movie_genres.extend(values_genres)
-						
-					# Insérer les valeurs dans Supabase pour tmdb_movie_genre en utilisant ON CONFLICT pour l'upsert
-					cursor.executemany("""
-						INSERT INTO tmdb_movie_genre (movie_id, genre_id)
-						VALUES (%(movie_id)s, %(genre_id)s)
-						ON CONFLICT (movie_id, genre_id) DO NOTHING
-					""", values_to_insert_movie_genres)
-					
-					# ========== END TMDB_MOVIE_GENRE ========== #
-
-					# ========== START TMDB_MOVIE_KEYWORD ========== #
-					# Construire les valeurs à insérer dans Supabase pour tmdb_movie_keyword
-					values_to_insert_movie_keywords = []
-
-					for movie_data in movies_to_update:
-						keywords_data = movie_data.get('english', {}).get('keywords', [])
-
-						# Traitement pour les mots-clés
-						values_keywords = [
-							{
-								'movie_id': movie_data['english']['id'],
-								'keyword_id': keyword.get('id', None) if isinstance(keyword, dict) else keyword.get('id', None),
-							}
-							for keyword in keywords_data.get('keywords', [])
-							if isinstance(keyword, dict) and keyword.get('id') in csv_data['keyword']
-						]
-
-						# Concaténer les valeurs pour avoir une seule liste de mots-clés
-						values_to_insert_movie_keywords.extend(values_keywords)
-						
-					# Insérer les valeurs dans Supabase pour tmdb_movie_keyword en utilisant ON CONFLICT pour l'upsert
-					cursor.executemany("""
-						INSERT INTO tmdb_movie_keyword (movie_id, keyword_id)
-						VALUES (%(movie_id)s, %(keyword_id)s)
-						ON CONFLICT (movie_id, keyword_id) DO NOTHING
-					""", values_to_insert_movie_keywords)
-					
-					# ========== END TMDB_MOVIE_KEYWORD ========== #
-
-					# ========== START TMDB_MOVIE_LANGUAGE ========== #
-					# Construire les valeurs à insérer dans Supabase pour tmdb_movie_language
-					values_to_insert_movie_languages = []
-
-					for movie_data in movies_to_update:
-						languages_data = movie_data.get('english', {}).get('spoken_languages', [])
-
-						# Traitement pour les langues
-						values_languages = [
-							{
-								'movie_id': movie_data['english']['id'],
-								'language_id': language.get('iso_639_1', None) if isinstance(language, dict) else None,
-							}
-							for language in languages_data
-							if isinstance(language, dict) and language.get('iso_639_1') in csv_data['language']
-						]
-
-						# Concaténer les valeurs pour avoir une seule liste de langues
-						values_to_insert_movie_languages.extend(values_languages)
-						
-					# Insérer les valeurs dans Supabase pour tmdb_movie_language en utilisant ON CONFLICT pour l'upsert
-					cursor.executemany("""
-						INSERT INTO tmdb_movie_language (movie_id, language_id)
-						VALUES (%(movie_id)s, %(language_id)s)
-						ON CONFLICT (movie_id, language_id) DO NOTHING
-					""", values_to_insert_movie_languages)
-					
-					# ========== END TMDB_MOVIE_LANGUAGE ========== #
-
-					# ========== START TMDB_MOVIE_PRODUCTION ========== #
-					# Construire les valeurs à insérer dans Supabase pour tmdb_movie_production
-					values_to_insert_movie_production = []
-
-					for movie_data in movies_to_update:
-						production_companies_data = movie_data.get('english', {}).get('production_companies', [])
-
-						# Traitement pour les sociétés de production
-						values_production = [
-							{
-								'movie_id': movie_data['english']['id'],
-								'company_id': company.get('id', None) if isinstance(company, dict) else None,
-							}
-							for company in production_companies_data
-							if isinstance(company, dict) and company.get('id') in csv_data['company']
-						]
-
-						# Concaténer les valeurs pour avoir une seule liste de sociétés de production
-						values_to_insert_movie_production.extend(values_production)
-
-					# Insérer les valeurs dans Supabase pour tmdb_movie_production en utilisant ON CONFLICT pour l'upsert
-					cursor.executemany("""
-						INSERT INTO tmdb_movie_production (movie_id, company_id)
-						VALUES (%(movie_id)s, %(company_id)s)
-						ON CONFLICT (movie_id, company_id) DO NOTHING
-					""", values_to_insert_movie_production)
-
-					# ========== END TMDB_MOVIE_PRODUCTION ========== #
-
-					# ========== START TMDB_MOVIE_VIDEOS========== #
-					# Construire les valeurs à insérer dans Supabase pour tmdb_movie_videos
-					values_to_insert_movie_videos = []
-
-					for movie_data in movies_to_update:
-						videos_data_en = movie_data.get('english', {}).get('videos', {}).get('results', [])
-						videos_data_fr = movie_data.get('french', {}).get('videos', {}).get('results', [])
-
-						# Filtrer les vidéos pour ne prendre que celles de type "Teaser" ou "Trailer"
-						videos_en = [video for video in videos_data_en if video.get('iso_639_1') == 'en' and (video.get('type') == 'Teaser' or video.get('type') == 'Trailer')]
-						videos_fr = [video for video in videos_data_fr if video.get('iso_639_1') == 'fr' and (video.get('type') == 'Teaser' or video.get('type') == 'Trailer')]
-
-						# Traitement pour les vidéos en anglais
-						values_videos_en = [
-							{
-								'id': video.get('id', None) if isinstance(video, dict) else None,
-								'movie_id': movie_data['english']['id'],
-								'iso_639_1': video.get('iso_639_1', None) if isinstance(video, dict) else None,
-								'iso_3166_1': video.get('iso_3166_1', None) if isinstance(video, dict) else None,
-								'name': video.get('name', None) if isinstance(video, dict) else None,
-								'key': video.get('key', None) if isinstance(video, dict) else None,
-								'site': video.get('site', None) if isinstance(video, dict) else None,
-								'size': video.get('size', None) if isinstance(video, dict) else None,
-								'type': video.get('type', None) if isinstance(video, dict) else None,
-								'official': video.get('official', False) if isinstance(video, dict) else False,
-							}
-							for video in videos_en
-						]
-
-						# Traitement pour les vidéos en français
-						values_videos_fr = [
-							{
-								'id': video.get('id', None) if isinstance(video, dict) else None,
-								'movie_id': movie_data['french']['id'],
-								'iso_639_1': video.get('iso_639_1', None) if isinstance(video, dict) else None,
-								'iso_3166_1': video.get('iso_3166_1', None) if isinstance(video, dict) else None,
-								'name': video.get('name', None) if isinstance(video, dict) else None,
-								'key': video.get('key', None) if isinstance(video, dict) else None,
-								'site': video.get('site', None) if isinstance(video, dict) else None,
-								'size': video.get('size', None) if isinstance(video, dict) else None,
-								'type': video.get('type', None) if isinstance(video, dict) else None,
-								'official': video.get('official', False) if isinstance(video, dict) else False,
-							}
-							for video in videos_fr
-						]
-
-						# Concaténer les valeurs pour avoir une seule liste de vidéos
-						values_to_insert_movie_videos.extend(values_videos_en)
-						values_to_insert_movie_videos.extend(values_videos_fr)
-						
-					# Insérer les valeurs dans Supabase pour tmdb_movie_videos en utilisant ON CONFLICT pour l'upsert
-					cursor.executemany("""
-						INSERT INTO tmdb_movie_videos (id, movie_id, iso_639_1, iso_3166_1, name, key, site, size, type, official)
-						VALUES (%(id)s, %(movie_id)s, %(iso_639_1)s, %(iso_3166_1)s, %(name)s, %(key)s, %(site)s, %(size)s, %(type)s, %(official)s)
-						ON CONFLICT (id) DO NOTHING
-					""", values_to_insert_movie_videos)		
-					
-					# ========== END TMDB_MOVIE_VIDEOS========== #
-
-					# Valider les modifications
-					connection.commit()
-
-					print(f"Successfully updated {len(movies_to_update)} movies in Supabase")
-
-				except Exception as e:
-					# En cas d'erreur, annulez la transaction
-					connection.rollback()
-					print(f"Error uploading TMDB movies in Supabase: {e}")
-
-				finally:
-					# Rétablissez le mode autocommit à True
-					connection.autocommit = True
+				# ========== START TMDB_MOVIE ========== #
+				# Insérer les valeurs dans Supabase pour tmdb_movie via COPY dans une table temporaire, avec ON CONFLICT pour l'upsert
+				movie_columns = ["id", "adult", "backdrop_path", "budget", "homepage", "imdb_id", "original_language", "original_title", "popularity", "release_date", "revenue", "runtime", "status", "vote_average", "vote_count", "collection_id"]
+				copy_upsert(cursor, "tmdb_movie", movie_columns, values_to_insert_movie, ["id"], movie_columns[1:])
+				
+				# ========== END TMDB_MOVIE ========== #
+
+				# ========== START TMDB_MOVIE_TRANSLATION ========== #
+				# Insérer les valeurs dans Supabase pour tmdb_movie_translation via COPY dans une table temporaire, avec ON CONFLICT pour l'upsert
+				copy_upsert(cursor, "tmdb_movie_translation", ["movie_id", "language_id", "overview", "poster_path", "tagline", "title"], values_to_insert_movie_translations, ["movie_id", "language_id"], ["overview", "poster_path", "tagline", "title"])
+
+				# ========== END TMDB_MOVIE_TRANSLATION ========== #
+		
+				# ========== START TMDB_MOVIE_COUNTRY ========== #
+				# Insérer les valeurs dans Supabase pour tmdb_movie_country via COPY dans une table temporaire, en ignorant les liens existants
+				copy_upsert(cursor, "tmdb_movie_country", ["movie_id", "country_id"], values_to_insert_movie_countries, ["movie_id", "country_id"])
+				
+				# ========== END TMDB_MOVIE_COUNTRY ========== #
+
+				# ========== START TMDB_MOVIE_CREDIT ========== #
+				# Insérer les valeurs dans Supabase pour tmdb_movie_credits via COPY dans une table temporaire, en ignorant les crédits existants
+				copy_upsert(cursor, "tmdb_movie_credits", ["id", "movie_id", "person_id", "department", "job"], values_to_insert_movie_credits, ["id"])
+				
+				# ========== END TMDB_MOVIE_CREDIT ========== #
+
+				# ========== START TMDB_MOVIE_ROLE ========== #
+				# Insérer les valeurs dans Supabase pour tmdb_movie_role via COPY dans une table temporaire, en ignorant les rôles existants
+				copy_upsert(cursor, "tmdb_movie_role", ["credit_id", "character", '"order"'], values_to_insert_movie_roles, ["credit_id"])
+				
+				# ========== END TMDB_MOVIE_ROLE ========== #
+
+				# ========== START TMDB_MOVIE_GENRE ========== #
+				# Insérer les valeurs dans Supabase pour tmdb_movie_genre via COPY dans une table temporaire, en ignorant les liens existants
+				copy_upsert(cursor, "tmdb_movie_genre", ["movie_id", "genre_id"], values_to_insert_movie_genres, ["movie_id", "genre_id"])
+				
+				# ========== END TMDB_MOVIE_GENRE ========== #
+
+				# ========== START TMDB_MOVIE_KEYWORD ========== #
+				# Insérer les valeurs dans Supabase pour tmdb_movie_keyword via COPY dans une table temporaire, en ignorant les liens existants
+				copy_upsert(cursor, "tmdb_movie_keyword", ["movie_id", "keyword_id"], values_to_insert_movie_keywords, ["movie_id", "keyword_id"])
+				
+				# ========== END TMDB_MOVIE_KEYWORD ========== #
+
+				# ========== START TMDB_MOVIE_LANGUAGE ========== #
+				# Insérer les valeurs dans Supabase pour tmdb_movie_language via COPY dans une table temporaire, en ignorant les liens existants
+				copy_upsert(cursor, "tmdb_movie_language", ["movie_id", "language_id"], values_to_insert_movie_languages, ["movie_id", "language_id"])
+				
+				# ========== END TMDB_MOVIE_LANGUAGE ========== #
+
+				# ========== START TMDB_MOVIE_PRODUCTION ========== #
+				# Insérer les valeurs dans Supabase pour tmdb_movie_production via COPY dans une table temporaire, en ignorant les liens existants
+				copy_upsert(cursor, "tmdb_movie_production", ["movie_id", "company_id"], values_to_insert_movie_production, ["movie_id", "company_id"])
+
+				# ========== END TMDB_MOVIE_PRODUCTION ========== #
+
+				# ========== START TMDB_MOVIE_VIDEOS========== #
+				# Insérer les valeurs dans Supabase pour tmdb_movie_videos via COPY dans une table temporaire, en ignorant les vidéos existantes
+				copy_upsert(cursor, "tmdb_movie_videos", ["id", "movie_id", "iso_639_1", "iso_3166_1", "name", "key", "site", "size", "type", "official"], values_to_insert_movie_videos, ["id"])
+				
+				# ========== END TMDB_MOVIE_VIDEOS========== #
+
+				# ========== START TMDB_MOVIE_ETAGS ========== #
+				# Enregistrer l'ETag dans la même transaction : il n'est gardé que si le film a bien été écrit
+				copy_upsert(cursor, "tmdb_movie_etags", ["movie_id", "etag"], values_to_insert_movie_etags, ["movie_id"], ["etag"])
+
+				# ========== END TMDB_MOVIE_ETAGS ========== #
+
+		print(f"Successfully updated {len(movies_to_update)} movies in Supabase")
 	except Exception as e:
 		print(f"Error updating TMDB movies in Supabase: {e}")
 
@@ -1567,9 +1577,8 @@ def tmdb_update_movie_with_daily_export(current_date: datetime):
 		print("Starting with TMDB Daily Export for Movies")
 		count_added = 0
 		count_deleted = 0
-		tmdb_movie_export = get_tmdb_export_ids(type="movie", date=current_date)
-		
-		if not tmdb_movie_export:
+		tmdb_ids_set = get_tmdb_export_ids(type="movie", date=current_date)
+		if not tmdb_ids_set:
 			raise Exception("Error: Unable to retrieve TMDB movies. Skipping update.")
 		
 		supabase_movies = execute_sql_command("SELECT id FROM tmdb_movie", fetch_results=True)
@@ -1577,13 +1586,6 @@ def tmdb_update_movie_with_daily_export(current_date: datetime):
 		if not supabase_movies:
 			raise Exception("Error: Unable to retrieve Supabase movies. Skipping update.")
 
-		# Lire le fichier JSON
-		with open(tmdb_movie_export, 'r', encoding='utf-8') as file:
-			tmdb_movies = [json.loads(line) for line in file]
-
-		# Extraire les IDs des films du fichier JSON
-		tmdb_ids_set = {movie['id'] for movie in tmdb_movies}
-
 		# Extraire les IDs des films dans Supabase
 		supabase_ids_set = {row[0] for row in supabase_movies}
 
@@ -1600,34 +1602,30 @@ def tmdb_update_movie_with_daily_export(current_date: datetime):
 			execute_sql_command(delete_command, (tuple(missing_in_tmdb),))
 		
 		if missing_in_supabase:
-			chunks = list(chunked(missing_in_supabase, 500))
-
 			print(f"Found {len(missing_in_supabase)} movies missing in Supabase")
 
-			for chunk in chunks:
-				# Créer une liste pour stocker les détails des films
-				current_movies_to_update = []
+			# Charger les ids des tables liées une seule fois pour tous les chunks
+			csv_data = load_movie_csv_data()
 
-				# Use ThreadPoolExecutor to execute tasks in parallel
-				with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-					futures = [executor.submit(get_tmdb_movie_details, movie_id) for movie_id in chunk]
+			# Un seul pool pour tous les chunks, dimensionné sur les clés API plutôt que sur MAX_WORKERS
+			with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+				for chunk in chunked(missing_in_supabase, MOVIES_PER_BATCH):
+					# Créer une liste pour stocker les détails des films
+					current_movies_to_update = []
 
-					for future in futures:
+					for future in as_completed([executor.submit(get_tmdb_movie_details, movie_id) for movie_id in chunk]):
 						movie_details = future.result()
 						if movie_details is not None:
 							current_movies_to_update.append(movie_details)
 
-				print(f"Found {len(current_movies_to_update)} movies to update")
+					print(f"Found {len(current_movies_to_update)} movies to update")
 
-				# Mettre à jour les films dans Supabase
-				update_supabase_tmdb_movie(current_movies_to_update)
+					# Mettre à jour les films dans Supabase
+					update_supabase_tmdb_movie(current_movies_to_update, csv_data)
 
 		print(f"TMDB update with TMDB Daily Export for Movies (added: {count_added}, deleted: {count_deleted}) COMPLETED")
 	except Exception as e:
 		print(f"Error updating TMDB movies with TMDB Daily Export: {e}")
-	finally:
-		if os.path.exists(tmdb_movie_export):
-			os.remove(tmdb_movie_export)
 
 def tmdb_update_movie_with_changes_list(current_date: datetime):
 	try:
@@ -1635,45 +1633,57 @@ def tmdb_update_movie_with_changes_list(current_date: datetime):
 		count_updated = 0
 		last_update = execute_sql_command("SELECT MAX(date) FROM tmdb_update_logs WHERE type = 'movie' AND success = TRUE", fetch_results=True)[0][0]
 
-		current_page = 1
-		movies_to_update = []
+		# Charger les ids des tables liées une seule fois pour toutes les pages
+		csv_data = load_movie_csv_data()
 
 		print(f"Current date: {current_date}")
 		print(f"Last update: {last_update}")
 
-		while True:
-			# Récupérer les changements de film pour la page actuelle
-			changed_movies_response = get_tmdb_data(url=f"https://api.themoviedb.org/3/movie/changes", params={"page": current_page, "start_date": last_update, "end_date": current_date.strftime("%Y-%m-%d")})
-			
-			if not changed_movies_response:
+		# Récupérer les changements de film pour une page
+		def get_changed_movies(page: int) -> dict:
+			return get_tmdb_data(url=f"https://api.themoviedb.org/3/movie/changes", params={"page": page, "start_date": last_update, "end_date": current_date.strftime("%Y-%m-%d")})
+
+		# Lister les pages au fur et à mesure que les détails sont consommés, avec au plus CHANGES_PAGES_PREFETCH pages d'avance
+		def changed_movies_args():
+			nonlocal count_updated
+			# La première page donne total_pages : les suivantes sont récupérées en parallèle
+			first_page = get_changed_movies(1)
+			if not first_page:
 				raise Exception("Error: Unable to retrieve TMDB changed movies. Skipping update.")
-			
-			changed_movies = changed_movies_response["results"]
-			
-			if not changed_movies or not len(changed_movies):
-				break
 
-			count_updated += len(changed_movies)
+			next_pages = iter(range(2, first_page.get('total_pages', 1) + 1))
+			with ThreadPoolExecutor(max_workers=2) as page_executor:
+				prefetched = collections.deque(page_executor.submit(get_changed_movies, page) for page in itertools.islice(next_pages, CHANGES_PAGES_PREFETCH))
+				changed_movies_response = first_page
+				while True:
+					if not changed_movies_response:
+						raise Exception("Error: Unable to retrieve TMDB changed movies. Skipping update.")
+				
+					changed_movies = changed_movies_response["results"]
+				
+					if not changed_movies or not len(changed_movies):
+						break
 
-			# Use ThreadPoolExecutor to execute tasks in parallel
-			with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-				futures = [executor.submit(get_tmdb_movie_details, movie['id']) for movie in changed_movies]
+					count_updated += len(changed_movies)
 
-				for future in futures:
-					movie_details = future.result()
-					if movie_details is not None:
-						movies_to_update.append(movie_details)
-			
-			if current_page % 2 == 0:
-				# Mettre à jour par lot tous les 2 pages
-				if len(movies_to_update):
-					update_supabase_tmdb_movie(movies_to_update)
-				movies_to_update = []
+					# Les films déjà écrits sont redemandés avec leur ETag : TMDB répond 304 sans corps s'ils n'ont pas changé
+					with get_connection() as connection:
+						etags = get_movie_etags(connection, [movie['id'] for movie in changed_movies])
+
+					yield from ((movie['id'], etags.get(movie['id'])) for movie in changed_movies)
+
+					if not prefetched:
+						break
+					changed_movies_response = prefetched.popleft().result()
+					prefetched.extend(page_executor.submit(get_changed_movies, page) for page in itertools.islice(next_pages, 1))
+
+				for future in prefetched:
+					future.cancel()
 
-			current_page += 1
+		def flush_movies(movies: list):
+			update_supabase_tmdb_movie(movies, csv_data)
 
-		if len(movies_to_update):
-			update_supabase_tmdb_movie(movies_to_update)
+		fetch_and_flush(changed_movies_args(), get_tmdb_movie_details, flush_movies, MOVIES_PER_BATCH)
 
 		print(f"TMDB update with TMDB Changes List for Movies (updated: {count_updated}) COMPLETED")
 
@@ -1689,14 +1699,14 @@ def tmdb_update_movie(current_date: datetime):
 		tmdb_update_movie_with_changes_list(current_date)
 
 		# Ajouter un log dans la table supabase tmdb_update_logs
-		supabase_tmdb_update_log(current_date, True, 'movie')
+		supabase_tmdb_update_log(None, None, current_date, True, 'movie')
 
 		print("TMDB update movies COMPLETED")
 	except Exception as e:
 		print(f"Error updating TMDB movies: {e}")
 
 		# Ajouter un log dans la table supabase tmdb_update_logs
-		supabase_tmdb_update_log(current_date, False, 'movie')
+		supabase_tmdb_update_log(None, None, current_date, False, 'movie')
 # ========== END TMDB MOVIE ========== #
 
 
@@ -1,4 +1,5 @@
 import psycopg2
+from psycopg2 import sql
 from datetime import datetime
 
 def connector(postgres_connection_string: str):
@@ -12,7 +13,7 @@ def connector(postgres_connection_string: str):
 # Get entire postgres table
 def get_table(conn, table_name: str, columns: list) -> list:
     cursor = conn.cursor()
-    cursor.execute(f"SELECT {', '.join(columns)} FROM {table_name}")
+    cursor.execute(sql.SQL("SELECT {} FROM {}").format(sql.SQL(', ').join(map(sql.Identifier, columns)), sql.Identifier(table_name)))
     rows = cursor.fetchall()
     cursor.close()
     return rows
@@ -55,14 +56,14 @@ class SyncLog:
 
 def get_last_sync(conn, sync_type: str) -> SyncLog:
     cursor = conn.cursor()
-    cursor.execute(f"SELECT * FROM sync_logs WHERE type = '{sync_type}' ORDER BY created_at DESC LIMIT 1")
+    cursor.execute("SELECT * FROM sync_logs WHERE type = %s ORDER BY created_at DESC LIMIT 1", (sync_type,))
     rows = cursor.fetchone()
     cursor.close()
     return SyncLog(*rows)
 
 def insert_sync_log(conn, sync_type: str, status: str):
     cursor = conn.cursor()
-    cursor.execute(f"INSERT INTO sync_logs (type, status) VALUES ('{sync_type}', '{status}')")
+    cursor.execute("INSERT INTO sync_logs (type, status) VALUES (%s, %s)", (sync_type, status))
     conn.commit()
     cursor.close()
 
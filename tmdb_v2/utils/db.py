@@ -1,18 +1,42 @@
 import os
+import threading
 import psycopg2
+import psycopg2.pool
+from psycopg2 import sql
+from contextlib import contextmanager
 from datetime import datetime
 
-def connect() -> psycopg2.extensions.connection:
-    url = os.getenv("POSTGRES_CONNECTION_STRING")
-    if not url:
-        raise Exception("POSTGRES_CONNECTION_STRING is not set")
-        
-    return psycopg2.connect(url)    
+MAX_CONNECTIONS = 4
+
+pool = None
+pool_lock = threading.Lock()
+
+# Created on first use: the flows are imported before load_dotenv() runs
+def get_pool() -> psycopg2.pool.ThreadedConnectionPool:
+    global pool
+    with pool_lock:
+        if pool is None:
+            url = os.getenv("POSTGRES_CONNECTION_STRING")
+            if not url:
+                raise Exception("POSTGRES_CONNECTION_STRING is not set")
+            pool = psycopg2.pool.ThreadedConnectionPool(minconn=1, maxconn=MAX_CONNECTIONS, dsn=url)
+    return pool
+
+# Borrow a pooled connection; like `with psycopg2.connect(...)`, commit on exit and roll back on error
+@contextmanager
+def connect():
+    conn_pool = get_pool()
+    conn = conn_pool.getconn()
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn_pool.putconn(conn)
 
 def get_table(conn: psycopg2.extensions.connection, table_name: str, columns: list) -> list:
     try:
         with conn.cursor() as cursor:
-            cursor.execute(f"SELECT {', '.join(columns)} FROM {table_name}")
+            cursor.execute(sql.SQL("SELECT {} FROM {}").format(sql.SQL(', ').join(map(sql.Identifier, columns)), sql.Identifier(table_name)))
             return cursor.fetchall()
     except Exception as e:
         conn.rollback()
@@ -30,7 +54,7 @@ def execute_query(conn: psycopg2.extensions.connection, query: str, params: tupl
 def insert_sync_log(conn: psycopg2.extensions.connection, date: datetime, sync_type: str, success: bool):
     try:
         with conn.cursor() as cursor:
-            cursor.execute(f"INSERT INTO tmdb_update_logs (date, success, type) VALUES ('{date}', {success}, '{sync_type}')")
+            cursor.execute("INSERT INTO tmdb_update_logs (date, success, type) VALUES (%s, %s, %s)", (date, success, sync_type))
             conn.commit()
     except Exception as e:
         conn.rollback()
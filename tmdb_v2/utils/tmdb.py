@@ -1,9 +1,20 @@
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from itertools import cycle
 
 api_key_cycle = None
 
+# Keep-alive connections to api.themoviedb.org, shared by every call
+POOL_SIZE = 10
+session = requests.Session()
+session.mount("https://", HTTPAdapter(
+	pool_connections=POOL_SIZE,
+	pool_maxsize=POOL_SIZE * 2,
+	max_retries=Retry(total=5, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+))
+
 def set_api_keys(api_keys):
 	global api_key_cycle
 	api_key_cycle = cycle(api_keys.split(","))
@@ -16,7 +27,7 @@ def get_data(endpoint: str, params: dict) -> dict:
 	params["api_key"] = api_key
 
 	url = f"https://api.themoviedb.org/3/{endpoint}"
-	response = requests.get(url, params=params)
+	response = session.get(url, params=params, timeout=(3.05, 30))
 	if response.status_code != 200:
 		return None
 